@@ -0,0 +1,75 @@
+# benchmarks/bench_cleaner.py
+
+"""
+Compare DataCleaner.clean against the original per-group lambda version.
+
+    python -m benchmarks.bench_cleaner --tickers 500 --days 2500
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from src.cleaner import DataCleaner
+
+
+def legacy_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """The pre-vectorization DataCleaner.clean (sanity checks omitted)."""
+    n_tickers = len(df.index.unique('Ticker'))
+    thresh = int(n_tickers * 0.95)
+    valid = (
+        df.reset_index()
+        .groupby('Date')
+        .apply(lambda d: d['Close'].notna().sum() >= thresh)
+    )
+    df = df.loc[valid[valid].index]
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df.loc[df[col] <= 0, col] = np.nan
+    df = df.groupby('Ticker').apply(lambda x: x.ffill().bfill()).droplevel(0)
+    return df.dropna()
+
+
+def make_raw(n_tickers: int, n_days: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV with ~1% missing and a few non-positive prices."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=n_days)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 100 * np.exp(rng.normal(0, 0.01, (n_days, n_tickers)).cumsum(0))
+    close = close.reshape(-1)
+    df = pd.DataFrame({
+        "Open": close, "High": close * 1.01, "Low": close * 0.99,
+        "Close": close, "Volume": rng.integers(0, 10_000, len(idx)).astype(float),
+    }, index=idx)
+    holes = rng.random(df.shape) < 0.01
+    df = df.mask(holes)
+    df.loc[rng.random(len(df)) < 1e-4, "Low"] = 0.0
+    return df
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2500)
+    args = parser.parse_args()
+
+    raw = make_raw(args.tickers, args.days)
+    old, t_old = timed(legacy_clean, raw.copy())
+    new, t_new = timed(DataCleaner().clean, raw.copy())
+    pd.testing.assert_frame_equal(new, old)
+
+    print(f"{args.tickers} tickers x {args.days} days ({len(raw):,} rows)")
+    print(f"  legacy groupby/apply : {t_old:8.3f}s")
+    print(f"  vectorized           : {t_new:8.3f}s")
+    print(f"  speedup              : {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# benchmarks/bench_features.py
+
+"""
+Time FeatureEngineer.build_features serially and over ticker shards.
+
+    python -m benchmarks.bench_features --tickers 4000 --days 2500 --jobs 1 8 32
+"""
+
+import argparse
+import time
+import pandas as pd
+
+from src.features import FeatureEngineer
+from .bench_cleaner import make_raw
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    df = make_raw(args.tickers, args.days).dropna()
+    print(f"{args.tickers} tickers x {args.days} days ({len(df):,} rows)")
+    base = None
+    for n in args.jobs:
+        t0 = time.perf_counter()
+        feats = FeatureEngineer(n_jobs=n).build_features(df)
+        elapsed = time.perf_counter() - t0
+        if base is None:
+            base, ref = elapsed, feats
+        else:
+            pd.testing.assert_frame_equal(feats, ref)
+        print(f"  n_jobs={n:<3d}: {elapsed:8.3f}s  ({base / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_tuner.py
+
+"""
+Compare the memoized walk-forward tuner against per-split feature builds,
+and successive halving against the exhaustive grid.
+
+    python -m benchmarks.bench_tuner --tickers 100 --days 2520
+"""
+
+import argparse
+import time
+from sklearn.model_selection import ParameterGrid
+import numpy as np
+import pandas as pd
+
+from src.backtester import Backtester, stack_signals
+from src.panel import PricePanel
+from src.tuner import (
+    IndicatorMemo, build_features, gen_mom_signals, halving_schedule, run_rungs,
+    run_splits, walk_forward_splits
+)
+
+GRID = {
+    'mom_short': [3, 5, 10, 20],
+    'mom_long': [40, 60, 120],
+    'rsi_window': [7, 14, 21],
+    'slippage': [0.0, 0.0005],
+}
+
+
+def legacy_splits(frame, dates, splits, grid, costs):
+    """The pre-memo loop: build_features + gen_mom_signals per split and key."""
+    out = []
+    for sp in splits:
+        window = frame[frame.index.get_level_values('Date').isin(sp['train'].union(sp['test']))]
+        test_df = window[window.index.get_level_values('Date').isin(sp['test'])]
+        price_test = PricePanel.from_frame(test_df, ['Close'])
+        cache, signals = {}, []
+        for p in grid:
+            key = (p['mom_short'], p['mom_long'], p['rsi_window'])
+            if key not in cache:
+                sig = gen_mom_signals(build_features(window, *key))
+                cache[key] = sig[sig.index.get_level_values('Date').isin(sp['test'])]
+            signals.append(cache[key])
+        out.append(Backtester().run_batch(
+            price_test, stack_signals(signals, price_test), costs, 0.0).returns)
+    return out
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--train", type=int, default=252)
+    parser.add_argument("--test", type=int, default=63)
+    parser.add_argument("--eta", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2010-01-04", periods=args.days)
+    close = 100 * np.exp(rng.normal(0, 0.02, (args.days, args.tickers)).cumsum(0))
+    panel = PricePanel(dates, pd.Index([f"T{i:03d}" for i in range(args.tickers)]),
+                       {'Close': close})
+    frame = panel.to_frame()
+    splits = walk_forward_splits(dates, args.train, args.test)
+    windows = [(dates.get_loc(sp['train'][0]), len(sp['train']),
+                dates.get_loc(sp['test'][-1]) + 1) for sp in splits]
+    grid = list(ParameterGrid(GRID))
+    costs = [p['slippage'] for p in grid]
+
+    old, t_old = timed(legacy_splits, frame, dates, splits, grid, costs)
+    memo = IndicatorMemo(panel)
+    new, t_new = timed(run_splits, memo, windows, grid, costs, [0.0] * len(grid))
+    for a, b in zip(old, new):
+        pd.testing.assert_frame_equal(a, b, check_exact=True, check_freq=False)
+
+    stats = memo.stats
+    print(f"{args.tickers} tickers x {args.days} days, {len(grid)} grid points, "
+          f"{len(splits)} splits")
+    print(f"  per-split features : {t_old:8.3f}s")
+    print(f"  memoized           : {t_new:8.3f}s")
+    print(f"  speedup            : {t_old / t_new:8.1f}x")
+    print(f"  indicator computations avoided: "
+          f"{stats['indicator_requests'] - stats['indicators_computed']}"
+          f"/{stats['indicator_requests']}, quantile rows reused: "
+          f"{stats['quantile_rows_reused']}/"
+          f"{stats['quantile_rows_reused'] + stats['quantile_rows_computed']}")
+
+    zero = [0.0] * len(grid)
+    exhaustive, t_grid = timed(run_rungs, IndicatorMemo(panel), windows, grid, costs,
+                               zero, [(len(grid), len(windows))])
+    rungs = halving_schedule(len(grid), len(windows), args.eta)
+    halving, t_half = timed(run_rungs, IndicatorMemo(panel), windows, grid, costs,
+                            zero, rungs)
+    best = int(np.argmax(exhaustive.sharpe.mean(axis=1)))
+    finalists = np.flatnonzero(halving.evaluated.all(axis=1))
+    spent = halving.budget['total_backtests'].iloc[-1]
+    print(f"  grid search        : {t_grid:8.3f}s, "
+          f"{exhaustive.budget['total_backtests'].iloc[-1]} backtests")
+    print(f"  halving (eta={args.eta})    : {t_half:8.3f}s, {spent} backtests")
+    print(f"  grid best among halving finalists: {best in finalists}")
+    print(halving.budget.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,11 @@ set -euo pipefail
 source /path/to/venv/bin/activate
 cd /path/to/Stokon
 
+# keep the signal history, feature state and performance between runs (unset = recompute each run)
+export SIGNAL_STORE_DIR="${SIGNAL_STORE_DIR:-data/signals}"
+export FEATURE_STATE_PATH="${FEATURE_STATE_PATH:-data/state/features.npz}"
+export PERF_STATE_PATH="${PERF_STATE_PATH:-data/state/performance.json}"
+
 LOGDIR=/var/log/stokon
 mkdir -p "$LOGDIR"
 
@@ -1,8 +1,15 @@
 #!/usr/bin/env bash
 # scripts/run_tuner.sh
 
-source /path/to/venv/bin/activate
-cd /path/to/Stokon
+# outside the container image: the project's venv and checkout
+if [ -f /path/to/venv/bin/activate ]; then
+  source /path/to/venv/bin/activate
+  cd /path/to/Stokon
+fi
+
+# checkpoint every (grid point, split) result so a killed sweep resumes
+# where it stopped (k8s/tuner-job.yaml points it at a mounted volume)
+export TUNING_STORE_DIR="${TUNING_STORE_DIR:-data/tuning}"
 
 python - << 'EOF'
 from src.tuner import tune_hyperparameters
@@ -0,0 +1,270 @@
+# src/atr_table.py
+
+"""
+Causal Wilder ATR shared by the intraday backtester and live stop logic.
+
+``ATRTable`` holds the ATR panel (one row per daily bar, one column per
+ticker) computed once in a single pass, and answers "what ATR was known
+before date D opened" by looking at the row of the previous bar, so no
+date ever sees its own or later bars. The table carries the
+``StreamingATR`` state it was built with: a block of new dates is
+computed with ``indicators.atr`` seeded from that state, a single new
+day advances it in O(tickers), and it round-trips through an ``.npz``
+next to the daily price cache.
+"""
+
+import logging
+import os
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+from .indicators import atr, true_range
+from .panel import PricePanel, as_panel, ffill
+from .config import ATR_TABLE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingATR:
+    """
+    Per-ticker Wilder ATR advanced one daily bar at a time.
+
+    Keeps only what the recursion needs (bars seen, the true-range sum of
+    the seed window, the current ATR and the previous close), so the state
+    is O(tickers) however long the history. Feeding a full history
+    reproduces ``indicators.atr``.
+    """
+
+    _STATE = ['count', 'tr_sum', 'atr', 'prev_close']
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.tickers = pd.Index([], name='Ticker')
+        self.last_date: Optional[pd.Timestamp] = None
+        self.count = np.zeros(0, dtype=np.int64)
+        self.tr_sum = np.zeros(0)
+        self.atr = np.zeros(0)
+        self.prev_close = np.zeros(0)
+
+    def _ensure_tickers(self, tickers: pd.Index):
+        new = tickers.difference(self.tickers)
+        if new.empty:
+            return
+        self.tickers = self.tickers.append(pd.Index(new, name='Ticker'))
+        for name in self._STATE:
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(len(new), dtype=arr.dtype)]))
+
+    def _advance(self, j: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+        """Advance tickers ``j`` by one bar."""
+        c = self.count[j]
+        tr = true_range(high, low, np.where(c > 0, self.prev_close[j], np.nan))
+        w = self.window
+        self.tr_sum[j] = np.where(c < w, self.tr_sum[j] + tr, 0.0)
+        alpha = 1 / w
+        self.atr[j] = np.where(
+            c + 1 == w, self.tr_sum[j] / w,
+            np.where(c >= w, self.atr[j] * (1 - alpha) + alpha * tr, 0.0))
+        self.prev_close[j] = close
+        self.count[j] = c + 1
+
+    def push(self, date, day: pd.DataFrame):
+        """Advance through one date's High/Low/Close rows (indexed by Ticker last)."""
+        day = day.dropna(subset=['High', 'Low', 'Close'])
+        tickers = pd.Index(day.index.get_level_values('Ticker'))
+        self._ensure_tickers(tickers)
+        self._advance(self.tickers.get_indexer(tickers), day['High'].to_numpy(float),
+                      day['Low'].to_numpy(float), day['Close'].to_numpy(float))
+        self.last_date = pd.Timestamp(date)
+
+    def update(self, bars: pd.DataFrame):
+        """Advance through every date of (Date, Ticker) ``bars`` after ``last_date``."""
+        if self.last_date is not None:
+            bars = bars[bars.index.get_level_values('Date') > self.last_date]
+        for date, day in bars.groupby(level='Date', sort=True):
+            self.push(date, day)
+
+    def current(self, tickers: pd.Index) -> np.ndarray:
+        """Latest ATR for ``tickers`` (NaN before a full window or if unseen)."""
+        out = np.full(len(tickers), np.nan)
+        j = self.tickers.get_indexer(tickers)
+        ok = j >= 0
+        warm = self.count[j[ok]] >= self.window
+        out[np.flatnonzero(ok)[warm]] = self.atr[j[ok]][warm]
+        return out
+
+
+class ATRTable:
+    """
+    ATR after every daily bar, queried causally by date.
+
+    ``values[i]`` is each ticker's ATR after the bar of ``dates[i]`` (carried
+    over on days a ticker has no bar, NaN until a full window); the ATR in
+    force on date D is the row of the last bar strictly before D.
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.state = StreamingATR(window)
+        self.dates = pd.DatetimeIndex([], name='Date')
+        self.values = np.zeros((0, 0))
+
+    @property
+    def tickers(self) -> pd.Index:
+        return self.state.tickers
+
+    def _stale(self, daily_price: pd.DataFrame) -> bool:
+        """True when ``daily_price`` does not continue the history the table was built from."""
+        if self.state.last_date is None:
+            return False
+        dates = daily_price.index.get_level_values('Date')
+        if dates.min() < self.dates[0]:
+            return True  # longer history than the table: ATR seeds differ
+        last = daily_price[dates == self.state.last_date]
+        if last.empty:
+            return False
+        close = last['Close'].droplevel('Date')
+        j = self.tickers.get_indexer(close.index)
+        ok = (j >= 0) & close.notna().to_numpy()
+        # a split/dividend re-adjusted the history the table was built on
+        return not np.allclose(self.state.prev_close[j[ok]], close.to_numpy()[ok])
+
+    def _extend_block(self, panel: PricePanel, cols: np.ndarray) -> np.ndarray:
+        """
+        Rows for several new dates at once with ``indicators.atr`` seeded
+        from the state, then the state moved past them.
+        """
+        state, w = self.state, self.window
+        if np.array_equal(cols, np.arange(len(state.tickers))):
+            high, low, close = panel['High'], panel['Low'], panel['Close']
+        else:
+            shape = (len(panel.dates), len(state.tickers))
+            high, low, close = (np.full(shape, np.nan) for _ in range(3))
+            high[:, cols], low[:, cols], close[:, cols] = \
+                panel['High'], panel['Low'], panel['Close']
+        bar = ~(np.isnan(high) | np.isnan(low) | np.isnan(close))
+        seed = {name: getattr(state, name) for name in state._STATE} \
+            if state.count.any() else None
+        at_bar = atr(high, low, close, w, seed=seed)
+        before = np.where(state.count >= w, state.atr, np.nan)
+        rows = ffill(np.vstack([before, np.where(bar, at_bar, np.nan)]))[1:]
+
+        seen = bar.any(axis=0)
+        count = state.count + bar.sum(axis=0)
+        # true-range sums only matter while a first window is still filling
+        f = np.flatnonzero(seen & (count <= w))
+        prev = ffill(np.vstack([np.where(state.count[f] > 0, state.prev_close[f], np.nan),
+                                np.where(bar[:, f], close[:, f], np.nan)]))[:-1]
+        tr = np.where(bar[:, f], true_range(high[:, f], low[:, f], prev), 0.0)
+        tr_sum = np.where(count <= w, state.tr_sum, 0.0)
+        tr_sum[f] = np.cumsum(np.vstack([state.tr_sum[f], tr]), axis=0)[-1]
+
+        last = len(bar) - 1 - np.argmax(bar[::-1], axis=0)
+        state.tr_sum = tr_sum
+        state.atr = np.where(seen, np.where(count >= w, rows[-1], 0.0), state.atr)
+        state.prev_close = np.where(seen, close[last, np.arange(len(last))], state.prev_close)
+        state.count = count
+        return rows
+
+    def extend(self, daily_price: pd.DataFrame) -> "ATRTable":
+        """
+        Append rows for the (Date, Ticker) High/Low/Close bars dated after
+        the last processed bar; rebuilds from scratch if ``daily_price`` has
+        been re-adjusted or reaches further back than the table.
+        """
+        if self._stale(daily_price):
+            logger.info("ATRTable: daily history changed, rebuilding")
+            self.__init__(self.window)
+        if self.state.last_date is not None:
+            daily_price = daily_price[
+                daily_price.index.get_level_values('Date') > self.state.last_date]
+        if daily_price.empty:
+            return self
+
+        panel = as_panel(daily_price, ['High', 'Low', 'Close'])
+        state = self.state
+        state._ensure_tickers(panel.tickers)
+        cols = state.tickers.get_indexer(panel.tickers)
+        if len(panel.dates) == 1:
+            # a single new day (the daily run): advance the state in place
+            high, low, close = panel['High'][0], panel['Low'][0], panel['Close'][0]
+            bar = ~(np.isnan(high) | np.isnan(low) | np.isnan(close))
+            state._advance(cols[bar], high[bar], low[bar], close[bar])
+            rows = np.where(state.count >= self.window, state.atr, np.nan)[None]
+        else:
+            rows = self._extend_block(panel, cols)
+        state.last_date = panel.dates[-1]
+
+        pad = len(state.tickers) - self.values.shape[1]
+        old = np.pad(self.values, ((0, 0), (0, pad)), constant_values=np.nan)
+        self.values = np.vstack([old, rows])
+        self.dates = self.dates.append(pd.DatetimeIndex(panel.dates, name='Date'))
+        return self
+
+    def _rows(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Row of the last bar strictly before each date (-1 if none)."""
+        return self.dates.searchsorted(dates, side='left') - 1
+
+    def get(self, date, ticker: str) -> float:
+        """ATR in force for ``ticker`` on ``date``: a hash lookup plus one array read."""
+        date = pd.Timestamp(date)
+        n = len(self.dates)
+        if n and date > self.dates[-1]:
+            row = n - 1  # live: the latest bar is the previous one
+        elif date in self.dates:
+            row = self.dates.get_loc(date) - 1
+        else:
+            row = int(self._rows(pd.DatetimeIndex([date]))[0])
+        col = self.tickers.get_indexer([ticker])[0]
+        if row < 0 or col < 0:
+            return np.nan
+        return float(self.values[row, col])
+
+    def at(self, date) -> pd.Series:
+        """ATR in force on ``date`` for every ticker."""
+        return self.table(pd.DatetimeIndex([pd.Timestamp(date)])).iloc[0]
+
+    def table(self, dates: pd.DatetimeIndex) -> pd.DataFrame:
+        """(dates × tickers) ATR in force on each date."""
+        dates = pd.DatetimeIndex(dates)
+        rows = self._rows(dates)
+        out = np.full((len(dates), len(self.tickers)), np.nan)
+        known = rows >= 0
+        out[known] = self.values[rows[known]]
+        return pd.DataFrame(out, index=dates, columns=self.tickers)
+
+    def save(self, path: str = ATR_TABLE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        s = self.state
+        np.savez(
+            path,
+            window=self.window,
+            tickers=np.asarray(self.tickers, dtype=str),
+            dates=self.dates.to_numpy(dtype='datetime64[ns]'),
+            values=self.values,
+            **{name: getattr(s, name) for name in s._STATE}
+        )
+
+    @classmethod
+    def load(cls, path: str = ATR_TABLE_PATH, window: int = 14) -> "ATRTable":
+        """
+        Restore a table written by ``save``; a fresh, empty table when the
+        file is missing or was built with a different window.
+        """
+        table = cls(window)
+        if not os.path.exists(path):
+            return table
+        with np.load(path) as data:
+            if int(data['window']) != window:
+                logger.info(f"ATRTable: {path} uses window {int(data['window'])}, rebuilding")
+                return table
+            s = table.state
+            s.tickers = pd.Index(data['tickers'].tolist(), name='Ticker')
+            for name in s._STATE:
+                setattr(s, name, data[name])
+            table.dates = pd.DatetimeIndex(data['dates'], name='Date')
+            table.values = data['values']
+        if len(table.dates):
+            s.last_date = table.dates[-1]
+        return table
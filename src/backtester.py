@@ -1,8 +1,15 @@
 # src/backtester.py
 
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+import json
+import math
+import os
 import pandas as pd
 import numpy as np
 
+from .panel import PricePanel, as_frame, as_panel, ffill
+from .indicators import momentum
+
 
 class PerformanceReport:
     """Container for backtest performance metrics."""
@@ -27,16 +34,356 @@ class PerformanceReport:
         return wins / losses if losses > 0 else np.nan
 
 
+class OnlinePerformance:
+    """
+    Streaming ``PerformanceReport`` metrics over a return sequence.
+
+    Mean/variance use Welford's update; drawdown keeps the compounded
+    equity, its running peak and trough; profit factor keeps running win and
+    loss sums. ``update`` is O(1), NaN returns are skipped like pandas does,
+    and ``merge`` combines the accumulator of an earlier segment with that
+    of the segment that follows it, so per-shard results can be combined.
+    """
+
+    FIELDS = ['n', 'mean', 'm2', 'wins', 'losses', 'cum', 'peak', 'trough', 'max_dd']
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.wins = 0.0
+        self.losses = 0.0
+        self.cum = 1.0          # compounded equity
+        self.peak = -math.inf   # running max of equity (over observed bars)
+        self.trough = math.inf  # running min of equity
+        self.max_dd = 0.0
+
+    def update(self, r: float) -> "OnlinePerformance":
+        r = float(r)
+        if math.isnan(r):
+            return self
+        self.n += 1
+        delta = r - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (r - self.mean)
+        if r > 0:
+            self.wins += r
+        elif r < 0:
+            self.losses -= r
+        self.cum *= 1 + r
+        self.peak = max(self.peak, self.cum)
+        self.trough = min(self.trough, self.cum)
+        self.max_dd = min(self.max_dd, self.cum / self.peak - 1)
+        return self
+
+    def update_many(self, returns: Iterable[float]) -> "OnlinePerformance":
+        for r in returns:
+            self.update(r)
+        return self
+
+    def merge(self, later: "OnlinePerformance") -> "OnlinePerformance":
+        """Accumulator of this segment followed by ``later``."""
+        if self.n == 0:
+            return later.copy()
+        if later.n == 0:
+            return self.copy()
+        out = OnlinePerformance()
+        out.n = self.n + later.n
+        delta = later.mean - self.mean
+        out.mean = self.mean + delta * later.n / out.n
+        out.m2 = self.m2 + later.m2 + delta ** 2 * self.n * later.n / out.n
+        out.wins = self.wins + later.wins
+        out.losses = self.losses + later.losses
+        # later's equity path starts from self.cum; its drawdowns are
+        # measured against max(self.peak, its own rescaled peak)
+        out.cum = self.cum * later.cum
+        out.peak = max(self.peak, self.cum * later.peak)
+        out.trough = min(self.trough, self.cum * later.trough)
+        out.max_dd = min(self.max_dd, later.max_dd,
+                         self.cum * later.trough / self.peak - 1)
+        return out
+
+    def copy(self) -> "OnlinePerformance":
+        return OnlinePerformance.from_dict(self.to_dict())
+
+    @property
+    def sharpe(self) -> float:
+        if self.n < 2:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.float64(self.mean) / np.sqrt(self.m2 / (self.n - 1)) * np.sqrt(252)
+
+    @property
+    def max_drawdown(self) -> float:
+        return self.max_dd if self.n else np.nan
+
+    @property
+    def profit_factor(self) -> float:
+        return self.wins / self.losses if self.losses > 0 else np.nan
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        # JSON has no infinities: the +-inf peak/trough before the first
+        # bar are stored as None and restored from the defaults
+        state = {f: getattr(self, f) for f in self.FIELDS}
+        return {f: v if math.isfinite(v) else None for f, v in state.items()}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Optional[float]]) -> "OnlinePerformance":
+        acc = cls()
+        for f in cls.FIELDS:
+            if state[f] is not None:
+                setattr(acc, f, state[f])
+        return acc
+
+
+class RollingPerformance:
+    """
+    ``OnlinePerformance`` over the last ``window`` returns.
+
+    Evicting a bar from a drawdown is not invertible, so the window is a
+    two-stack queue of accumulators: new bars go on the back stack (one
+    running aggregate), the front stack holds suffix aggregates of older
+    bars and is rebuilt from the back only when it runs empty. Updates and
+    queries are amortized O(1) merges.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.front = []   # suffix aggregates, oldest bar last
+        self.front_vals = []
+        self.back_vals = []
+        self.back = OnlinePerformance()
+
+    def __len__(self):
+        return len(self.front_vals) + len(self.back_vals)
+
+    def update(self, r: float) -> "RollingPerformance":
+        if math.isnan(float(r)):
+            return self
+        self.back_vals.append(float(r))
+        self.back.update(r)
+        if len(self) > self.window:
+            if not self.front:
+                agg = OnlinePerformance()
+                for v in reversed(self.back_vals):
+                    agg = OnlinePerformance().update(v).merge(agg)
+                    self.front.append(agg)
+                    self.front_vals.append(v)
+                self.back_vals, self.back = [], OnlinePerformance()
+            self.front.pop()
+            self.front_vals.pop()
+        return self
+
+    def update_many(self, returns: Iterable[float]) -> "RollingPerformance":
+        for r in returns:
+            self.update(r)
+        return self
+
+    def current(self) -> OnlinePerformance:
+        """Accumulator of the bars currently in the window."""
+        return (self.front[-1] if self.front else OnlinePerformance()).merge(self.back)
+
+    @property
+    def sharpe(self) -> float:
+        return self.current().sharpe
+
+    @property
+    def max_drawdown(self) -> float:
+        return self.current().max_drawdown
+
+    @property
+    def profit_factor(self) -> float:
+        return self.current().profit_factor
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'window': self.window,
+                'returns': list(reversed(self.front_vals)) + self.back_vals}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "RollingPerformance":
+        return cls(state['window']).update_many(state['returns'])
+
+
+class PerformanceState:
+    """
+    Lifetime and rolling-window performance of the daily strategy returns,
+    persisted as JSON between runs. ``update`` only consumes dates after
+    ``last_date``, so each daily run adds its new bar(s) in O(1).
+    """
+
+    def __init__(self, window: int = 252):
+        self.lifetime = OnlinePerformance()
+        self.rolling = RollingPerformance(window)
+        self.last_date: Optional[pd.Timestamp] = None
+
+    def update(self, daily_returns: pd.Series) -> "PerformanceState":
+        """Add the returns (indexed by date) newer than ``last_date``."""
+        daily_returns = daily_returns.sort_index()
+        if self.last_date is not None:
+            daily_returns = daily_returns[daily_returns.index > self.last_date]
+        for r in daily_returns.to_numpy(dtype=float):
+            self.lifetime.update(r)
+            self.rolling.update(r)
+        if len(daily_returns):
+            self.last_date = pd.Timestamp(daily_returns.index[-1])
+        return self
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {
+            'last_date': None if self.last_date is None else self.last_date.isoformat(),
+            'lifetime': self.lifetime.to_dict(),
+            'rolling': self.rolling.to_dict(),
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(state, fh, allow_nan=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, window: int = 252) -> "PerformanceState":
+        """State saved at ``path``, or a fresh one if there is none."""
+        state = cls(window)
+        if not os.path.exists(path):
+            return state
+        with open(path) as fh:
+            data = json.load(fh)
+        state.lifetime = OnlinePerformance.from_dict(data['lifetime'])
+        state.rolling = RollingPerformance.from_dict(data['rolling'])
+        if state.rolling.window != window:
+            state.rolling = RollingPerformance(window).update_many(
+                data['rolling']['returns'])
+        if data['last_date'] is not None:
+            state.last_date = pd.Timestamp(data['last_date'])
+        return state
+
+
+class BatchReport:
+    """
+    ``PerformanceReport`` metrics for many strategies at once.
+
+    ``returns`` is a dates × strategies frame of daily returns (NaN on
+    dates without positions); ``sharpe``, ``max_drawdown`` and
+    ``profit_factor`` are arrays with one entry per strategy, computed with
+    the same NaN-skipping rules as ``PerformanceReport``.
+    """
+
+    def __init__(self, returns: pd.DataFrame):
+        self.returns = returns
+        r = returns.to_numpy(dtype=float)
+        valid = ~np.isnan(r)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = valid.sum(axis=0)
+            mean = np.where(valid, r, 0.0).sum(axis=0) / n
+            var = np.where(valid, (r - mean) ** 2, 0.0).sum(axis=0) / (n - 1)
+            self.sharpe = mean / np.sqrt(var) * np.sqrt(252)
+
+            cum = np.cumprod(np.where(valid, 1 + r, 1.0), axis=0)
+            peak = np.fmax.accumulate(np.where(valid, cum, np.nan), axis=0)
+            dd = np.where(valid, cum / peak - 1, np.nan)
+            self.max_drawdown = np.where(valid.any(axis=0), np.nanmin(
+                np.where(valid, dd, np.inf), axis=0), np.nan)
+
+            wins = np.where(valid & (r > 0), r, 0.0).sum(axis=0)
+            losses = -np.where(valid & (r < 0), r, 0.0).sum(axis=0)
+            self.profit_factor = np.where(losses > 0, wins / losses, np.nan)
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row of metrics per strategy."""
+        return pd.DataFrame({
+            'sharpe': self.sharpe,
+            'max_drawdown': self.max_drawdown,
+            'profit_factor': self.profit_factor,
+        }, index=self.returns.columns)
+
+    def report(self, strategy) -> PerformanceReport:
+        """The single-strategy ``PerformanceReport`` for one column."""
+        return PerformanceReport(self.returns[strategy])
+
+
+def stack_signals(
+    signals: Sequence[pd.Series],
+    panel: PricePanel
+) -> np.ndarray:
+    """
+    (strategies × dates × tickers) array of signal Series on ``panel``'s
+    grid; cells a Series has no row for (or outside the grid) are NaN.
+    """
+    out = np.full((len(signals),) + panel.shape, np.nan)
+    for i, sig in enumerate(signals):
+        rows, cols = panel.locate(sig.index)
+        keep = (rows >= 0) & (cols >= 0)
+        out[i, rows[keep], cols[keep]] = sig.to_numpy(dtype=float)[keep]
+    return out
+
+
 class Backtester:
     """Daily backtest with slippage and commission costs."""
 
+    def run_batch(
+        self,
+        price_df: Union[pd.DataFrame, PricePanel],
+        signals: np.ndarray,
+        slippage: Union[float, Sequence[float]],
+        commission: Union[float, Sequence[float]],
+        names: Optional[Sequence] = None
+    ) -> BatchReport:
+        """
+        Backtest a stack of signal matrices (strategies × dates × tickers on
+        the price panel's grid, NaN = no row; see ``stack_signals``) in one
+        pass. Costs are scalars or one value per strategy. Each strategy's
+        metrics match ``run_backtest`` on the equivalent signal Series,
+        including its turnover measured across consecutive signal rows in
+        (Date, Ticker) order.
+        """
+        panel = as_panel(price_df, ['Close'])
+        sig = np.asarray(signals, dtype=float)
+        n_strat, n_dates, n_tickers = sig.shape
+        costs = np.broadcast_to(
+            np.asarray(slippage, dtype=float) + np.asarray(commission, dtype=float),
+            (n_strat,))
+
+        # per-ticker close-to-close returns, computed once for all strategies
+        close = panel['Close']
+        ret = np.where(np.isnan(close), np.nan, np.nan_to_num(momentum(close, 1)))
+
+        # previous signal row of the same ticker (0 for its first row)
+        present = ~np.isnan(sig)
+        by_ticker = sig.transpose(1, 0, 2).reshape(n_dates, -1)
+        prev = np.full_like(by_ticker, np.nan)
+        prev[1:] = ffill(by_ticker)[:-1]
+        pos = np.nan_to_num(prev.reshape(n_dates, n_strat, n_tickers).transpose(1, 0, 2))
+        pos[~present] = np.nan
+
+        # turnover between consecutive signal rows
+        trades = np.full(sig.shape, np.nan)
+        flat_pos = pos.reshape(n_strat, -1)
+        flat_trades = trades.reshape(n_strat, -1)
+        flat_present = present.reshape(n_strat, -1)
+        if (flat_present == flat_present[0]).all():
+            cells = np.flatnonzero(flat_present[0])
+            flat_trades[:, cells[1:]] = np.abs(np.diff(flat_pos[:, cells], axis=1))
+        else:
+            for s in range(n_strat):
+                cells = np.flatnonzero(flat_present[s])
+                flat_trades[s, cells[1:]] = np.abs(np.diff(flat_pos[s, cells]))
+
+        net = pos * ret - trades * costs[:, None, None]
+        valid = ~np.isnan(net)
+        with np.errstate(invalid='ignore'):
+            daily = np.where(valid, net, 0.0).sum(axis=2) / valid.sum(axis=2)
+
+        names = range(n_strat) if names is None else names
+        return BatchReport(pd.DataFrame(daily.T, index=panel.dates, columns=list(names)))
+
     def run_backtest(
         self,
-        price_df: pd.DataFrame,
+        price_df: Union[pd.DataFrame, PricePanel],
         signals: pd.Series,
         slippage: float,
         commission: float
     ) -> PerformanceReport:
+        price_df = as_frame(price_df)
         # daily pct returns per ticker
         ret = price_df.groupby('Ticker')['Close'].pct_change().fillna(0)
         # lag signals to next day open
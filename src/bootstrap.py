@@ -0,0 +1,182 @@
+# src/bootstrap.py
+
+"""
+Block-bootstrap significance testing for daily strategy returns.
+
+Resamples keep serial dependence by drawing whole blocks of consecutive
+days, either fixed-length circular blocks (``method="block"``) or the
+geometric-length blocks of the stationary bootstrap (``method="stationary"``,
+Politis & Romano). Index arrays for a whole chunk of resamples are built in
+one shot and metrics are computed along axis 1, so thousands of resamples
+are a handful of array operations; chunks can also be spread over a
+process pool. Each chunk has its own seed, so results do not depend on
+``n_jobs``.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence
+import math
+import numpy as np
+import pandas as pd
+
+EULER_GAMMA = 0.5772156649015329
+
+
+def resample_indices(
+    n: int,
+    n_resamples: int,
+    block_len: float,
+    method: str = "stationary",
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """(n_resamples × n) positions into a length-``n`` series."""
+    rng = rng or np.random.default_rng()
+    if method == "block":
+        size = max(int(round(block_len)), 1)
+        n_blocks = -(-n // size)
+        starts = rng.integers(0, n, (n_resamples, n_blocks, 1))
+        idx = (starts + np.arange(size)) % n
+        return idx.reshape(n_resamples, -1)[:, :n]
+    if method == "stationary":
+        # a new block starts with probability 1/block_len at every step
+        new = rng.random((n_resamples, n)) < 1.0 / block_len
+        new[:, 0] = True
+        t = np.arange(n, dtype=np.int32)
+        block_start = np.where(new, t, np.int32(0))
+        np.maximum.accumulate(block_start, axis=1, out=block_start)
+        starts = rng.integers(0, n, (n_resamples, n), dtype=np.int32)
+        idx = np.take_along_axis(starts, block_start, axis=1)
+        idx += t
+        idx -= block_start
+        np.subtract(idx, n, out=idx, where=idx >= n)  # wrap around
+        return idx
+    raise ValueError(f"Unknown bootstrap method: {method}")
+
+
+def sharpe_ratio(r: np.ndarray, periods: int = 252) -> np.ndarray:
+    """Annualized Sharpe along the last axis (ddof=1, as ``PerformanceReport``)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return r.mean(axis=-1) / r.std(axis=-1, ddof=1) * np.sqrt(periods)
+
+
+def max_drawdown(r: np.ndarray) -> np.ndarray:
+    """Max drawdown of the compounded equity along the last axis."""
+    cum = np.add(r, 1.0)
+    np.cumprod(cum, axis=-1, out=cum)
+    np.divide(cum, np.maximum.accumulate(cum, axis=-1), out=cum)
+    return cum.min(axis=-1) - 1
+
+
+def _chunk_metrics(
+    returns: np.ndarray,
+    n_resamples: int,
+    block_len: float,
+    method: str,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    idx = resample_indices(len(returns), n_resamples, block_len, method,
+                           np.random.default_rng(seed))
+    sample = returns.take(idx)
+    return {"sharpe": sharpe_ratio(sample), "max_drawdown": max_drawdown(sample)}
+
+
+class BootstrapResult:
+    """Resampled metric distributions plus the point estimates they bracket."""
+
+    def __init__(self, returns: np.ndarray, samples: Dict[str, np.ndarray]):
+        self.samples = samples
+        self.point = {
+            "sharpe": float(sharpe_ratio(returns)),
+            "max_drawdown": float(max_drawdown(returns)),
+        }
+
+    def ci(self, metric: str = "sharpe", level: float = 0.95):
+        """Percentile confidence interval for ``metric``."""
+        tail = (1 - level) / 2 * 100
+        lo, hi = np.nanpercentile(self.samples[metric], [tail, 100 - tail])
+        return float(lo), float(hi)
+
+    def prob_positive(self, metric: str = "sharpe") -> float:
+        """Share of resamples with a positive ``metric``."""
+        return float(np.mean(self.samples[metric] > 0))
+
+    def summary(self, level: float = 0.95) -> Dict[str, float]:
+        out = {}
+        for metric, value in self.point.items():
+            lo, hi = self.ci(metric, level)
+            out.update({metric: value, f"{metric}_lo": lo, f"{metric}_hi": hi})
+        out["prob_sharpe_positive"] = self.prob_positive("sharpe")
+        return out
+
+
+def bootstrap(
+    returns: Sequence[float],
+    n_resamples: int = 10_000,
+    block_len: Optional[float] = None,
+    method: str = "stationary",
+    seed: Optional[int] = None,
+    chunk_size: int = 1_000,
+    n_jobs: int = 1
+) -> BootstrapResult:
+    """
+    Bootstrap Sharpe and max drawdown of daily ``returns`` (NaNs dropped).
+    ``block_len`` defaults to n^(1/3), the mean block length for the
+    stationary method and the fixed length for the block method.
+    """
+    r = pd.Series(returns, dtype=float).dropna().to_numpy()
+    if len(r) < 2:
+        raise ValueError("bootstrap needs at least two returns")
+    block_len = block_len or max(len(r) ** (1 / 3), 1.0)
+
+    sizes = [min(chunk_size, n_resamples - i) for i in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(r, size, block_len, method, s) for size, s in zip(sizes, seeds)]
+    if n_jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_chunk_metrics, *zip(*args)))
+    else:
+        chunks = [_chunk_metrics(*a) for a in args]
+
+    samples = {k: np.concatenate([c[k] for c in chunks]) for k in chunks[0]}
+    return BootstrapResult(r, samples)
+
+
+def expected_max_sharpe(n_trials: int, sharpe_std: float) -> float:
+    """Expected best Sharpe among ``n_trials`` skill-less strategies."""
+    if n_trials < 2:
+        return 0.0
+    z = NormalDist().inv_cdf
+    return sharpe_std * ((1 - EULER_GAMMA) * z(1 - 1 / n_trials)
+                         + EULER_GAMMA * z(1 - 1 / (n_trials * math.e)))
+
+
+def deflated_sharpe(
+    returns: Sequence[float],
+    n_trials: int = 1,
+    trial_sharpes: Optional[Sequence[float]] = None
+) -> float:
+    """
+    Deflated Sharpe ratio (Bailey & López de Prado): probability that the
+    true per-period Sharpe beats the best one expected by chance among
+    ``n_trials`` tried configurations, corrected for skew and fat tails.
+    ``trial_sharpes`` (annualized, one per trial) sets the dispersion of
+    that benchmark; with a single trial it is the probabilistic Sharpe vs 0.
+    """
+    r = pd.Series(returns, dtype=float).dropna().to_numpy()
+    n = len(r)
+    if n < 3 or r.std(ddof=1) == 0:
+        return np.nan
+    sr = r.mean() / r.std(ddof=1)
+    z = (r - r.mean()) / r.std(ddof=0)
+    skew = np.mean(z ** 3)
+    kurt = np.mean(z ** 4)
+
+    sr0 = 0.0
+    if trial_sharpes is not None and n_trials > 1:
+        trials = np.asarray(trial_sharpes, dtype=float) / np.sqrt(252)
+        sr0 = expected_max_sharpe(n_trials, float(np.nanstd(trials, ddof=1)))
+    denom = 1 - skew * sr + (kurt - 1) / 4 * sr ** 2
+    if denom <= 0:
+        return np.nan
+    return NormalDist().cdf((sr - sr0) * math.sqrt(n - 1) / math.sqrt(denom))
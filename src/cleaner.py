@@ -1,58 +1,105 @@
 # src/cleaner.py
 
+from typing import Union
 import pandas as pd
 import numpy as np
 import logging
 
+from .panel import PricePanel, as_frame, ffill, bfill
+
 logger = logging.getLogger(__name__)
 
+PRICE_COLS = ['Open', 'High', 'Low', 'Close']
+
 
 class DataCleaner:
-    """Validate & clean the fetched OHLCV data."""
+    """Validate & clean the fetched OHLCV data.
 
-    def clean(self, df: pd.DataFrame) -> pd.DataFrame:
+    All steps are vectorized: date coverage is a grouped reduction and the
+    per-ticker fill runs as array operations on a dates × tickers panel, so
+    the cost no longer grows with one Python call per date or per ticker.
+    """
+
+    def clean(self, df: Union[pd.DataFrame, PricePanel]) -> pd.DataFrame:
         """
         - Drops dates where <95% of tickers have a valid Close
         - Converts any non-positive prices to NaN
         - Forward/back‐fills per ticker
         - Drops any rows still containing NaNs (i.e. tickers with no data)
         - Ensures final DataFrame has no NaNs or non-positive prices
+        Rows come out grouped by ticker (sorted), in date order within each
+        ticker, as the original per-ticker groupby returned them.
         """
+        df = as_frame(df)
+
         # 1) drop dates with too many missing closes
+        df = self._drop_sparse_dates(df)
+
+        # 2) convert non-positive prices to NaN and
+        # 3) forward/back-fill per ticker (in date order)
+        df = self._fill(df, PRICE_COLS)
+
+        # 4) drop any rows still containing NaNs
+        # 5) final sanity checks
+        return self._finalize(df)
+
+    @staticmethod
+    def _drop_sparse_dates(df: pd.DataFrame) -> pd.DataFrame:
+        """Drop dates where fewer than 95% of tickers have a valid Close."""
         n_tickers = len(df.index.unique('Ticker'))
         thresh = int(n_tickers * 0.95)
-        valid = (
-            df.reset_index()
-            .groupby('Date')
-            .apply(lambda d: d['Close'].notna().sum() >= thresh)
-        )
-        good_dates = valid[valid].index
-        df = df.loc[good_dates]
-
-        # 2) convert non-positive prices to NaN
-        price_cols = ['Open', 'High', 'Low', 'Close']
-        for col in price_cols:
-            mask = df[col] <= 0
-            if mask.any():
-                logger.warning(
-                    f"Found {mask.sum()} non-positive values in {col}, marking as NaN")
-                df.loc[mask, col] = np.nan
-
-        # 3) forward/back-fill per ticker
-        df = df.groupby('Ticker').apply(lambda x: x.ffill().bfill()).droplevel(0)
+        valid = df['Close'].notna().groupby(level='Date').sum() >= thresh
+        if not valid.all():
+            good_dates = valid.index[valid]
+            df = df[df.index.get_level_values('Date').isin(good_dates)]
+        return df
 
-        # 4) drop any rows still containing NaNs
-        before = len(df)
-        df = df.dropna()
-        dropped = before - len(df)
-        if dropped > 0:
-            logger.warning(f"Dropped {dropped} rows still containing NaNs after fill")
+    @staticmethod
+    def _fill(df: pd.DataFrame, price_cols) -> pd.DataFrame:
+        """
+        NaN out non-positive ``price_cols``, then ffill().bfill() within
+        each ticker. Runs on a dense panel and returns a new frame with the
+        rows in ticker-major order.
+        """
+        panel = PricePanel.from_frame(df)
+        flat = panel.flat_positions(df.index)
+        n_dates, n_tickers = panel.shape
+        order = np.argsort((flat % n_tickers) * n_dates + flat // n_tickers, kind='stable')
+        flat = flat[order]
+        out = {}
+        for col in panel.columns:
+            arr = panel[col]
+            if col in price_cols:
+                bad = arr <= 0
+                if bad.any():
+                    logger.warning(
+                        f"Found {bad.sum()} non-positive values in {col}, marking as NaN")
+                    arr = np.where(bad, np.nan, arr)
+            if arr.dtype.kind != 'f' or not np.isnan(arr).any():
+                out[col] = df[col].to_numpy()[order]
+                continue
+            filled = ffill(arr)
+            # after ffill only leading NaNs remain; bfill just those tickers
+            lead = np.isnan(filled[0])
+            if lead.any():
+                filled[:, lead] = bfill(filled[:, lead])
+            # gather back only the cells that were rows of the input
+            out[col] = filled.ravel().take(flat)
+        return pd.DataFrame(out, index=df.index[order])
 
-        # 5) final sanity checks
-        if df[price_cols].isna().any().any():
+    @staticmethod
+    def _finalize(df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows still containing NaNs, then run the sanity checks."""
+        na_rows = df.isna().any(axis=1)
+        if na_rows.any():
+            df = df[~na_rows]
+            logger.warning(
+                f"Dropped {na_rows.sum()} rows still containing NaNs after fill")
+
+        if df[PRICE_COLS].isna().any().any():
             raise RuntimeError(
                 "DataCleaner: NaNs remain in price columns after dropna()")
-        if (df[price_cols] <= 0).any().any():
+        if (df[PRICE_COLS] <= 0).any().any():
             raise RuntimeError("DataCleaner: Non-positive price remains after cleanup")
         if (df['Volume'] < 0).any():
             raise RuntimeError("DataCleaner: Negative volume found")
@@ -32,3 +32,47 @@ SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "")
 
 # Prometheus Pushgateway
 METRICS_PUSHGATEWAY = os.getenv("METRICS_PUSHGATEWAY", "")
+
+# Local OHLCV cache used by DataFetcher (empty disables caching)
+PRICE_CACHE_DIR = os.getenv("PRICE_CACHE_DIR", "data/prices")
+
+# Concurrent downloads: max in-flight tickers, requests/sec (0 = unlimited), retries
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", 8))
+FETCH_RATE_LIMIT = float(os.getenv("FETCH_RATE_LIMIT", 5))
+FETCH_MAX_RETRIES = int(os.getenv("FETCH_MAX_RETRIES", 2))
+
+# Content-addressed feature store: set a dir to also keep entries on disk, capped
+# at FEATURE_STORE_MAX_MB (empty dir = memory only)
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "")
+FEATURE_STORE_MAX_MB = int(os.getenv("FEATURE_STORE_MAX_MB", 2048))
+
+# Daily run: bars of signals to evaluate on top of the feature lookback
+DAILY_EVAL_BARS = int(os.getenv("DAILY_EVAL_BARS", 252))
+
+# Processes for FeatureEngineer ticker shards (1 = compute in-process)
+FEATURE_WORKERS = int(os.getenv("FEATURE_WORKERS", 1))
+
+# Daily signal history (append-only) and the streaming feature state behind it
+# (empty = not kept: each run recomputes the fetched window's signals)
+SIGNAL_STORE_DIR = os.getenv("SIGNAL_STORE_DIR", "")
+FEATURE_STATE_PATH = os.getenv("FEATURE_STATE_PATH", "")
+
+# Persisted lifetime / rolling (DAILY_EVAL_BARS) performance of the daily returns
+# (empty = not kept: each run measures only the fetched window)
+PERF_STATE_PATH = os.getenv("PERF_STATE_PATH", "")
+
+# Minute bars partitioned by day, and processes for per-date intraday backtests
+MINUTE_STORE_DIR = os.getenv("MINUTE_STORE_DIR", "data/minutes")
+INTRADAY_WORKERS = int(os.getenv("INTRADAY_WORKERS", 1))
+
+# Causal ATR table (daily bars -> ATR in force each date), cached next to the prices
+ATR_TABLE_PATH = os.getenv("ATR_TABLE_PATH", "data/prices/atr.npz")
+
+# Processes for walk-forward tuning (1 = run splits in-process)
+TUNER_WORKERS = int(os.getenv("TUNER_WORKERS", 1))
+
+# Completed (grid point, split) tuning results (empty dir = not kept), how long an
+# unrefreshed claim on one stays valid, and this worker's id for taking back its claims
+TUNING_STORE_DIR = os.getenv("TUNING_STORE_DIR", "")
+TUNING_LEASE_SECONDS = float(os.getenv("TUNING_LEASE_SECONDS", 60))
+TUNING_RUN_ID = os.getenv("TUNING_RUN_ID", "")
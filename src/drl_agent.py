@@ -8,6 +8,7 @@ from .env import DRLTradingEnv
 from .fetcher import DataFetcher
 from .cleaner import DataCleaner
 from .features import FeatureEngineer
+from .policy import export_sac_actor
 
 
 def train_drl_agent(
@@ -33,6 +34,8 @@ def train_drl_agent(
     model.learn(total_timesteps=total_timesteps, callback=checkpoint)
     model.save(model_path)
     print(f"Saved DRL agent to {model_path}")
+    # numpy-only actor used by StrategyEngine at inference time
+    print(f"Exported actor to {export_sac_actor(model_path)}")
     return model
 
 
@@ -4,6 +4,9 @@ import gym
 from gym import spaces
 import numpy as np
 import pandas as pd
+from typing import Union
+
+from .panel import PricePanel, as_panel
 
 
 class DRLTradingEnv(gym.Env):
@@ -17,16 +20,32 @@ class DRLTradingEnv(gym.Env):
 
     def __init__(
         self,
-        price_df: pd.DataFrame,
-        feature_df: pd.DataFrame,
+        price_df: Union[pd.DataFrame, PricePanel],
+        feature_df: Union[pd.DataFrame, PricePanel],
         slippage: float = 0.0005,
         commission: float = 0.0002,
     ):
         super().__init__()
-        self.dates = sorted(set(price_df.index.get_level_values('Date')))
-        self.tickers = sorted(set(price_df.index.get_level_values('Ticker')))
-        self.price_df = price_df['Close'].unstack()
-        self.feature_df = feature_df.unstack(level='Ticker')
+        prices = as_panel(price_df, ['Close'])
+        feats = as_panel(feature_df)
+        rows = feats.dates.get_indexer(prices.dates)
+        cols = feats.tickers.get_indexer(prices.tickers)
+        if (cols < 0).any():
+            missing = list(prices.tickers[cols < 0])
+            raise ValueError(f"DRLTradingEnv: no features for tickers {missing}")
+        # trade only the dates with features (e.g. not the feature warm-up)
+        has_feats = rows >= 0
+        if has_feats.sum() < 2:
+            raise ValueError("DRLTradingEnv: fewer than two dates have features")
+        rows = rows[has_feats]
+        self.dates = list(prices.dates[has_feats])
+        self.tickers = list(prices.tickers)
+        # (date, ticker) arrays aligned on the price grid
+        self.prices = prices['Close'][has_feats]
+        # (feature, date, ticker) so a date slice flattens feature-major,
+        # matching the column order of feature_df.unstack('Ticker')
+        self.features = np.stack(
+            [feats[c][np.ix_(rows, cols)] for c in feats.columns])
         self.slippage = slippage
         self.commission = commission
         self.cur_step = 0
@@ -35,7 +54,7 @@ class DRLTradingEnv(gym.Env):
         # spaces
         self.action_space = spaces.Box(
             low=-1.0, high=1.0, shape=(self.n,), dtype=np.float32)
-        f = self.feature_df.shape[1] // self.n
+        f = self.features.shape[0]
         self.observation_space = spaces.Box(
             low=-np.inf, high=np.inf, shape=(self.n * f,), dtype=np.float32
         )
@@ -46,15 +65,12 @@ class DRLTradingEnv(gym.Env):
         return self._get_obs()
 
     def _get_obs(self):
-        date = self.dates[self.cur_step]
-        feats = self.feature_df.loc[date].values.flatten()
+        feats = self.features[:, self.cur_step, :].flatten()
         return feats.astype(np.float32)
 
     def step(self, action):
-        date = self.dates[self.cur_step]
-        next_date = self.dates[self.cur_step + 1]
-        prices = self.price_df.loc[date].values
-        next_prices = self.price_df.loc[next_date].values
+        prices = self.prices[self.cur_step]
+        next_prices = self.prices[self.cur_step + 1]
 
         returns = (next_prices - prices) / prices
         pnl = np.dot(action, returns) / self.n
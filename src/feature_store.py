@@ -0,0 +1,128 @@
+# src/feature_store.py
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+import logging
+
+from .config import FEATURE_STORE_DIR, FEATURE_STORE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureStore:
+    """
+    Content-addressed cache of computed feature frames.
+
+    Entries are keyed by a hash of the input data (index and values) plus
+    the feature parameters, so identical inputs map to the same entry for
+    every ``FeatureEngineer`` sharing the store.
+    Two tiers: an in-memory LRU of ``max_items`` frames, backed by Parquet
+    files under ``root`` that are evicted least-recently-used first once
+    they exceed ``max_bytes``. An empty ``root`` keeps the store in memory.
+    """
+
+    def __init__(
+        self,
+        root: str = FEATURE_STORE_DIR,
+        max_items: int = 16,
+        max_bytes: int = FEATURE_STORE_MAX_MB * 1024 ** 2
+    ):
+        self.root = root
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.memory: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: pd.DataFrame, params: Dict[str, Any]) -> str:
+        """Hash of the input frame's content plus the feature parameters."""
+        h = hashlib.sha256()
+        h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        h.update(json.dumps(list(map(str, data.columns))).encode())
+        h.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Cached frame for ``key`` (memory first, then disk), or None."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key].copy()
+        if self.root and os.path.exists(self._path(key)):
+            try:
+                df = pd.read_parquet(self._path(key))
+                os.utime(self._path(key))  # mark as recently used
+            except (OSError, ValueError) as e:
+                logger.warning(f"FeatureStore: unreadable entry {key}: {e}")
+            else:
+                self._remember(key, df)
+                with self.lock:
+                    self.hits += 1
+                return df.copy()
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, df: pd.DataFrame):
+        """Store a frame in both tiers."""
+        self._remember(key, df.copy())
+        if not self.root:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp)
+        os.replace(tmp, self._path(key))
+        self._evict_disk()
+
+    def get_or_compute(
+        self,
+        data: pd.DataFrame,
+        params: Dict[str, Any],
+        compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Return the cached result for (data, params), computing it on a miss."""
+        key = self.key(data, params)
+        df = self.get(key)
+        if df is None:
+            df = compute()
+            self.put(key, df)
+        return df
+
+    def _remember(self, key: str, df: pd.DataFrame):
+        with self.lock:
+            self.memory[key] = df
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_items:
+                self.memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
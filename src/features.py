@@ -1,35 +1,482 @@
 # src/features.py
 
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import pandas as pd
 import numpy as np
-from ta.momentum import RSIIndicator, TSIIndicator
-from ta.volatility import BollingerBands
+
+from .config import FEATURE_WORKERS
+from .panel import PricePanel, as_frame, as_panel
+from .indicators import momentum, rolling_std, rsi, tsi
+from .feature_store import FeatureStore
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLS = ['5d_mom', '20d_mom', '20d_vol', 'rsi', 'tsi']
+
+# EMA-based features depend on all history; count an EMA as settled once
+# the weight left on its seed value drops below this
+EMA_SETTLE_TOL = 1e-3
+
+
+def ema_settle_bars(alpha: float, tol: float = EMA_SETTLE_TOL) -> int:
+    """Bars until an EMA with smoothing ``alpha`` forgets its seed to ``tol``."""
+    return math.ceil(math.log(tol) / math.log(1 - alpha))
+
+
+class FeatureSpec(NamedTuple):
+    """A registered feature: what it reads, how much history, how to compute.
+
+    ``inputs`` name price columns or other features; ``fn`` receives their
+    dates × tickers arrays positionally. ``lookback`` is the number of prior
+    bars the feature needs on top of the lookback of its inputs.
+    """
+    inputs: Tuple[str, ...]
+    lookback: int
+    fn: Callable[..., np.ndarray]
 
 
 class FeatureEngineer:
-    """Compute momentum, volatility, RSI, TSI features."""
+    """Compute momentum, volatility, RSI, TSI features.
+
+    Indicators run on the dates × tickers close array for all tickers at
+    once (see ``src.indicators``) and match the per-ticker ``ta`` results.
+    With a ``FeatureStore``, results are reused for identical inputs.
+
+    Features live in ``self.registry``; callers ask for the columns they
+    use and only those plus their dependencies are computed. ``lookback``
+    reports how many bars of history a set of columns needs.
+
+    With ``n_jobs > 1`` the built-in features are computed over ticker
+    shards in a process pool; the close array and the results travel
+    through shared memory. Features registered later run in the parent.
+    """
+
+    def __init__(
+        self,
+        mom_short: int = 5,
+        mom_long: int = 20,
+        vol_window: int = 20,
+        rsi_window: int = 14,
+        tsi_slow: int = 25,
+        tsi_fast: int = 13,
+        store: Optional[FeatureStore] = None,
+        n_jobs: int = FEATURE_WORKERS
+    ):
+        self.store = store
+        self.n_jobs = n_jobs
+        self.mom_short = mom_short
+        self.mom_long = mom_long
+        self.vol_window = vol_window
+        self.rsi_window = rsi_window
+        self.tsi_slow = tsi_slow
+        self.tsi_fast = tsi_fast
+        self.registry: Dict[str, FeatureSpec] = {}
+        self.custom = set()  # registered after construction: not shardable
+        self._register_defaults()
+        self.custom.clear()
+
+    def _register_defaults(self):
+        tsi_warmup = self.tsi_slow + self.tsi_fast - 1
+        self.register('5d_mom', ['Close'], self.mom_short,
+                      lambda c: momentum(c, self.mom_short))
+        self.register('20d_mom', ['Close'], self.mom_long,
+                      lambda c: momentum(c, self.mom_long))
+        self.register('20d_vol', ['Close'], self.vol_window - 1,
+                      lambda c: rolling_std(c, self.vol_window))
+        self.register('rsi', ['Close'],
+                      self.rsi_window - 1 + ema_settle_bars(1 / self.rsi_window),
+                      lambda c: rsi(c, self.rsi_window))
+        self.register('tsi', ['Close'],
+                      tsi_warmup + ema_settle_bars(2 / (self.tsi_slow + 1))
+                      + ema_settle_bars(2 / (self.tsi_fast + 1)),
+                      lambda c: tsi(c, self.tsi_slow, self.tsi_fast))
+
+    def register(
+        self,
+        name: str,
+        inputs: Iterable[str],
+        lookback: int,
+        fn: Callable[..., np.ndarray]
+    ):
+        """Add (or replace) a feature computed by ``fn(*input_arrays)``."""
+        self.registry[name] = FeatureSpec(tuple(inputs), lookback, fn)
+        self.custom.add(name)
 
-    def build_features(self, price_df: pd.DataFrame) -> pd.DataFrame:
+    def resolve(self, columns: Optional[Iterable[str]] = None) -> List[str]:
+        """Features to compute for ``columns``, dependencies first."""
+        columns = list(self.registry) if columns is None else list(columns)
+        order: List[str] = []
+        active = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name not in self.registry:
+                raise KeyError(f"Unknown feature: {name}")
+            if name in active:
+                raise ValueError(f"Feature dependency cycle at {name}")
+            active.add(name)
+            for dep in self.registry[name].inputs:
+                if dep in self.registry:
+                    visit(dep)
+            active.discard(name)
+            order.append(name)
+
+        for name in columns:
+            visit(name)
+        return order
+
+    def raw_inputs(self, columns: Optional[Iterable[str]] = None) -> List[str]:
+        """Price columns read by ``columns`` and their dependencies."""
+        raw = []
+        for name in self.resolve(columns):
+            raw += [c for c in self.registry[name].inputs
+                    if c not in self.registry and c not in raw]
+        return raw
+
+    def lookback(self, columns: Optional[Iterable[str]] = None) -> int:
+        """Bars of history needed before the last bar for ``columns``."""
+        total: Dict[str, int] = {}
+        for name in self.resolve(columns):
+            spec = self.registry[name]
+            total[name] = spec.lookback + max(
+                [total[d] for d in spec.inputs if d in total], default=0)
+        return max(total.values(), default=0)
+
+    @property
+    def params(self) -> Dict[str, int]:
+        return {
+            'mom_short': self.mom_short,
+            'mom_long': self.mom_long,
+            'vol_window': self.vol_window,
+            'rsi_window': self.rsi_window,
+            'tsi_slow': self.tsi_slow,
+            'tsi_fast': self.tsi_fast,
+        }
+
+    def compute(
+        self,
+        data: Union[np.ndarray, Mapping[str, np.ndarray]],
+        columns: Optional[Iterable[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Feature arrays (dates × tickers) for ``columns`` (default: all),
+        from a close array or a mapping of price column -> array.
+        """
+        columns = list(self.registry) if columns is None else list(columns)
+        values = dict(data) if isinstance(data, Mapping) else {'Close': data}
+        order = self.resolve(columns)
+        if self.n_jobs > 1 and 'Close' in values:
+            builtin = [n for n in order if n not in self.custom]
+            if builtin and values['Close'].shape[1] >= 2 * self.n_jobs:
+                values.update(self._compute_sharded(values['Close'], builtin))
+        for name in order:
+            if name in values:
+                continue
+            spec = self.registry[name]
+            values[name] = spec.fn(*(values[c] for c in spec.inputs))
+        return {name: values[name] for name in columns}
+
+    def _compute_sharded(
+        self,
+        close: np.ndarray,
+        columns: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """Built-in ``columns`` from ``close``, one ticker shard per worker."""
+        close = np.asarray(close, dtype=float)  # the shared blocks are float64
+        shape = close.shape
+        nbytes = max(close.nbytes, 1)
+        shm_in = shared_memory.SharedMemory(create=True, size=nbytes)
+        shm_out = shared_memory.SharedMemory(create=True, size=nbytes * len(columns))
+        try:
+            np.ndarray(shape, dtype=float, buffer=shm_in.buf)[:] = close
+            bounds = np.linspace(0, shape[1], self.n_jobs + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                jobs = [
+                    pool.submit(_feature_shard, self.params, columns,
+                                shm_in.name, shm_out.name, shape, lo, hi)
+                    for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+                ]
+                for job in jobs:
+                    job.result()
+            out = np.ndarray((len(columns),) + shape, dtype=float, buffer=shm_out.buf)
+            result = {name: out[i].copy() for i, name in enumerate(columns)}
+            del out
+            return result
+        finally:
+            for shm in (shm_in, shm_out):
+                shm.close()
+                shm.unlink()
+
+    def build_features(
+        self,
+        price_df: Union[pd.DataFrame, PricePanel],
+        columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
         """
         Input: MultiIndex (Date, Ticker) × [Open, High, Low, Close, Volume]
-        Output: same index with added columns: 5d_mom, 20d_mom, 20d_vol, rsi, tsi
-        """
-        df = price_df.copy()
-        df['5d_mom'] = df.groupby('Ticker')['Close'].pct_change(5)
-        df['20d_mom'] = df.groupby('Ticker')['Close'].pct_change(20)
-        df['20d_vol'] = (
-            df.groupby('Ticker')['Close']
-              .rolling(20).std()
-              .reset_index(level=0, drop=True)
-        )
-        df['rsi'] = (
-            df.groupby('Ticker')['Close']
-              .apply(lambda x: RSIIndicator(x, window=14).rsi())
-        )
-        df['tsi'] = (
-            df.groupby('Ticker')['Close']
-              .apply(lambda x: TSIIndicator(x, window_slow=25, window_fast=13).tsi())
-        )
+        (or the equivalent PricePanel)
+        Output: same index with added feature ``columns`` (default: all
+        registered, i.e. 5d_mom, 20d_mom, 20d_vol, rsi, tsi)
+        """
+        df = as_frame(price_df)
+        columns = list(self.registry) if columns is None else list(columns)
+        if self.store is not None:
+            return self.store.get_or_compute(
+                df, {'kind': 'features', 'columns': columns, **self.params},
+                lambda: self._build(df, columns))
+        return self._build(df, columns)
+
+    def _build(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        panel = as_panel(df, self.raw_inputs(columns))
+        flat = panel.flat_positions(df.index)
+        arrays = {c: panel[c] for c in panel.columns}
+        feats = {name: arr.ravel().take(flat)
+                 for name, arr in self.compute(arrays, columns).items()}
 
-        df = df.dropna()
+        df = df.assign(**feats).dropna()
         return df
+
+
+def _feature_shard(
+    params: Dict[str, int],
+    columns: List[str],
+    in_name: str,
+    out_name: str,
+    shape: Tuple[int, int],
+    lo: int,
+    hi: int
+):
+    """Process-pool worker: compute ``columns`` for tickers ``[lo, hi)``."""
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        close = np.ndarray(shape, dtype=float, buffer=shm_in.buf)
+        out = np.ndarray((len(columns),) + tuple(shape), dtype=float, buffer=shm_out.buf)
+        fe = FeatureEngineer(**params, n_jobs=1)
+        feats = fe.compute(np.ascontiguousarray(close[:, lo:hi]), columns)
+        for i, name in enumerate(columns):
+            out[i, :, lo:hi] = feats[name]
+        del close, out
+    finally:
+        shm_in.close()
+        shm_out.close()
+
+
+class StreamingFeatures:
+    """
+    Per-ticker indicator state advanced one bar at a time.
+
+    Holds, for every ticker, a ring buffer of the last closes (for the
+    momentum and volatility windows), the RSI up/down EMAs and the two
+    stages of the TSI EMAs. ``update`` advances all tickers for each new
+    date with O(window) work per ticker, independent of history length, and
+    the state round-trips through ``save``/``load`` between daily runs.
+    Feeding a full history from scratch reproduces ``FeatureEngineer``.
+    """
+
+    _STATE = ['count', 'buf', 'up', 'dn', 'e1', 'a1', 'n1', 'e2', 'a2', 'n2']
+
+    def __init__(self, engineer: Optional[FeatureEngineer] = None):
+        self.engineer = engineer or FeatureEngineer()
+        p = self.engineer
+        self.buf_len = max(p.mom_short, p.mom_long, p.vol_window - 1) + 1
+        self.tickers = pd.Index([], name='Ticker')
+        self.last_date: Optional[pd.Timestamp] = None
+        self.count = np.zeros(0, dtype=np.int64)    # closes seen per ticker
+        self.buf = np.zeros((self.buf_len, 0))      # ring of last closes
+        self.up = np.zeros(0)                       # RSI EMAs
+        self.dn = np.zeros(0)
+        self.e1 = np.zeros(0)                       # TSI slow EMAs (diff, |diff|)
+        self.a1 = np.zeros(0)
+        self.n1 = np.zeros(0, dtype=np.int64)
+        self.e2 = np.zeros(0)                       # TSI fast EMAs of the above
+        self.a2 = np.zeros(0)
+        self.n2 = np.zeros(0, dtype=np.int64)
+
+    def _ensure_tickers(self, tickers: pd.Index):
+        new = tickers.difference(self.tickers)
+        if new.empty:
+            return
+        k = len(new)
+        self.tickers = self.tickers.append(pd.Index(new, name='Ticker'))
+        for name in self._STATE:
+            arr = getattr(self, name)
+            pad_shape = (self.buf_len, k) if name == 'buf' else (k,)
+            setattr(self, name, np.concatenate(
+                [arr, np.zeros(pad_shape, dtype=arr.dtype)], axis=arr.ndim - 1))
+
+    def _advance(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """Advance every ticker with a non-NaN close by one bar."""
+        p = self.engineer
+        obs = ~np.isnan(close)
+        j = np.flatnonzero(obs)
+        x = close[j]
+        c = self.count[j]
+        seen = c > 0
+        prev = self.buf[(c - 1) % self.buf_len, j]
+        diff = np.where(seen, x - prev, 0.0)
+
+        # RSI: the first bar counts as a zero move
+        alpha = 1 / p.rsi_window
+        up, dn = np.maximum(diff, 0.0), np.maximum(-diff, 0.0)
+        self.up[j] = np.where(seen, self.up[j] * (1 - alpha) + alpha * up, up)
+        self.dn[j] = np.where(seen, self.dn[j] * (1 - alpha) + alpha * dn, dn)
+
+        # TSI: slow EMAs of the diffs, then fast EMAs once the slow ones are warm
+        js = j[seen]
+        d = diff[seen]
+        alpha = 2 / (p.tsi_slow + 1)
+        first = self.n1[js] == 0
+        self.e1[js] = np.where(first, d, self.e1[js] * (1 - alpha) + alpha * d)
+        self.a1[js] = np.where(first, np.abs(d),
+                               self.a1[js] * (1 - alpha) + alpha * np.abs(d))
+        self.n1[js] += 1
+        jw = js[self.n1[js] >= p.tsi_slow]
+        alpha = 2 / (p.tsi_fast + 1)
+        first = self.n2[jw] == 0
+        self.e2[jw] = np.where(first, self.e1[jw],
+                               self.e2[jw] * (1 - alpha) + alpha * self.e1[jw])
+        self.a2[jw] = np.where(first, self.a1[jw],
+                               self.a2[jw] * (1 - alpha) + alpha * self.a1[jw])
+        self.n2[jw] += 1
+
+        self.buf[c % self.buf_len, j] = x
+        self.count[j] = c + 1
+        return self._current(j)
+
+    def _current(self, j: np.ndarray) -> Dict[str, np.ndarray]:
+        """Feature values for tickers ``j`` as of their latest bar."""
+        p = self.engineer
+        n = self.count[j]
+        last = self.buf[(n - 1) % self.buf_len, j]
+        nan = np.full(len(j), np.nan)
+        out = {}
+
+        for name, periods in (('5d_mom', p.mom_short), ('20d_mom', p.mom_long)):
+            back = self.buf[(n - 1 - periods) % self.buf_len, j]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[name] = np.where(n > periods, last / back - 1, nan)
+
+        w = p.vol_window
+        window = self.buf[(n[None, :] - 1 - np.arange(w)[:, None]) % self.buf_len, j]
+        vol = window.std(axis=0, ddof=1) if w > 1 else nan
+        out['20d_vol'] = np.where(n >= w, vol, nan)
+
+        up, dn = self.up[j], self.dn[j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(dn == 0, 100.0, 100 - 100 / (1 + up / dn))
+            t = 100 * self.e2[j] / self.a2[j]
+        out['rsi'] = np.where(n >= p.rsi_window, r, nan)
+        out['tsi'] = np.where(self.n2[j] >= p.tsi_fast, t, nan)
+        return out
+
+    def update(self, bars: Union[pd.DataFrame, PricePanel]) -> pd.DataFrame:
+        """
+        Advance the state through every date in ``bars`` after
+        ``last_date`` and return those rows with the feature columns added,
+        in the same form as ``FeatureEngineer.build_features``.
+        """
+        df = as_frame(bars)
+        if self.last_date is not None:
+            df = df[df.index.get_level_values('Date') > self.last_date]
+        if df.empty:
+            return df.assign(**{c: pd.Series(dtype=float) for c in FEATURE_COLS})
+
+        panel = as_panel(df, ['Close'])
+        self._ensure_tickers(panel.tickers)
+        cols = self.tickers.get_indexer(panel.tickers)
+        feats = {c: np.full(panel.shape, np.nan) for c in FEATURE_COLS}
+        for i in range(len(panel.dates)):
+            close = np.full(len(self.tickers), np.nan)
+            close[cols] = panel['Close'][i]
+            j = np.flatnonzero(~np.isnan(close))
+            row = self._advance(close)
+            pos = panel.tickers.get_indexer(self.tickers[j])
+            for c in FEATURE_COLS:
+                feats[c][i, pos] = row[c]
+        self.last_date = panel.dates[-1]
+
+        flat = panel.flat_positions(df.index)
+        return df.assign(**{c: a.ravel().take(flat) for c, a in feats.items()}).dropna()
+
+    def continues(self, bars: Union[pd.DataFrame, PricePanel]) -> bool:
+        """
+        True unless ``bars`` disagree with the closes the state holds for
+        ``last_date``, i.e. a split or dividend re-adjusted the history the
+        state was built from.
+        """
+        if self.last_date is None:
+            return True
+        df = as_frame(bars)
+        last = df[df.index.get_level_values('Date') == self.last_date]
+        if last.empty:
+            return True
+        close = last['Close'].droplevel('Date')
+        j = self.tickers.get_indexer(close.index)
+        ok = (j >= 0) & close.notna().to_numpy()
+        j = j[ok]
+        seen = self.buf[(self.count[j] - 1) % self.buf_len, j]
+        return bool(np.allclose(np.where(self.count[j] > 0, seen, np.nan),
+                                close.to_numpy()[ok]))
+
+    def verify(
+        self,
+        price_df: Union[pd.DataFrame, PricePanel],
+        rtol: float = 1e-8,
+        atol: float = 1e-8
+    ) -> bool:
+        """
+        Compare the state's latest feature row with a full recompute over
+        ``price_df`` (the history the state was built from).
+        """
+        full = self.engineer.build_features(price_df, FEATURE_COLS)
+        last = full.index.get_level_values('Date').max()
+        expected = full.xs(last, level='Date')[FEATURE_COLS]
+        j = self.tickers.get_indexer(expected.index)
+        if (j < 0).any():
+            logger.warning("StreamingFeatures: state is missing tickers")
+            return False
+        got = pd.DataFrame(self._current(j), index=expected.index)
+        ok = bool(np.allclose(got.to_numpy(), expected.to_numpy(),
+                              rtol=rtol, atol=atol, equal_nan=True))
+        if not ok:
+            diff = (got - expected).abs().max().max()
+            logger.warning(f"StreamingFeatures: drift vs full recompute ({diff:.3g})")
+        return ok
+
+    def save(self, path: str):
+        """Persist the state (and the feature parameters) to an .npz file."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {name: getattr(self, name) for name in self._STATE}
+        np.savez(
+            path,
+            tickers=np.asarray(self.tickers, dtype=str),
+            last_date=np.datetime64(self.last_date or 'NaT', 'ns'),
+            params=np.array(list(self.engineer.params.values())),
+            **arrays
+        )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        engineer: Optional[FeatureEngineer] = None
+    ) -> 'StreamingFeatures':
+        """Restore a state written by ``save``."""
+        state = cls(engineer)
+        with np.load(path) as data:
+            if list(data['params']) != list(state.engineer.params.values()):
+                raise ValueError(
+                    f"StreamingFeatures: {path} was built with different feature parameters")
+            state.tickers = pd.Index(data['tickers'].tolist(), name='Ticker')
+            last = data['last_date'][()]
+            state.last_date = None if np.isnat(last) else pd.Timestamp(last)
+            for name in cls._STATE:
+                setattr(state, name, data[name])
+        return state
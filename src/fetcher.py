@@ -1,21 +1,145 @@
 # src/fetcher.py
 
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import threading
+import time
+import numpy as np
 import pandas as pd
-import yfinance as yf
-import pandas_market_calendars as mcal
 import logging
 
+from .config import (
+    PRICE_CACHE_DIR,
+    FETCH_MAX_WORKERS,
+    FETCH_RATE_LIMIT,
+    FETCH_MAX_RETRIES,
+)
+from .price_cache import PriceCache, PRICE_COLS
+
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter (``rate`` tokens per second)."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
 class DataFetcher:
     """Fetch EOD OHLCV data (auto-adjusted), backfilled to the NYSE calendar.
     Falls back to synthetic flat data if all tickers fail to download.
+    Downloads go through an on-disk ``PriceCache`` (disabled when
+    ``cache_dir`` is empty) so only date ranges not already cached are fetched.
+    Up to ``max_workers`` tickers are fetched concurrently; requests are
+    throttled to ``rate_limit`` per second (0 disables) and retried with
+    exponential backoff before a ticker is skipped.
     """
 
-    def __init__(self, calendar_name: str = "NYSE"):
-        self.cal = mcal.get_calendar(calendar_name)
+    def __init__(
+        self,
+        calendar_name: str = "NYSE",
+        cache_dir: Optional[str] = PRICE_CACHE_DIR,
+        max_workers: int = FETCH_MAX_WORKERS,
+        rate_limit: float = FETCH_RATE_LIMIT,
+        max_retries: int = FETCH_MAX_RETRIES,
+        backoff: float = 1.0,
+    ):
+        self.calendar_name = calendar_name
+        self._cal = None
+        self.cache = PriceCache(cache_dir) if cache_dir else None
+        self.max_workers = max(1, max_workers)
+        self.limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    @property
+    def cal(self):
+        """Exchange calendar, built on first use (pandas_market_calendars is slow to import)."""
+        if self._cal is None:
+            import pandas_market_calendars as mcal
+            self._cal = mcal.get_calendar(self.calendar_name)
+        return self._cal
+
+    def start_for_bars(self, end: str, bars: int) -> str:
+        """
+        Earliest start date so ``[start, end)`` holds ``bars`` sessions of
+        the exchange calendar.
+        """
+        end_ts = pd.Timestamp(end)
+        # ~252 sessions per 365 days, plus slack for holiday clusters
+        lo = end_ts - pd.Timedelta(days=int(bars * 365 / 252) + 30)
+        sessions = self.cal.valid_days(start_date=lo, end_date=end_ts)
+        sessions = sessions.tz_localize(None).normalize()
+        sessions = sessions[sessions < end_ts]
+        if len(sessions) < bars or bars <= 0:
+            return (lo if bars > 0 else end_ts).date().isoformat()
+        return sessions[-bars].date().isoformat()
+
+    def _request(self, sym: str, start: str, end: str) -> pd.DataFrame:
+        """Rate-limited ``_download`` with retry and exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                return self._download(sym, start, end)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.info(f"{sym}: download failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _download(self, sym: str, start: str, end: str) -> pd.DataFrame:
+        """Download ``[start, end)`` for one ticker, indexed by naive dates."""
+        import yfinance as yf
+
+        # auto_adjust=True already handles splits & dividends
+        df_sym = yf.Ticker(sym) \
+            .history(start=start, end=end, auto_adjust=True) \
+            .loc[:, PRICE_COLS]
+        if df_sym.index.tz is not None:
+            df_sym.index = df_sym.index.tz_localize(None)
+        df_sym.index = df_sym.index.normalize()
+        df_sym.index.name = "Date"
+        return df_sym
+
+    def _fetch_ticker(self, sym: str, start: str, end: str) -> pd.DataFrame:
+        """Return ``[start, end)`` for one ticker, filling cache gaps first."""
+        if self.cache is None:
+            return self._request(sym, start, end)
+
+        for lo, hi in self.cache.missing_ranges(sym, start, end):
+            fresh = self._request(sym, lo, hi)
+            cached = self.cache.read(sym, lo, hi)
+            overlap = cached.index.intersection(fresh.index)
+            if len(overlap) and not np.allclose(
+                    cached.loc[overlap, "Close"], fresh.loc[overlap, "Close"]):
+                # a split/dividend re-adjusted the history: start over
+                logger.info(f"{sym}: adjusted history changed, refreshing cache")
+                self.cache.invalidate(sym)
+                return self._fetch_ticker(sym, start, end)
+            self.cache.update(sym, fresh, lo, hi)
+
+        return self.cache.read(sym, start, end)
 
     def fetch_daily(
         self,
@@ -23,21 +147,24 @@ class DataFetcher:
         start: str,
         end: str,
     ) -> pd.DataFrame:
-        # 1) Attempt per-ticker download
-        price_frames = []
-        for sym in tickers:
+        # 1) Attempt per-ticker download (cache first), possibly concurrent
+        def fetch_one(sym):
             try:
-                # auto_adjust=True already handles splits & dividends
-                df_sym = yf.Ticker(sym) \
-                    .history(start=start, end=end, auto_adjust=True) \
-                    .loc[:, ["Open", "High", "Low", "Close", "Volume"]]
+                df_sym = self._fetch_ticker(sym, start, end).copy()
                 if df_sym.empty:
                     raise ValueError("No data returned")
                 df_sym["Ticker"] = sym
-                df_sym.index.name = "Date"
-                price_frames.append(df_sym)
+                return df_sym
             except Exception as e:
                 logger.warning(f"Skipping {sym}: {e}")
+                return None
+
+        if self.max_workers > 1 and len(tickers) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                fetched = list(pool.map(fetch_one, tickers))
+        else:
+            fetched = [fetch_one(sym) for sym in tickers]
+        price_frames = [f for f in fetched if f is not None]
 
         # 2) If none succeeded, generate synthetic flat data
         if not price_frames:
@@ -70,7 +197,10 @@ class DataFetcher:
             [all_days, tickers], names=["Date", "Ticker"])
         df = df.reindex(idx_full)
 
-        # 5) Forward/backfill per ticker
-        df = df.groupby("Ticker").apply(lambda x: x.ffill().bfill()).droplevel(0)
+        # 5) Forward/backfill per ticker; rows grouped by ticker, as the
+        # per-ticker groupby/apply returned them
+        df = df.groupby(level="Ticker").ffill()
+        df = df.groupby(level="Ticker").bfill()
+        df = df.sort_index(level=["Ticker", "Date"])
 
         return df
@@ -0,0 +1,188 @@
+# src/indicators.py
+
+"""
+Vectorized indicator kernels on ``dates × tickers`` arrays.
+
+Every kernel takes a 2D close array (one column per ticker, as held by
+``PricePanel``) and computes the indicator for all tickers at once. Results
+match the per-ticker pandas / ``ta`` computations: a ticker's series is its
+non-NaN rows in date order, so NaN cells (before listing, missing rows of a
+ragged frame) are skipped rather than treated as observations, and come back
+as NaN.
+"""
+
+from functools import wraps
+from typing import Dict, Optional
+import numpy as np
+
+
+def _per_ticker(kernel):
+    """
+    Run ``kernel`` on series that all start at row 0.
+
+    Columns with NaNs are compacted (valid rows moved to the top, in order),
+    the kernel runs on the compacted array, and results are scattered back.
+    Leading array arguments (e.g. high, low, close) are compacted together;
+    a cell is missing when any of them is NaN.
+    """
+    @wraps(kernel)
+    def wrapper(close: np.ndarray, *args, **kwargs) -> np.ndarray:
+        n_arrays = 1
+        while n_arrays <= len(args) and isinstance(args[n_arrays - 1], np.ndarray):
+            n_arrays += 1
+        arrays = [np.asarray(a, dtype=float) for a in (close,) + args[:n_arrays - 1]]
+        args = args[n_arrays - 1:]
+        missing = np.logical_or.reduce([np.isnan(a) for a in arrays])
+        if not missing.any():
+            return kernel(*arrays, *args, **kwargs)
+        order = np.argsort(missing, axis=0, kind="stable")
+        compact = [np.take_along_axis(a, order, axis=0) for a in arrays]
+        res = kernel(*compact, *args, **kwargs)
+        out = np.empty_like(res)
+        np.put_along_axis(out, order, res, axis=0)
+        out[missing] = np.nan
+        return out
+    return wrapper
+
+
+def _nan_rows(n: int, m: int) -> np.ndarray:
+    return np.full((n, m), np.nan)
+
+
+def ema(x: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    ``ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()`` down
+    axis 0, for series whose first row is their first observation.
+    """
+    out = np.empty_like(x, dtype=float)
+    if len(x) == 0:
+        return out
+    s = x[0].astype(float)
+    out[0] = s
+    for t in range(1, len(x)):
+        s *= 1 - alpha
+        s += alpha * x[t]
+        out[t] = s
+    out[:max(min_periods - 1, 0)] = np.nan
+    return out
+
+
+@_per_ticker
+def momentum(close: np.ndarray, periods: int) -> np.ndarray:
+    """``pct_change(periods)`` per ticker."""
+    out = _nan_rows(*close.shape)
+    if periods < len(close):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[periods:] = close[periods:] / close[:-periods] - 1
+    return out
+
+
+@_per_ticker
+def rolling_std(close: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).std()`` (ddof=1) per ticker, computed in two passes."""
+    n = len(close)
+    out = _nan_rows(*close.shape)
+    if window > n or window < 2:
+        return out
+    k = n - window + 1
+    mean = sum(close[i:i + k] for i in range(window)) / window
+    sq = sum((close[i:i + k] - mean) ** 2 for i in range(window))
+    out[window - 1:] = np.sqrt(sq / (window - 1))
+    return out
+
+
+@_per_ticker
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder RSI, as ``ta.momentum.RSIIndicator(close, window).rsi()``."""
+    diff = np.zeros_like(close)
+    diff[1:] = close[1:] - close[:-1]
+    # ta counts the undefined first diff as a zero move
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    ema_up = ema(up, 1 / window, window)
+    ema_dn = ema(down, 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(ema_dn == 0, 100.0, 100 - 100 / (1 + ema_up / ema_dn))
+    out[np.isnan(ema_dn)] = np.nan
+    return out
+
+
+@_per_ticker
+def tsi(close: np.ndarray, window_slow: int = 25, window_fast: int = 13) -> np.ndarray:
+    """True strength index, as ``ta.momentum.TSIIndicator(...).tsi()``."""
+    out = _nan_rows(*close.shape)
+    start = window_slow  # first row where both EMAs have enough history
+    if start >= len(close):
+        return out
+    diff = close[1:] - close[:-1]
+
+    def smooth(x):
+        first = ema(x, 2 / (window_slow + 1), window_slow)[window_slow - 1:]
+        return ema(first, 2 / (window_fast + 1), window_fast)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[start:] = 100 * smooth(diff) / smooth(np.abs(diff))
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray) -> np.ndarray:
+    """Wilder true range; ``high - low`` where there is no previous close."""
+    # ta takes the max over the available terms
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+@_per_ticker
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    window: int = 14,
+    seed: Optional[Dict[str, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Wilder average true range, as ``ta.volatility.AverageTrueRange``, except
+    that rows before the first full window are NaN instead of 0.
+
+    ``seed`` continues series that already had bars: per-column ``count``
+    (bars seen), ``tr_sum`` (true ranges of a first window still filling),
+    ``atr`` and ``prev_close``, as kept by ``atr_table.StreamingATR``.
+    """
+    if seed is not None:
+        return _seeded_atr(high, low, close, window, seed)
+    out = _nan_rows(*close.shape)
+    if window > len(close):
+        return out
+    prev = np.empty_like(close)
+    prev[0] = np.nan
+    prev[1:] = close[:-1]
+    tr = true_range(high, low, prev)
+    x = tr[window - 1:].copy()
+    x[0] = tr[:window].mean(axis=0)
+    out[window - 1:] = ema(x, 1 / window)
+    return out
+
+
+def _seeded_atr(high, low, close, window, seed):
+    n, m = close.shape
+    count = seed['count']
+    prev = np.empty_like(close)
+    prev[0] = np.where(count > 0, seed['prev_close'], np.nan)
+    prev[1:] = close[:-1]
+    tr = true_range(high, low, prev)
+
+    # each column restarts the recursion at ``start``: the row completing its
+    # first window, or -1 when the seed ATR is already warm
+    warm = count >= window
+    start = np.where(warm, -1, window - 1 - count)
+    rows = np.arange(n + 1)[:, None]
+    x = np.take_along_axis(tr, np.clip(start + rows, 0, n - 1), axis=0)
+    x[1:][start + rows[1:] >= n] = np.nan
+    sums = np.cumsum(np.vstack([seed['tr_sum'], tr]), axis=0)  # same order as the stream
+    x[0] = np.where(warm, seed['atr'],
+                    sums[np.clip(start + 1, 0, n), np.arange(m)] / window)
+    y = ema(x, 1 / window)
+
+    back = rows[:-1] - start
+    out = np.take_along_axis(y, np.clip(back, 0, n), axis=0)
+    out[back < 0] = np.nan
+    return out
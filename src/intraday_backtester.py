@@ -1,7 +1,85 @@
 # src/intraday_backtester.py
 
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-from ta.volatility import AverageTrueRange
+
+from .atr_table import ATRTable, StreamingATR
+from .minute_store import MinuteStore
+from .panel import PricePanel
+from .config import INTRADAY_WORKERS
+
+
+class MinuteDays(NamedTuple):
+    """
+    Minute bars partitioned by trading day.
+
+    ``low`` and ``close`` are (minutes × tickers) arrays sorted by time;
+    day ``k`` covers rows ``starts[k]:starts[k + 1]`` (the last day runs to
+    the end).
+    """
+    days: pd.DatetimeIndex
+    starts: np.ndarray
+    tickers: pd.Index
+    low: np.ndarray
+    close: np.ndarray
+
+
+def partition_minutes(minute_data: pd.DataFrame) -> MinuteDays:
+    """Pivot (Datetime, Ticker) minute bars and find each day's row range."""
+    panel = PricePanel.from_frame(
+        minute_data.rename_axis(index={'Datetime': 'Date'}), ['Low', 'Close'])
+    times = panel.dates
+    if times.tz is not None:
+        times = times.tz_localize(None)  # wall-clock day in the feed's zone
+    day_of = times.normalize()
+    starts = np.flatnonzero(np.r_[True, day_of[1:] != day_of[:-1]]) \
+        if len(times) else np.array([], dtype=int)
+    return MinuteDays(pd.DatetimeIndex(day_of[starts]), starts,
+                      panel.tickers, panel['Low'], panel['Close'])
+
+
+def day_summary(minutes: MinuteDays):
+    """
+    Per (day, ticker): first close, last close and lowest low of the day
+    (NaN where the ticker has no bars that day), as three (days × tickers)
+    arrays built with one ``reduceat`` pass each.
+    """
+    n, m = minutes.close.shape
+    shape = (len(minutes.starts), m)
+    if not len(minutes.starts):
+        return (np.full(shape, np.nan),) * 3
+    valid = ~np.isnan(minutes.close)
+    rows = np.arange(n)[:, None]
+    first = np.minimum.reduceat(np.where(valid, rows, n), minutes.starts, axis=0)
+    last = np.maximum.reduceat(np.where(valid, rows, -1), minutes.starts, axis=0)
+    cols = np.arange(m)
+    has = first < n
+    entry = np.where(has, minutes.close[np.where(has, first, 0), cols], np.nan)
+    exit_ = np.where(has, minutes.close[np.where(has, last, 0), cols], np.nan)
+    min_low = np.fmin.reduceat(minutes.low, minutes.starts, axis=0)
+    return entry, exit_, min_low
+
+
+def iter_days(partitions: Iterable[pd.DataFrame]) -> Iterator[Tuple[pd.Timestamp, pd.DataFrame]]:
+    """
+    Split a stream of minute partitions (one or more days each, in
+    ascending order) into ``(day, bars)`` pairs without concatenating them.
+    """
+    last = None
+    for part in partitions:
+        if part is None or part.empty:
+            continue
+        times = part.index.get_level_values('Datetime')
+        if times.tz is not None:
+            times = times.tz_localize(None)
+        for day, bars in part.groupby(times.normalize()):
+            day = pd.Timestamp(day)
+            if last is not None and day <= last:
+                raise ValueError(f"Minute partitions out of order: {day:%Y-%m-%d} after {last:%Y-%m-%d}")
+            last = day
+            yield day, bars
 
 
 class IntradayBacktester:
@@ -11,6 +89,11 @@ class IntradayBacktester:
       • ATR‐based stop‐loss intraday
       • End‐of‐day exit
       • Slippage & commission
+
+    With minute bars in a ``MinuteStore`` and ``n_jobs > 1``, dates are
+    fanned out to a process pool; each worker reads its own day's file.
+    Stops read a shared ``ATRTable`` when one is given (extended with the
+    daily bars of each run), otherwise a table built per call.
     """
 
     def __init__(
@@ -18,82 +101,180 @@ class IntradayBacktester:
         slippage: float,
         commission: float,
         atr_window: int = 14,
-        atr_mult: float = 3.0
+        atr_mult: float = 3.0,
+        n_jobs: int = INTRADAY_WORKERS,
+        atr_table: Optional[ATRTable] = None
     ):
+        if atr_table is not None and atr_table.window != atr_window:
+            raise ValueError(
+                f"ATRTable window {atr_table.window} != atr_window {atr_window}")
         self.slippage = slippage
         self.commission = commission
         self.atr_window = atr_window
         self.atr_mult = atr_mult
+        self.n_jobs = n_jobs
+        self.atr_table = atr_table
+
+    def causal_atr(
+        self,
+        daily_price: pd.DataFrame,
+        dates: pd.DatetimeIndex
+    ) -> pd.DataFrame:
+        """
+        (dates × tickers) ATR as known before each date opens: the ticker's
+        ATR on its last daily bar strictly before the date. NaN until a full
+        ``atr_window`` of history exists.
+        """
+        table = self.atr_table if self.atr_table is not None \
+            else ATRTable(self.atr_window)
+        return table.extend(daily_price).table(dates)
+
+    def settle(
+        self,
+        weights: np.ndarray,
+        entry: np.ndarray,
+        exit_: np.ndarray,
+        min_low: np.ndarray,
+        atr_prior: np.ndarray
+    ) -> np.ndarray:
+        """
+        Net return per day for aligned (days × tickers) arrays. A position
+        is stopped out at ``entry - atr_mult * ATR`` if any minute's low
+        touches it, otherwise it exits at the last close; entry and exit
+        each cost ``|weight| * (slippage + commission)``. Tickers without
+        bars that day are not traded.
+        """
+        w = np.where(np.isnan(entry), 0.0, np.nan_to_num(weights))
+        stop = entry - self.atr_mult * atr_prior
+        with np.errstate(invalid='ignore'):
+            stopped = min_low <= stop
+            out_price = np.where(stopped, stop, exit_)
+            r = np.where(w != 0, (out_price - entry) / entry, 0.0)
+        cost = 2 * np.abs(w).sum(axis=1) * (self.slippage + self.commission)
+        return (w * r).sum(axis=1) - cost
+
+    def run_day(
+        self,
+        minute_data: Optional[pd.DataFrame],
+        tickers: pd.Index,
+        weights: np.ndarray,
+        atr_prior: np.ndarray
+    ) -> float:
+        """Net return of one day's bars for weights / ATRs aligned to ``tickers``."""
+        if minute_data is None or minute_data.empty:
+            return 0.0
+        minutes = partition_minutes(minute_data)
+        cols = minutes.tickers.get_indexer(tickers)
+
+        def aligned(a):
+            return np.where(cols >= 0, a[:1, np.maximum(cols, 0)], np.nan)
+
+        entry, exit_, min_low = map(aligned, day_summary(minutes))
+        return float(self.settle(weights[None], entry, exit_, min_low,
+                                 atr_prior[None])[0])
 
     def run_intraday(
         self,
         weights: pd.Series,
         daily_price: pd.DataFrame,
-        minute_data: pd.DataFrame
+        minute_data: Union[pd.DataFrame, MinuteStore]
     ) -> pd.Series:
+        """
+        Intraday net return for each date in ``weights``; stops use the
+        causal ATR (daily bars before the date only). Dates without minute
+        bars or positions return 0. ``minute_data`` is a (Datetime, Ticker)
+        frame or a ``MinuteStore`` read one day at a time.
+        """
         w_df = weights.unstack(level='Ticker')
-        dates = w_df.index
-        results = {}
+        dates = pd.DatetimeIndex(w_df.index)
+        if isinstance(minute_data, MinuteStore):
+            return self._run_stored(w_df, daily_price, minute_data)
+        if minute_data.empty:
+            return pd.Series(0.0, index=dates)
 
-        for date in dates:
-            w = w_df.loc[date].fillna(0)
-            if w.abs().sum() == 0:
-                results[date] = 0.0
-                continue
+        minutes = partition_minutes(minute_data)
+        entry, exit_, min_low = day_summary(minutes)
+        tickers = minutes.tickers
+        day_pos = minutes.days.get_indexer(dates)
+        on_day = day_pos >= 0
+        rows = day_pos[on_day]
+
+        w = w_df.reindex(columns=tickers).to_numpy(dtype=float)[on_day]
+        atr_prior = self.causal_atr(daily_price, dates[on_day]) \
+            .reindex(columns=tickers).to_numpy()
+
+        out = np.zeros(len(dates))
+        out[on_day] = self.settle(w, entry[rows], exit_[rows], min_low[rows], atr_prior)
+        return pd.Series(out, index=dates)
+
+    def _run_stored(
+        self,
+        w_df: pd.DataFrame,
+        daily_price: pd.DataFrame,
+        store: MinuteStore
+    ) -> pd.Series:
+        dates = pd.DatetimeIndex(w_df.index)
+        tickers = w_df.columns
+        w = np.nan_to_num(w_df.to_numpy(dtype=float))
+        atr_prior = self.causal_atr(daily_price, dates).reindex(columns=tickers).to_numpy()
+
+        # only dates with positions and stored bars need a worker
+        todo = np.flatnonzero(w.any(axis=1) & dates.isin(store.dates()))
+        # workers get the scalars run_day needs, not self and its ATR history
+        params = (self.slippage, self.commission, self.atr_mult)
+        args = [(params, store.root, dates[i], tickers, w[i], atr_prior[i]) for i in todo]
+        if self.n_jobs > 1 and len(args) > 1:
+            chunk = max(1, len(args) // (4 * self.n_jobs))
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                results = list(pool.map(_stored_day, *zip(*args), chunksize=chunk))
+        else:
+            results = [_stored_day(*a) for a in args]
 
-            # minute bars for this date
-            df_min = minute_data[
-                minute_data.index.get_level_values(
-                    'Datetime').normalize() == date
-            ]
-            if df_min.empty:
-                results[date] = 0.0
+        out = np.zeros(len(dates))
+        out[todo] = results
+        return pd.Series(out, index=dates)
+
+    def run_stream(
+        self,
+        weights: pd.Series,
+        daily_price: pd.DataFrame,
+        partitions: Iterable[pd.DataFrame]
+    ) -> pd.Series:
+        """
+        Out-of-core ``run_intraday``: consume minute partitions (e.g.
+        ``MinuteStore.iter_days()``) one day at a time, in ascending order.
+        Only the current day's bars and a ``StreamingATR`` advanced through
+        the daily bars before that day are held, so memory does not grow
+        with the length of the backtest.
+        """
+        w_df = weights.unstack(level='Ticker')
+        dates = pd.DatetimeIndex(w_df.index)
+        tickers = w_df.columns
+        atr_state = StreamingATR(self.atr_window)
+        daily = iter(daily_price.groupby(level='Date', sort=True))
+        pending = next(daily, None)
+        out = pd.Series(0.0, index=dates)
+        for day, bars in iter_days(partitions):
+            while pending is not None and pending[0] < day:
+                atr_state.push(*pending)
+                pending = next(daily, None)
+            if day not in w_df.index:
                 continue
+            w = np.nan_to_num(w_df.loc[day].to_numpy(dtype=float))
+            if w.any():
+                out[day] = self.run_day(bars, tickers, w, atr_state.current(tickers))
+        return out
+
 
-            # entry prices
-            first = df_min.groupby('Ticker').first()['Close']
-            entry_price = first
-
-            # compute ATR‐based stops
-            stops = {}
-            for ticker in entry_price.index:
-                df_hist = daily_price.xs(ticker, level='Ticker').reset_index()
-                atr = AverageTrueRange(
-                    high=df_hist['High'],
-                    low=df_hist['Low'],
-                    close=df_hist['Close'],
-                    window=self.atr_window
-                ).average_true_range().iloc[-1]
-                stops[ticker] = entry_price[ticker] - self.atr_mult * atr
-
-            pnl = 0.0
-            cost = w.abs().sum() * (self.slippage + self.commission)
-            remaining = w.copy()
-
-            # intraday stop checks
-            for dt, grp in df_min.groupby(level='Datetime', sort=True):
-                lows = grp['Low']
-                hit = lows <= pd.Series(stops)
-                for ticker_sym in hit.index[hit]:
-                    if remaining[ticker_sym] == 0:
-                        continue
-                    r = (stops[ticker_sym] - entry_price[ticker_sym]
-                         ) / entry_price[ticker_sym]
-                    pnl += remaining[ticker_sym] * r
-                    cost += abs(remaining[ticker_sym]) * \
-                        (self.slippage + self.commission)
-                    remaining[ticker_sym] = 0.0
-
-            # EOD exit
-            exit_price = df_min.groupby('Ticker').last()['Close']
-            for ticker_sym, wgt in remaining.items():
-                if wgt == 0:
-                    continue
-                r = (exit_price[ticker_sym] -
-                     entry_price[ticker_sym]) / entry_price[ticker_sym]
-                pnl += wgt * r
-                cost += abs(wgt) * (self.slippage + self.commission)
-
-            results[date] = pnl - cost
-
-        return pd.Series(results)
+def _stored_day(
+    params: Tuple[float, float, float],
+    root: str,
+    date: pd.Timestamp,
+    tickers: pd.Index,
+    weights: np.ndarray,
+    atr_prior: np.ndarray
+) -> float:
+    """Pool worker: load one day from the store and settle it."""
+    slippage, commission, atr_mult = params
+    bt = IntradayBacktester(slippage, commission, atr_mult=atr_mult, n_jobs=1)
+    return bt.run_day(MinuteStore(root).read_day(date), tickers, weights, atr_prior)
@@ -3,22 +3,29 @@
 import argparse
 import datetime as dt
 import logging
+import os
+from typing import Optional
 import pandas as pd
 
 from .config import (
     TICKERS,
     SLIPPAGE,
     COMMISSION,
+    DAILY_EVAL_BARS,
+    SIGNAL_STORE_DIR,
+    FEATURE_STATE_PATH,
+    PERF_STATE_PATH,
+    ATR_TABLE_PATH,
     ALPACA_BASE_URL,
     ALPACA_KEY,
     ALPACA_SECRET,
 )
 from .fetcher import DataFetcher
 from .cleaner import DataCleaner
-from .features import FeatureEngineer
+from .features import FeatureEngineer, StreamingFeatures
 from .strategy import StrategyEngine
-from .backtester import Backtester, PerformanceReport
-from .execution import ExecutionEngine
+from .signal_store import SignalStore
+from .backtester import Backtester, PerformanceReport, PerformanceState
 from .reporting import send_daily_report
 from .metrics import MetricsPusher
 
@@ -30,26 +37,114 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def update_signal_history(
+    df_clean: pd.DataFrame,
+    strat: StrategyEngine,
+    store: Optional[SignalStore] = None,
+    state_path: str = FEATURE_STATE_PATH,
+    dry_run: bool = False
+) -> pd.Series:
+    """
+    Compute signals only for dates after the persisted feature state, append
+    them to the signal store and return the stored history for ``df_clean``'s
+    date range. Without a usable state (first run, changed parameters, a
+    gap older than ``df_clean``, or a history re-adjusted since the state
+    was saved) the state is rebuilt from ``df_clean``; an empty
+    ``state_path`` never keeps one. A ``dry_run`` returns the new signals
+    alongside the stored ones but writes nothing.
+    """
+    store = store or SignalStore()
+    dates = df_clean.index.get_level_values('Date')
+
+    streaming = None
+    if state_path and os.path.exists(state_path):
+        try:
+            streaming = StreamingFeatures.load(state_path)
+        except ValueError as e:
+            logger.warning(f"Discarding feature state: {e}")
+    if streaming is not None and (
+            streaming.last_date is None or streaming.last_date < dates.min()):
+        logger.warning("Feature state is older than the fetched history; rebuilding")
+        streaming = None
+    if streaming is not None and not streaming.continues(df_clean):
+        logger.warning("Fetched history was re-adjusted since the feature state "
+                       "was saved; rebuilding")
+        streaming = None
+    if streaming is None:
+        streaming = StreamingFeatures()
+
+    prev_last = streaming.last_date
+    new_feats = streaming.update(df_clean)
+    signals = None
+    if not new_feats.empty:
+        # each new date gets the signal (and DRL blend) its own daily run would
+        signals = strat.generate_signals(df_clean, new_feats, drl_history=True)
+        if dry_run:
+            logger.info("Dry run: signals for "
+                        f"{signals.index.get_level_values('Date').nunique()} "
+                        "new date(s) not stored")
+        else:
+            written = store.append(signals)
+            logger.info(f"Appended signals for {len(written)} date(s)")
+    if streaming.last_date != prev_last and state_path and not dry_run:
+        streaming.save(state_path)
+
+    history = store.read(start=dates.min(), end=dates.max())
+    if dry_run and signals is not None:
+        new = signals.astype(float).rename(history.name)
+        history = pd.concat([history, new[~new.index.isin(history.index)]])
+    return history
+
+
+def update_performance(
+    daily_ret: pd.Series,
+    path: str = PERF_STATE_PATH,
+    window: int = DAILY_EVAL_BARS,
+    dry_run: bool = False
+) -> PerformanceState:
+    """
+    Fold the not-yet-seen daily returns into the persisted performance
+    state (saved unless ``dry_run`` or ``path`` is empty).
+    """
+    state = PerformanceState.load(path, window).update(daily_ret)
+    if path and not dry_run:
+        state.save(path)
+    logger.info(
+        f"Lifetime Sharpe: {state.lifetime.sharpe:.2f}, "
+        f"MaxDD: {state.lifetime.max_drawdown:.2%} ({state.lifetime.n} days)")
+    return state
+
+
 def run_daily_job(dry_run: bool = False):
     today = dt.date.today()
-    start = today - dt.timedelta(days=365 * 2)
+    strat = StrategyEngine()
+    fe = FeatureEngineer()
+    columns = strat.required_features
+
+    # fetch only the history the requested features need, plus the
+    # evaluation window for the EOD backtest
+    fetcher = DataFetcher()
+    bars = fe.lookback(columns) + DAILY_EVAL_BARS
+    start = fetcher.start_for_bars(today.isoformat(), bars)
 
-    logger.info(f"Starting daily job for {today} (dry_run={dry_run})")
+    logger.info(f"Starting daily job for {today} (dry_run={dry_run}, "
+                f"{bars} bars from {start})")
 
     # 1) Fetch & clean
-    df_raw = DataFetcher().fetch_daily(TICKERS, start.isoformat(), today.isoformat())
+    df_raw = fetcher.fetch_daily(TICKERS, start, today.isoformat())
     df_clean = DataCleaner().clean(df_raw)
 
-    # 2) Features & signals
-    feats = FeatureEngineer().build_features(df_clean)
-    strat = StrategyEngine()
-    weights = strat.generate_signals(df_clean, feats)
+    # 2) Features & signals: only new dates are computed; history comes
+    # from the signal store
+    weights = update_signal_history(
+        df_clean, strat, SignalStore(SIGNAL_STORE_DIR), FEATURE_STATE_PATH, dry_run)
 
     # Determine if we can connect to the broker
     can_broker = (
         not dry_run and ALPACA_BASE_URL and ALPACA_KEY and ALPACA_SECRET
     )
 
+    perf_state = None
     if not can_broker:
         # Skip minute-level and execution if dry-run or no valid broker settings
         logger.info(
@@ -60,7 +155,8 @@ def run_daily_job(dry_run: bool = False):
         pos = weights.groupby("Ticker").shift(1).fillna(0)
         pnl = pos * ret
         daily_ret = pnl.groupby("Date").mean()
-        perf = PerformanceReport(daily_ret)
+        perf_state = update_performance(daily_ret, PERF_STATE_PATH, dry_run=dry_run)
+        perf = perf_state.rolling
 
         exec_df = pd.DataFrame(columns=["ticker", "qty", "action", "avgFillPrice"])
     else:
@@ -68,7 +164,10 @@ def run_daily_job(dry_run: bool = False):
         try:
             from .minute_fetcher import MinuteDataFetcher
             from .intraday_backtester import IntradayBacktester
+            from .minute_store import MinuteStore
+            from .atr_table import ATRTable
             from .broker import BrokerInterface
+            from .execution import ExecutionEngine
         except ImportError as e:
             logger.error("Missing Alpaca modules: %s", e)
             raise
@@ -77,8 +176,15 @@ def run_daily_job(dry_run: bool = False):
         try:
             mdf = MinuteDataFetcher(ALPACA_BASE_URL, ALPACA_KEY, ALPACA_SECRET)
             minute_df = mdf.fetch_daily_minute(TICKERS, today)
-            intrabt = IntradayBacktester(SLIPPAGE, COMMISSION)
-            intraday_rets = intrabt.run_intraday(weights, df_clean, minute_df)
+            minute_store = MinuteStore()
+            if not minute_df.empty:
+                minute_store.write(minute_df)
+            # every stored day is replayed, one file per date; stops read
+            # the cached ATR table, extended with today's bar
+            atr_table = ATRTable.load(ATR_TABLE_PATH)
+            intrabt = IntradayBacktester(SLIPPAGE, COMMISSION, atr_table=atr_table)
+            intraday_rets = intrabt.run_intraday(weights, df_clean, minute_store)
+            atr_table.save(ATR_TABLE_PATH)
             perf = PerformanceReport(intraday_rets)
             logger.info(
                 f"Intraday Sharpe: {perf.sharpe:.2f}, MaxDD: {perf.max_drawdown:.2%}")
@@ -90,7 +196,8 @@ def run_daily_job(dry_run: bool = False):
             pos = weights.groupby("Ticker").shift(1).fillna(0)
             pnl = pos * ret
             daily_ret = pnl.groupby("Date").mean()
-            perf = PerformanceReport(daily_ret)
+            perf_state = update_performance(daily_ret, PERF_STATE_PATH)
+            perf = perf_state.rolling
             minute_df = None
 
         # Live execution if intraday backtest succeeded
@@ -111,6 +218,9 @@ def run_daily_job(dry_run: bool = False):
         "max_drawdown": perf.max_drawdown,
         "profit_factor": perf.profit_factor,
     }
+    if perf_state is not None:
+        metrics["lifetime_sharpe"] = perf_state.lifetime.sharpe
+        metrics["lifetime_max_drawdown"] = perf_state.lifetime.max_drawdown
     send_daily_report(metrics, trades_df=exec_df)
 
     try:
@@ -1,7 +1,6 @@
 # src/metrics.py
 
 import logging
-from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
 from .config import METRICS_PUSHGATEWAY
 
 logger = logging.getLogger("trading")
@@ -10,10 +9,17 @@ logger = logging.getLogger("trading")
 class MetricsPusher:
     """
     Push daily run metrics to a Prometheus Pushgateway if configured.
+    ``prometheus_client`` is only imported when a gateway is set.
     """
 
     def __init__(self, gateway_url: str = METRICS_PUSHGATEWAY):
         self.gateway = gateway_url
+        self.registry = None
+        self.gauges = {}
+        if not self.gateway:
+            return
+
+        from prometheus_client import CollectorRegistry, Gauge
         self.registry = CollectorRegistry()
         self.gauges = {
             'daily_sharpe':        Gauge('daily_sharpe',        'Daily Sharpe Ratio',     registry=self.registry),
@@ -35,6 +41,7 @@ class MetricsPusher:
                 gauge.set(metrics[key])
 
         try:
+            from prometheus_client import push_to_gateway
             push_to_gateway(self.gateway, job='daily_trader', registry=self.registry)
             logger.info("Metrics pushed to Pushgateway")
         except Exception as e:
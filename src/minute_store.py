@@ -0,0 +1,69 @@
+# src/minute_store.py
+
+import os
+from typing import Iterator, Optional
+import pandas as pd
+import logging
+
+from .config import MINUTE_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class MinuteStore:
+    """Minute bars partitioned by trading day.
+
+    One Parquet file per day (``{root}/{YYYY-MM-DD}.parquet``) holding that
+    day's (Datetime, Ticker) bars, so a backtest of one date reads one small
+    file instead of the whole history. Days are keyed by the wall-clock
+    date of their timestamps, as ``partition_minutes`` groups them.
+    """
+
+    def __init__(self, root: str = MINUTE_STORE_DIR):
+        self.root = root
+
+    def path(self, date) -> str:
+        return os.path.join(self.root, f"{pd.Timestamp(date):%Y-%m-%d}.parquet")
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Days with stored bars, ascending."""
+        if not os.path.isdir(self.root):
+            return pd.DatetimeIndex([], name='Date')
+        names = [f[:-len('.parquet')] for f in os.listdir(self.root)
+                 if f.endswith('.parquet')]
+        return pd.DatetimeIndex(sorted(pd.to_datetime(names)), name='Date')
+
+    def write(self, minute_data: pd.DataFrame) -> pd.DatetimeIndex:
+        """
+        Store (Datetime, Ticker) bars, one file per day. A day already on
+        disk is replaced by the new bars for that day. Returns the days written.
+        """
+        times = minute_data.index.get_level_values('Datetime')
+        if times.tz is not None:
+            times = times.tz_localize(None)
+        written = []
+        os.makedirs(self.root, exist_ok=True)
+        for day, bars in minute_data.groupby(times.normalize()):
+            tmp = f"{self.path(day)}.{os.getpid()}.tmp"
+            bars.sort_index().to_parquet(tmp)
+            os.replace(tmp, self.path(day))
+            written.append(pd.Timestamp(day))
+        logger.info(f"MinuteStore: wrote {len(written)} day(s) to {self.root}")
+        return pd.DatetimeIndex(written, name='Date')
+
+    def iter_days(self, start=None, end=None) -> Iterator[pd.DataFrame]:
+        """Stored days with ``start <= day <= end``, loaded one at a time."""
+        dates = self.dates()
+        if start is not None:
+            dates = dates[dates >= pd.Timestamp(start)]
+        if end is not None:
+            dates = dates[dates <= pd.Timestamp(end)]
+        for date in dates:
+            yield self.read_day(date)
+
+    def read_day(self, date) -> Optional[pd.DataFrame]:
+        """One day's bars, or None when the day is not stored."""
+        path = self.path(date)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
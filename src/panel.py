@@ -0,0 +1,163 @@
+# src/panel.py
+
+from typing import Dict, Iterable, Optional, Union
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    Dense ``dates × tickers`` view of a long (Date, Ticker) frame.
+
+    Each field (Open, Close, a feature, a signal...) is a C-contiguous 2D
+    NumPy array with one row per date and one column per ticker, so per-ticker
+    groupby operations become plain axis-0 array operations.
+    ``dates`` and ``tickers`` are pandas indexes and double as hash maps from
+    label to row/column position.
+    """
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        tickers: pd.Index,
+        fields: Dict[str, np.ndarray]
+    ):
+        self.dates = pd.DatetimeIndex(dates, name="Date")
+        self.tickers = pd.Index(tickers, name="Ticker")
+        shape = (len(self.dates), len(self.tickers))
+        for name, arr in fields.items():
+            if arr.shape != shape:
+                raise ValueError(
+                    f"PricePanel: field {name!r} has shape {arr.shape}, expected {shape}")
+        self.fields = dict(fields)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: Union[pd.DataFrame, pd.Series],
+        columns: Optional[Iterable[str]] = None
+    ) -> "PricePanel":
+        """
+        Build a panel from a (Date, Ticker) MultiIndex frame.
+        Missing (Date, Ticker) rows become NaN. When the frame already covers
+        the full sorted grid, the field arrays are views of its column data.
+        """
+        if isinstance(df, pd.Series):
+            df = df.to_frame(df.name if df.name is not None else "value")
+        columns = list(df.columns if columns is None else columns)
+        dates = df.index.unique("Date").sort_values()
+        tickers = df.index.unique("Ticker").sort_values()
+        panel = cls(dates, tickers, {})
+        shape = panel.shape
+
+        rows, cols = panel.locate(df.index)
+        flat = rows * shape[1] + cols
+        dense = len(flat) == shape[0] * shape[1] and \
+            np.array_equal(flat, np.arange(len(flat)))
+        for c in columns:
+            values = df[c].to_numpy()
+            if dense:
+                panel.fields[c] = np.ascontiguousarray(values).reshape(shape)
+            else:
+                dtype = np.result_type(values.dtype, np.float64) \
+                    if values.dtype.kind in "biuf" else object
+                arr = np.full(shape, np.nan, dtype=dtype)
+                arr[rows, cols] = values
+                panel.fields[c] = arr
+        return panel
+
+    def to_frame(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        dropna: bool = False
+    ) -> pd.DataFrame:
+        """Long (Date, Ticker) frame whose columns view the panel arrays."""
+        columns = list(self.fields if columns is None else columns)
+        idx = pd.MultiIndex.from_product(
+            [self.dates, self.tickers], names=["Date", "Ticker"])
+        df = pd.DataFrame(
+            {c: self.fields[c].reshape(-1) for c in columns}, index=idx, copy=False)
+        if dropna:
+            df = df.dropna(how="all")
+        return df
+
+    def to_series(self, field: str, dropna: bool = False) -> pd.Series:
+        """Long (Date, Ticker) Series for one field."""
+        return self.to_frame([field], dropna=dropna)[field]
+
+    @property
+    def columns(self):
+        return list(self.fields)
+
+    @property
+    def shape(self):
+        return len(self.dates), len(self.tickers)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def __setitem__(self, field: str, arr: np.ndarray):
+        arr = np.ascontiguousarray(arr)
+        if arr.shape != self.shape:
+            raise ValueError(
+                f"PricePanel: field {field!r} has shape {arr.shape}, expected {self.shape}")
+        self.fields[field] = arr
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.fields
+
+    def locate(self, index: pd.MultiIndex):
+        """Row and column positions of each (Date, Ticker) in ``index``."""
+        d, t = index.names.index("Date"), index.names.index("Ticker")
+        rows = self.dates.get_indexer(index.levels[d])[index.codes[d]]
+        cols = self.tickers.get_indexer(index.levels[t])[index.codes[t]]
+        return rows, cols
+
+    def flat_positions(self, index: pd.MultiIndex) -> np.ndarray:
+        """Positions of each (Date, Ticker) in a raveled field array."""
+        rows, cols = self.locate(index)
+        return rows * len(self.tickers) + cols
+
+    def date_loc(self, date) -> int:
+        """Row position of a date."""
+        return self.dates.get_loc(pd.Timestamp(date))
+
+    def ticker_loc(self, ticker: str) -> int:
+        """Column position of a ticker."""
+        return self.tickers.get_loc(ticker)
+
+    def select(self, columns: Iterable[str]) -> "PricePanel":
+        """Panel restricted to a subset of fields (arrays are shared)."""
+        return PricePanel(self.dates, self.tickers,
+                          {c: self.fields[c] for c in columns})
+
+
+def ffill(arr: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down the date axis (axis 0), per ticker column."""
+    n, m = arr.shape
+    # flat position of each cell; NaN cells point at their column's first row
+    pos = np.where(np.isnan(arr), np.arange(m), np.arange(n * m).reshape(n, m))
+    np.maximum.accumulate(pos, axis=0, out=pos)
+    return arr.ravel().take(pos)
+
+
+def bfill(arr: np.ndarray) -> np.ndarray:
+    """Back-fill NaNs up the date axis (axis 0), per ticker column."""
+    return ffill(arr[::-1])[::-1]
+
+
+def as_frame(data: Union[pd.DataFrame, PricePanel]) -> pd.DataFrame:
+    """Return ``data`` as a long (Date, Ticker) frame."""
+    if isinstance(data, PricePanel):
+        return data.to_frame()
+    return data
+
+
+def as_panel(
+    data: Union[pd.DataFrame, pd.Series, PricePanel],
+    columns: Optional[Iterable[str]] = None
+) -> PricePanel:
+    """Return ``data`` as a ``PricePanel``."""
+    if isinstance(data, PricePanel):
+        return data if columns is None else data.select(columns)
+    return PricePanel.from_frame(data, columns)
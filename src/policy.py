@@ -0,0 +1,154 @@
+# src/policy.py
+
+"""
+Numpy-only inference for the trained SAC actor.
+
+``export_sac_actor`` copies the actor MLP weights out of a saved
+stable-baselines3 SAC model into a small ``.npz``; ``NumpyPolicy`` replays
+the deterministic forward pass (MLP -> mu -> tanh -> action bounds) with
+plain matrix multiplies, so scoring needs neither torch nor SB3 and many
+observations are scored in one batch.
+
+    python -m src.policy models/sac_trader.zip   # writes models/sac_trader.npz
+"""
+
+import argparse
+import logging
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ACTIVATIONS = {
+    'ReLU': lambda x: np.maximum(x, 0),
+    'Tanh': np.tanh,
+}
+
+
+class NumpyPolicy:
+    """Deterministic SAC actor: ``weights``/``biases`` per layer, last is mu."""
+
+    def __init__(
+        self,
+        weights: List[np.ndarray],
+        biases: List[np.ndarray],
+        activation: str,
+        low: np.ndarray,
+        high: np.ndarray
+    ):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation}")
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation = activation
+        self.low = np.asarray(low, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+
+    @property
+    def obs_dim(self) -> int:
+        return self.weights[0].shape[1]
+
+    def act(self, obs: np.ndarray) -> np.ndarray:
+        """Actions for a batch of observations, shape (batch, obs_dim)."""
+        x = np.asarray(obs, dtype=np.float32).reshape(-1, self.obs_dim)
+        act_fn = ACTIVATIONS[self.activation]
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = act_fn(x @ w.T + b)
+        squashed = np.tanh(x @ self.weights[-1].T + self.biases[-1])
+        # SB3's unscale_action for a squashed policy
+        return self.low + (0.5 * (squashed + 1.0) * (self.high - self.low))
+
+    def predict(self, obs: np.ndarray, deterministic: bool = True) -> Tuple[np.ndarray, None]:
+        """SB3-compatible single/batched prediction (always deterministic)."""
+        obs = np.asarray(obs)
+        actions = self.act(obs)
+        return (actions[0] if obs.ndim == 1 else actions), None
+
+    def save(self, path: str):
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"], arrays[f"b{i}"] = w, b
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, n_layers=len(self.weights), activation=self.activation,
+                 low=self.low, high=self.high, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyPolicy":
+        data = np.load(path)
+        n = int(data['n_layers'])
+        return cls(
+            [data[f"w{i}"] for i in range(n)],
+            [data[f"b{i}"] for i in range(n)],
+            str(data['activation']),
+            data['low'],
+            data['high'],
+        )
+
+
+def from_sac(model) -> NumpyPolicy:
+    """Extract the deterministic actor from a loaded SB3 ``SAC`` model."""
+    import torch.nn as nn
+
+    actor = model.policy.actor
+    if getattr(actor, 'use_sde', False):
+        raise ValueError("gSDE actors are not supported")
+    if type(actor.features_extractor).__name__ != 'FlattenExtractor':
+        raise ValueError("Only flat observation spaces are supported")
+
+    layers = [m for m in actor.latent_pi if isinstance(m, nn.Linear)]
+    acts = {type(m).__name__ for m in actor.latent_pi if not isinstance(m, nn.Linear)}
+    if len(acts) > 1:
+        raise ValueError(f"Mixed activations are not supported: {acts}")
+    layers.append(actor.mu)
+    space = model.policy.action_space
+    return NumpyPolicy(
+        [m.weight.detach().cpu().numpy() for m in layers],
+        [m.bias.detach().cpu().numpy() for m in layers],
+        acts.pop() if acts else 'ReLU',
+        space.low,
+        space.high,
+    )
+
+
+def export_sac_actor(model_path: str, out_path: Optional[str] = None) -> str:
+    """Convert a saved SAC ``.zip`` to a ``NumpyPolicy`` ``.npz``; returns its path."""
+    from stable_baselines3 import SAC
+
+    out_path = out_path or policy_path(model_path)
+    from_sac(SAC.load(model_path, device='cpu')).save(out_path)
+    logger.info(f"Exported SAC actor {model_path} -> {out_path}")
+    return out_path
+
+
+def policy_path(model_path: str) -> str:
+    """The ``.npz`` export that sits next to a model file."""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def load_policy(model_path: str):
+    """
+    Policy for ``model_path``: its numpy export when present, otherwise the
+    SB3 model itself (slow path, loads torch); None if neither loads.
+    """
+    npz = policy_path(model_path)
+    if os.path.exists(npz):
+        return NumpyPolicy.load(npz)
+    if not os.path.exists(model_path):
+        return None
+    try:
+        from stable_baselines3 import SAC
+        logger.warning(f"No numpy export for {model_path}; loading SAC "
+                       f"(run `python -m src.policy {model_path}`)")
+        return SAC.load(model_path, device='cpu')
+    except Exception as e:
+        logger.warning(f"Could not load DRL model {model_path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a SAC actor to numpy")
+    parser.add_argument("model_path")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+    print(export_sac_actor(args.model_path, args.out))
@@ -0,0 +1,104 @@
+# src/price_cache.py
+
+import json
+import os
+from typing import List, Optional, Tuple
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class PriceCache:
+    """On-disk OHLCV cache, one Parquet file per ticker.
+
+    Each ticker also keeps a small JSON sidecar recording the date range
+    ``[start, end)`` that has already been requested from the data source, so
+    ranges that legitimately hold no bars (holidays, pre-IPO) are not
+    re-downloaded on every run.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _data_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.parquet")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker}.json")
+
+    def coverage(self, ticker: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Return the cached ``[start, end)`` range for a ticker, if any."""
+        path = self._meta_path(ticker)
+        if not os.path.exists(path):
+            return None
+        with open(path) as fh:
+            meta = json.load(fh)
+        return pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+
+    def load(self, ticker: str) -> pd.DataFrame:
+        """Return every cached bar for a ticker (empty frame if none)."""
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame(
+                columns=PRICE_COLS, index=pd.DatetimeIndex([], name="Date"))
+        return pd.read_parquet(path)
+
+    def read(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Return cached bars with ``start <= Date < end``."""
+        df = self.load(ticker)
+        mask = (df.index >= pd.Timestamp(start)) & (df.index < pd.Timestamp(end))
+        return df.loc[mask]
+
+    def missing_ranges(self, ticker: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """
+        Date ranges of ``[start, end)`` not yet covered by the cache.
+        The forward range starts on the last cached bar so the caller can
+        detect re-adjusted history (see ``DataFetcher``).
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        cov = self.coverage(ticker)
+        if cov is None:
+            return [(start.date().isoformat(), end.date().isoformat())]
+
+        cov_start, cov_end = cov
+        ranges = []
+        if start < cov_start:
+            ranges.append((start.date().isoformat(), cov_start.date().isoformat()))
+        if end > cov_end:
+            cached = self.load(ticker)
+            lo = cached.index.max() if not cached.empty else cov_end
+            ranges.append((min(lo, cov_end).date().isoformat(), end.date().isoformat()))
+        return ranges
+
+    def update(self, ticker: str, df_new: pd.DataFrame, start: str, end: str):
+        """Merge freshly downloaded bars for ``[start, end)`` into the cache."""
+        cached = self.load(ticker)
+        frames = [f for f in (cached, df_new[PRICE_COLS]) if not f.empty]
+        merged = pd.concat(frames) if frames else cached
+        # newer downloads win on overlapping dates
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        merged.index.name = "Date"
+        os.makedirs(self.root, exist_ok=True)
+        merged.to_parquet(self._data_path(ticker))
+
+        cov = self.coverage(ticker)
+        lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+        # only treat the range as final once the data source has settled;
+        # otherwise stop at the last bar so today's close is picked up later
+        settled = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+        if hi > settled and not merged.empty:
+            hi = min(hi, merged.index.max() + pd.Timedelta(days=1))
+        if cov is not None:
+            lo, hi = min(lo, cov[0]), max(hi, cov[1])
+        with open(self._meta_path(ticker), "w") as fh:
+            json.dump({"start": lo.date().isoformat(),
+                       "end": hi.date().isoformat()}, fh)
+
+    def invalidate(self, ticker: str):
+        """Drop all cached data for a ticker."""
+        for path in (self._data_path(ticker), self._meta_path(ticker)):
+            if os.path.exists(path):
+                os.remove(path)
@@ -2,7 +2,6 @@
 
 import logging
 import json
-import requests
 from typing import Dict, Any
 
 from .config import SLACK_WEBHOOK_URL
@@ -29,6 +28,7 @@ def send_slack(message: str, webhook_url: str = SLACK_WEBHOOK_URL) -> None:
         return
 
     try:
+        import requests
         resp = requests.post(webhook_url, json={"text": message}, timeout=5)
         if resp.status_code != 200:
             logger.error(
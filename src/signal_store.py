@@ -0,0 +1,95 @@
+# src/signal_store.py
+
+import os
+from typing import Dict, Optional
+import pandas as pd
+import logging
+
+from .config import SIGNAL_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class SignalStore:
+    """Append-only history of the engine's daily signals/weights.
+
+    One Parquet file per date (``{root}/{YYYY-MM-DD}.parquet``) holding that
+    date's (Ticker, signal) rows plus the time they were written. Dates are
+    never rewritten, so the directory doubles as an audit trail of what the
+    engine decided each day; backtests and reports read it back with
+    ``read`` instead of regenerating signals. An empty ``root`` keeps the
+    history in memory for the lifetime of the instance.
+    """
+
+    def __init__(self, root: str = SIGNAL_STORE_DIR):
+        self.root = root
+        self.memory: Dict[pd.Timestamp, pd.DataFrame] = {}
+
+    def _path(self, date: pd.Timestamp) -> str:
+        return os.path.join(self.root, f"{date:%Y-%m-%d}.parquet")
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Dates with a stored signal, ascending."""
+        if not self.root:
+            return pd.DatetimeIndex(sorted(self.memory), name='Date')
+        if not os.path.isdir(self.root):
+            return pd.DatetimeIndex([], name='Date')
+        names = [f[:-len('.parquet')] for f in os.listdir(self.root)
+                 if f.endswith('.parquet')]
+        return pd.DatetimeIndex(sorted(pd.to_datetime(names)), name='Date')
+
+    def last_date(self) -> Optional[pd.Timestamp]:
+        dates = self.dates()
+        return dates[-1] if len(dates) else None
+
+    def append(self, signals: pd.Series) -> pd.DatetimeIndex:
+        """
+        Persist ``signals`` (MultiIndex (Date, Ticker)) for dates not stored
+        yet; already-stored dates are left untouched. Returns the dates written.
+        """
+        existing = set(self.dates())
+        written = []
+        stamp = pd.Timestamp.now(tz='UTC')
+        for date, day in signals.groupby(level='Date'):
+            date = pd.Timestamp(date)
+            if date in existing:
+                logger.info(f"SignalStore: {date:%Y-%m-%d} already stored, skipping")
+                continue
+            frame = pd.DataFrame({
+                'Ticker': day.index.get_level_values('Ticker'),
+                'signal': day.to_numpy(dtype=float),
+                'written_at': stamp,
+            })
+            written.append(date)
+            if not self.root:
+                self.memory[date] = frame
+                continue
+            os.makedirs(self.root, exist_ok=True)
+            tmp = f"{self._path(date)}.{os.getpid()}.tmp"
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, self._path(date))
+        return pd.DatetimeIndex(written, name='Date')
+
+    def read(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.Series:
+        """Stored signals with ``start <= Date <= end`` as a (Date, Ticker) Series."""
+        dates = self.dates()
+        if start is not None:
+            dates = dates[dates >= pd.Timestamp(start)]
+        if end is not None:
+            dates = dates[dates <= pd.Timestamp(end)]
+        if dates.empty:
+            idx = pd.MultiIndex.from_arrays([[], []], names=['Date', 'Ticker'])
+            return pd.Series([], index=idx, dtype=float, name='signal')
+        frames = []
+        for date in dates:
+            if self.root:
+                day = pd.read_parquet(self._path(date), columns=['Ticker', 'signal'])
+            else:
+                day = self.memory[date][['Ticker', 'signal']].copy()
+            day.insert(0, 'Date', date)
+            frames.append(day)
+        return pd.concat(frames).set_index(['Date', 'Ticker'])['signal']
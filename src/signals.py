@@ -0,0 +1,52 @@
+# src/signals.py
+
+"""
+Cross-sectional signal kernels on ``dates × tickers`` arrays.
+
+Each row is one date's cross-section; NaN cells (tickers without a value
+on that date) are left out, exactly as a per-date ``groupby`` would see
+them. Quantiles go through ``np.percentile`` so thresholds are
+bit-identical to ``pd.Series.quantile``.
+"""
+
+import numpy as np
+
+
+def row_quantiles(x: np.ndarray, qs) -> np.ndarray:
+    """
+    Linear-interpolated quantiles of each row's non-NaN values.
+
+    Returns an array of shape ``(len(qs), n_rows)``; rows without values
+    get NaN. Rows are sorted once (NaNs last) and rows with the same
+    number of values share one ``np.percentile`` call.
+    """
+    x = np.asarray(x, dtype=float)
+    qs = np.atleast_1d(np.asarray(qs, dtype=float))
+    out = np.full((len(qs), x.shape[0]), np.nan)
+    srt = np.sort(x, axis=1)
+    counts = (~np.isnan(x)).sum(axis=1)
+    for n in np.unique(counts):
+        if n == 0:
+            continue
+        rows = np.flatnonzero(counts == n)
+        out[:, rows] = np.percentile(srt[rows, :n], qs * 100, axis=1)
+    return out
+
+
+def decile_signals(x: np.ndarray, lo_q: float = 0.1, hi_q: float = 0.9) -> np.ndarray:
+    """+1 at or above each row's ``hi_q`` quantile, -1 at or below its ``lo_q`` one."""
+    lo, hi = row_quantiles(x, [lo_q, hi_q])
+    return threshold_signals(x, lo, hi)
+
+
+def threshold_signals(x: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """+1 at or above the row threshold ``hi``, -1 at or below ``lo`` (hi wins), else 0."""
+    with np.errstate(invalid="ignore"):
+        return np.where(x >= hi[:, None], 1,
+                        np.where(x <= lo[:, None], -1, 0))
+
+
+def band_signals(x: np.ndarray, buy_below: float, sell_above: float) -> np.ndarray:
+    """+1 where ``x < buy_below``, -1 where ``x > sell_above`` (sell wins), else 0."""
+    with np.errstate(invalid="ignore"):
+        return np.where(x > sell_above, -1, np.where(x < buy_below, 1, 0))
@@ -1,61 +1,92 @@
 # src/strategy.py
 
+from typing import Optional, Sequence, Union
 import pandas as pd
 import numpy as np
-from stable_baselines3 import SAC
+
+from .panel import PricePanel, as_frame, as_panel
+from .features import FEATURE_COLS
+from .signals import decile_signals, band_signals
+from .policy import load_policy
 
 
 class StrategyEngine:
     """
     Ensemble of momentum (5d), RSI pullback, and optional DRL agent.
+
+    The DRL agent is loaded from its numpy export (``src.policy``) when one
+    sits next to ``drl_model_path``, so no torch import is needed to score.
     """
 
+    RULE_FEATURES = ['5d_mom', 'rsi']
+
     def __init__(self, drl_model_path: str = "models/sac_trader.zip"):
-        try:
-            self.drl_model = SAC.load(drl_model_path)
-        except Exception:
-            self.drl_model = None
+        self.drl_model = load_policy(drl_model_path)
+
+    @property
+    def required_features(self):
+        """Feature columns ``generate_signals`` reads (all of them for DRL)."""
+        return FEATURE_COLS if self.drl_model is not None else self.RULE_FEATURES
+
+    def drl_actions(
+        self,
+        features: Union[pd.DataFrame, PricePanel],
+        dates: Optional[Sequence] = None
+    ) -> pd.DataFrame:
+        """
+        DRL weights for ``dates`` (default: all) × tickers. Observations are
+        the flattened feature rows, feature-major as in ``DRLTradingEnv``;
+        a numpy policy scores all dates in one batch.
+        """
+        panel = as_panel(features)
+        dates = panel.dates if dates is None else pd.Index(dates)
+        rows = panel.dates.get_indexer(dates)
+        obs = np.stack([panel[c][rows] for c in panel.columns], axis=1)
+        obs = obs.reshape(len(rows), -1)
+        if hasattr(self.drl_model, 'act'):
+            actions = self.drl_model.act(obs)
+        else:
+            actions = np.stack([
+                np.asarray(self.drl_model.predict(o, deterministic=True)[0])
+                for o in obs])
+        return pd.DataFrame(actions, index=dates, columns=panel.tickers)
 
     def generate_signals(
         self,
-        price_df: pd.DataFrame,
-        features: pd.DataFrame
+        price_df: Union[pd.DataFrame, PricePanel],
+        features: Union[pd.DataFrame, PricePanel],
+        drl_history: bool = False
     ) -> pd.Series:
         """
         Returns MultiIndex (Date, Ticker) → signal ∈ {-1,0,+1}
+
+        Rules run on the dates × tickers arrays for all dates at once, in
+        the features' row order. With a DRL agent the latest date (every
+        date if ``drl_history``) is blended 50/50 with the agent's weights.
         """
-        # Momentum decile signals
-        mom = features['5d_mom']
-        mom_sig = mom.groupby(level=0).apply(
-            lambda x: pd.Series(
-                np.where(
-                    x >= x.quantile(0.9), 1,
-                    np.where(x <= x.quantile(0.1), -1, 0)
-                ),
-                index=x.index
-            )
-        )
+        features = as_frame(features)
+        panel = PricePanel.from_frame(features, self.RULE_FEATURES)
+        flat = panel.flat_positions(features.index)
+
+        # Momentum decile signals (per-date cross-section)
+        mom_sig = decile_signals(panel['5d_mom'], 0.1, 0.9)
 
         # RSI pullback: buy RSI<30, sell RSI>40
-        rsi = features['rsi']
-        rsi_sig = pd.Series(0, index=rsi.index)
-        rsi_sig[rsi < 30] = 1
-        rsi_sig[rsi > 40] = -1
+        rsi_sig = band_signals(panel['rsi'], 30, 40)
 
         # Combine and clip
-        signal = mom_sig.add(rsi_sig, fill_value=0).clip(-1, 1)
+        combined = np.clip(mom_sig + rsi_sig, -1, 1).ravel().take(flat)
+        signal = pd.Series(combined.astype(np.int64), index=features.index)
 
-        # Blend DRL only for the latest date if available
+        # Blend DRL for the latest date (or all dates) if available
         if self.drl_model is not None:
-            last_date = signal.index.get_level_values('Date').max()
-            # build observation from last feature row
-            obs = features.unstack('Ticker').loc[last_date].values.flatten()
-            drl_act, _ = self.drl_model.predict(obs, deterministic=True)
-            tickers = signal.xs(last_date, level='Date').index
-            drl_ser = pd.Series(drl_act, index=tickers)
-            # override last-date signals with 50/50 blend
-            for t in tickers:
-                original = signal.loc[(last_date, t)]
-                signal.loc[(last_date, t)] = 0.5 * original + 0.5 * drl_ser[t]
+            row_dates = signal.index.get_level_values('Date')
+            dates = panel.dates if drl_history else [row_dates.max()]
+            drl = self.drl_actions(features, dates).stack()
+            blend = row_dates.isin(dates)
+            original = signal[blend]
+            signal = signal.astype(float)
+            signal[blend] = 0.5 * original.to_numpy() \
+                + 0.5 * drl.reindex(original.index).to_numpy()
 
         return signal
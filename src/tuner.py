@@ -1,15 +1,27 @@
 # src/tuner.py
 
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import logging
+import math
+import time
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import ParameterGrid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Sequence, Tuple
 
-from ta.momentum import RSIIndicator
 from .fetcher import DataFetcher
+from .tuning_store import TuningStore
 from .cleaner import DataCleaner
-from .backtester import Backtester
-from .config import SLIPPAGE, COMMISSION
+from .backtester import Backtester, BatchReport
+from .bootstrap import deflated_sharpe
+from .panel import PricePanel, as_panel
+from .indicators import momentum, rsi
+from .signals import decile_signals, row_quantiles, threshold_signals
+from .config import SLIPPAGE, COMMISSION, TUNER_WORKERS
+
+logger = logging.getLogger(__name__)
 
 
 def build_features(
@@ -18,11 +30,14 @@ def build_features(
     mom_long: int,
     rsi_window: int
 ) -> pd.DataFrame:
-    f = df.copy()
-    f['mom_short'] = f.groupby('Ticker')['Close'].pct_change(mom_short)
-    f['mom_long'] = f.groupby('Ticker')['Close'].pct_change(mom_long)
-    f['rsi'] = f.groupby('Ticker')['Close'] \
-        .apply(lambda x: RSIIndicator(x, window=rsi_window).rsi())
+    panel = as_panel(df, ['Close'])
+    close = panel['Close']
+    flat = panel.flat_positions(df.index)
+    f = df.assign(
+        mom_short=momentum(close, mom_short).ravel().take(flat),
+        mom_long=momentum(close, mom_long).ravel().take(flat),
+        rsi=rsi(close, rsi_window).ravel().take(flat),
+    )
     return f.dropna()
 
 
@@ -31,16 +46,10 @@ def gen_mom_signals(
     short_q: float = 0.1,
     long_q: float = 0.9
 ) -> pd.Series:
-    s = feats['mom_short']
-    sig_list = []
-    for date, grp in s.groupby(level=0):
-        hi = grp.quantile(long_q)
-        lo = grp.quantile(short_q)
-        sig_list.append(pd.Series(
-            np.where(grp >= hi, 1, np.where(grp <= lo, -1, 0)),
-            index=grp.index
-        ))
-    return pd.concat(sig_list).sort_index()
+    s = feats['mom_short'].sort_index()
+    panel = PricePanel.from_frame(s)
+    sig = decile_signals(panel[s.name], short_q, long_q)
+    return pd.Series(sig.ravel().take(panel.flat_positions(s.index)), index=s.index)
 
 
 def walk_forward_splits(
@@ -56,54 +65,558 @@ def walk_forward_splits(
     return splits
 
 
+class IndicatorMemo:
+    """
+    Tuner indicators computed once on the full history and sliced per split.
+
+    The per-split ``build_features`` / ``gen_mom_signals`` path only uses
+    ``mom_short`` values; ``mom_long`` and RSI matter only through the rows
+    they leave NaN while warming up inside the split window. So each
+    distinct momentum period is computed once over the whole Close panel
+    (``pct_change`` of a ticker's own rows, identical in any window that
+    holds the lagged row), and each window's warm-up masks come from
+    cumulative observation counts. Per-date signal quantiles are cached on
+    the full history and reused for every test row whose set of valid
+    tickers is the full-history one. ``stats`` counts the work avoided.
+    """
+
+    LO_Q, HI_Q = 0.1, 0.9
+
+    def __init__(self, panel: PricePanel):
+        self.panel = panel
+        self.present = ~np.isnan(panel['Close'])
+        # valid observations per ticker up to and including each row
+        self.obs = np.cumsum(self.present, axis=0)
+        self.momentum: Dict[int, np.ndarray] = {}
+        self.quantiles: Dict[int, np.ndarray] = {}
+        self.stats: Counter = Counter()
+
+    def mom(self, periods: int) -> np.ndarray:
+        if periods not in self.momentum:
+            self.momentum[periods] = momentum(self.panel['Close'], periods)
+            self.stats['indicators_computed'] += 1
+        return self.momentum[periods]
+
+    def thresholds(self, periods: int) -> np.ndarray:
+        """(2, dates) low/high quantiles of each date's full-history momentum."""
+        if periods not in self.quantiles:
+            self.quantiles[periods] = row_quantiles(
+                self.mom(periods), [self.LO_Q, self.HI_Q])
+        return self.quantiles[periods]
+
+    def prepare(self, grid: Sequence[Dict[str, Any]]) -> "IndicatorMemo":
+        """Compute every momentum period / quantile table ``grid`` needs."""
+        for params in grid:
+            self.thresholds(params['mom_short'])
+        return self
+
+    def window_signals(
+        self,
+        lo: int,
+        n_train: int,
+        hi: int,
+        mom_short: int,
+        mom_long: int,
+        rsi_window: int
+    ) -> np.ndarray:
+        """
+        Test-row signals (NaN = no feature row) of rows ``[lo + n_train, hi)``,
+        as ``gen_mom_signals(build_features(window))`` would give them.
+        """
+        rows = slice(lo + n_train, hi)
+        seen = self.obs[rows] - (self.obs[lo - 1] if lo > 0 else 0)
+        valid = self.present[rows] & (seen > max(mom_short, mom_long)) & \
+            (seen >= rsi_window)
+        x = np.where(valid, self.mom(mom_short)[rows], np.nan)
+
+        # reuse full-history quantiles where the window sees every ticker
+        q = self.thresholds(mom_short)[:, rows].copy()
+        full = ~np.isnan(self.mom(mom_short)[rows])
+        redo = np.flatnonzero((valid != full).any(axis=1))
+        if len(redo):
+            q[:, redo] = row_quantiles(x[redo], [self.LO_Q, self.HI_Q])
+        self.stats['quantile_rows_computed'] += len(redo)
+        self.stats['quantile_rows_reused'] += q.shape[1] - len(redo)
+
+        sig = threshold_signals(x, q[0], q[1]).astype(float)
+        sig[~valid] = np.nan
+        return sig
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {'close': self.panel['Close'], 'obs': self.obs}
+        for p, arr in self.momentum.items():
+            arrays[f"mom_{p}"] = arr
+        for p, arr in self.quantiles.items():
+            arrays[f"q_{p}"] = arr
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dates: pd.DatetimeIndex,
+        tickers: pd.Index,
+        arrays: Dict[str, np.ndarray]
+    ) -> "IndicatorMemo":
+        memo = cls.__new__(cls)
+        memo.panel = PricePanel(dates, tickers, {'Close': arrays['close']})
+        memo.present = ~np.isnan(arrays['close'])
+        memo.obs = arrays['obs']
+        memo.momentum = {int(k[4:]): v for k, v in arrays.items() if k.startswith('mom_')}
+        memo.quantiles = {int(k[2:]): v for k, v in arrays.items() if k.startswith('q_')}
+        memo.stats = Counter()
+        return memo
+
+
+def split_returns(
+    memo: IndicatorMemo,
+    window: Tuple[int, int, int],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float]
+) -> pd.DataFrame:
+    """
+    Out-of-sample daily returns (test dates × grid points) for one
+    walk-forward ``(lo, n_train, hi)`` row window of the memo's panel.
+    """
+    lo, n_train, hi = window
+    panel = memo.panel
+    price_test = PricePanel(panel.dates[lo + n_train:hi], panel.tickers,
+                            {'Close': panel['Close'][lo + n_train:hi]})
+
+    # signals only depend on the feature parameters; costs are applied
+    # per grid point in one batched backtest
+    sig_cache = {}
+    signals = np.empty((len(grid),) + price_test.shape)
+    for i, params in enumerate(grid):
+        fkey = (params['mom_short'], params['mom_long'], params['rsi_window'])
+        if fkey not in sig_cache:
+            sig_cache[fkey] = memo.window_signals(lo, n_train, hi, *fkey)
+        signals[i] = sig_cache[fkey]
+    memo.stats['indicator_requests'] += 3 * len(sig_cache)
+
+    report = Backtester().run_batch(price_test, signals, slippage, commission)
+    return report.returns
+
+
+def _publish(arrays: Dict[str, np.ndarray]):
+    """Copy ``arrays`` into one shared-memory block; returns it and its layout."""
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        layout[name] = (offset, arr.shape, arr.dtype.str)
+        offset += arr.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name, arr in arrays.items():
+        start, shape, dtype = layout[name]
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = arr
+    return shm, layout
+
+
+def _split_job(
+    shm_name: str,
+    layout: Dict[str, Tuple[int, Tuple[int, ...], str]],
+    dates: pd.DatetimeIndex,
+    tickers: pd.Index,
+    window: Tuple[int, int, int],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float]
+) -> Tuple[pd.DataFrame, Counter]:
+    """Process-pool worker: ``split_returns`` on the shared memo arrays."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        arrays = {name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+                  for name, (start, shape, dtype) in layout.items()}
+        memo = IndicatorMemo.from_arrays(dates, tickers, arrays)
+        returns = split_returns(memo, window, grid, slippage, commission)
+        stats = memo.stats
+        del arrays, memo
+        return returns, stats
+    finally:
+        shm.close()
+
+
+def _sub(values: Sequence[Any], configs: Sequence[int]) -> List[Any]:
+    return [values[i] for i in configs]
+
+
+class SplitPool:
+    """
+    Worker processes for ``split_returns`` jobs on one memo and grid, kept
+    for a whole sweep. The pool is started, and the memo's arrays for the
+    whole grid published in shared memory, on the first batch of two or
+    more jobs; every later batch (halving rungs, waits on results claimed
+    by other processes) reuses both until ``close``. With ``n_jobs <= 1``
+    nothing is started and jobs run in-process.
+    """
+
+    def __init__(self, memo: IndicatorMemo, grid: Sequence[Dict[str, Any]], n_jobs: int = 1):
+        self.memo = memo
+        self.grid = grid
+        self.n_jobs = n_jobs
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.layout: Dict[str, Tuple[int, Tuple[int, ...], str]] = {}
+
+    def __enter__(self) -> "SplitPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start(self):
+        # workers only see what is published now, so cover the whole grid
+        self.memo.prepare(self.grid)
+        self.shm, self.layout = _publish(self.memo.to_arrays())
+        self.pool = ProcessPoolExecutor(max_workers=self.n_jobs)
+
+    def run(
+        self,
+        jobs: Sequence[Tuple[Tuple[int, int, int], Sequence[int]]],
+        slippage: Sequence[float],
+        commission: Sequence[float]
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """``iter_split_returns`` for ``jobs`` on this pool."""
+        memo, grid = self.memo, self.grid
+        if self.n_jobs <= 1 or len(jobs) < 2:
+            memo.prepare(_sub(grid, sorted({i for _, configs in jobs for i in configs})))
+            for n, (window, configs) in enumerate(jobs):
+                yield n, split_returns(memo, window, _sub(grid, configs),
+                                       _sub(slippage, configs), _sub(commission, configs))
+            return
+
+        if self.pool is None:
+            self._start()
+        futures = {
+            self.pool.submit(_split_job, self.shm.name, self.layout, memo.panel.dates,
+                             memo.panel.tickers, window, _sub(grid, configs),
+                             _sub(slippage, configs), _sub(commission, configs)): n
+            for n, (window, configs) in enumerate(jobs)
+        }
+        try:
+            for future in as_completed(futures):
+                returns, stats = future.result()
+                memo.stats.update(stats)
+                yield futures[future], returns
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def iter_split_returns(
+    memo: IndicatorMemo,
+    jobs: Sequence[Tuple[Tuple[int, int, int], Sequence[int]]],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float],
+    pool: Optional[SplitPool] = None
+) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    ``split_returns`` for each ``(window, grid indices)`` job, yielded as
+    ``(job number, returns)`` as jobs finish: on ``pool``'s workers, which
+    read the memo's arrays in place from shared memory, or in-process
+    without one.
+    """
+    pool = pool if pool is not None else SplitPool(memo, grid)
+    yield from pool.run(jobs, slippage, commission)
+
+
+def run_splits(
+    memo: IndicatorMemo,
+    windows: Sequence[Tuple[int, int, int]],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float],
+    n_jobs: int = 1
+) -> List[pd.DataFrame]:
+    """
+    ``split_returns`` for each ``(lo, n_train, hi)`` row window, in order
+    (``iter_split_returns`` over the whole grid); results match the
+    serial path exactly.
+    """
+    configs = range(len(grid))
+    out: List[Optional[pd.DataFrame]] = [None] * len(windows)
+    with SplitPool(memo, grid, n_jobs) as pool:
+        for n, returns in iter_split_returns(memo, [(w, configs) for w in windows],
+                                             grid, slippage, commission, pool):
+            out[n] = returns
+    return out
+
+
+def spread_order(n: int) -> List[int]:
+    """
+    Split indices ordered so every prefix spreads over the whole history:
+    the most recent split first, then each next one as far as possible
+    from those already taken.
+    """
+    if n <= 0:
+        return []
+    pos = np.arange(n)
+    order = [n - 1]
+    dist = np.abs(pos - (n - 1))
+    while len(order) < n:
+        k = int(np.argmax(dist))
+        order.append(k)
+        dist = np.minimum(dist, np.abs(pos - k))
+    return order
+
+
+def halving_schedule(
+    n_configs: int,
+    n_splits: int,
+    eta: int = 3,
+    min_splits: int = 2
+) -> List[Tuple[int, int]]:
+    """
+    Successive-halving rungs as ``(candidates, splits)`` pairs: every
+    rung keeps the best ``1/eta`` of the candidates and scores them on
+    ``eta`` times as many splits; the last rung uses all splits.
+    """
+    if eta < 2:
+        raise ValueError(f"eta must be at least 2, got {eta}")
+    if n_configs < 1 or n_splits < 1:
+        return []
+    halvings = int(math.floor(math.log(n_configs, eta) + 1e-9))
+    m = max(min(min_splits, n_splits), math.ceil(n_splits / eta ** halvings))
+    rungs, c = [], n_configs
+    while True:
+        rungs.append((c, m))
+        if m >= n_splits:
+            return rungs
+        c = max(1, c // eta)
+        m = n_splits if c == 1 else min(n_splits, m * eta)
+
+
+def evaluate_pairs(
+    memo: IndicatorMemo,
+    windows: Sequence[Tuple[int, int, int]],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float],
+    pairs: Dict[int, np.ndarray],
+    store: Optional[TuningStore] = None,
+    pool: Optional[SplitPool] = None
+) -> Tuple[Dict[int, pd.DataFrame], int]:
+    """
+    Out-of-sample returns of grid points ``pairs[k]`` on split ``k``, as
+    one frame per split (columns are grid indices), plus the number of
+    (grid point, split) backtests actually run.
+
+    With a ``store``, finished results are read back; the rest are
+    claimed up front, backtested in one ``iter_split_returns`` pass and
+    written as each split finishes, so an interrupted sweep only loses
+    the splits still running. Entries claimed by other processes are
+    collected once they are stored. Backtests run on ``pool`` (in-process
+    without one).
+    """
+    store = store if store is not None else TuningStore(root='')
+    panel = memo.panel
+    params = [dict(p, slippage=s, commission=c)
+              for p, s, c in zip(grid, slippage, commission)]
+    keys = {}
+    for k, configs in pairs.items():
+        wkey = store.window_key(panel, windows[k])
+        keys.update({(i, k): store.key(wkey, params[i]) for i in configs})
+
+    found: Dict[int, Dict[int, pd.Series]] = {k: {} for k in pairs}
+    pending = {k: list(configs) for k, configs in pairs.items() if len(configs)}
+    run = 0
+    while pending:
+        claimed = {}
+        for k in sorted(pending):
+            for i in pending[k]:
+                stored = store.get(keys[i, k])
+                if stored is not None:
+                    found[k][i] = stored
+                elif store.claim(keys[i, k]):
+                    claimed.setdefault(k, []).append(i)
+        claimed = list(claimed.items())
+        jobs = [(windows[k], configs) for k, configs in claimed]
+        held = [keys[i, k] for k, configs in claimed for i in configs]
+        try:
+            with store.heartbeat(held):
+                for n, frame in iter_split_returns(memo, jobs, grid, slippage,
+                                                   commission, pool):
+                    k, configs = claimed[n]
+                    frame.columns = configs
+                    for i in configs:
+                        store.put(keys[i, k], frame[i])
+                        found[k][i] = frame[i]
+                    run += len(configs)
+        finally:
+            for k, configs in claimed:
+                for i in configs:
+                    if i not in found[k]:
+                        store.release(keys[i, k])
+        pending = {k: [i for i in pending[k] if i not in found[k]] for k in pending}
+        pending = {k: configs for k, configs in pending.items() if configs}
+        if pending:
+            logger.info(f"Tuner: waiting on {sum(map(len, pending.values()))} "
+                        f"results claimed by other processes")
+            time.sleep(store.poll)
+
+    # one fixed (row-major) layout, so stored and fresh results score alike
+    frames = {}
+    for k, configs in pairs.items():
+        if len(configs):
+            cols = [found[k][i] for i in configs]
+            frames[k] = pd.DataFrame(np.column_stack(cols), index=cols[0].index,
+                                     columns=list(configs))
+    return frames, run
+
+
+class SearchResult(NamedTuple):
+    """
+    Walk-forward evaluations of a grid. ``returns[k]`` holds split ``k``'s
+    test-date returns for the grid points scored on it (columns are grid
+    indices); ``sharpe`` and ``evaluated`` are (grid × splits).
+    """
+    returns: List[Optional[pd.DataFrame]]
+    sharpe: np.ndarray
+    evaluated: np.ndarray
+    budget: pd.DataFrame
+
+
+def run_rungs(
+    memo: IndicatorMemo,
+    windows: Sequence[Tuple[int, int, int]],
+    grid: Sequence[Dict[str, Any]],
+    slippage: Sequence[float],
+    commission: Sequence[float],
+    rungs: Sequence[Tuple[int, int]],
+    n_jobs: int = 1,
+    store: Optional[TuningStore] = None
+) -> SearchResult:
+    """
+    Score grid points rung by rung: each rung backtests its candidates on
+    a ``spread_order`` prefix of the splits (reusing earlier rungs'
+    results), and the next rung's candidates are the best by mean Sharpe
+    over that prefix. A single ``(len(grid), len(windows))`` rung is the
+    exhaustive search. Results already in ``store`` are reused rather
+    than backtested (``evaluate_pairs``); all rungs share one ``SplitPool``.
+    """
+    n_splits = len(windows)
+    order = spread_order(n_splits)
+    returns: List[Optional[pd.DataFrame]] = [None] * n_splits
+    sharpe = np.full((len(grid), n_splits), np.nan)
+    evaluated = np.zeros((len(grid), n_splits), dtype=bool)
+    budget = []
+    candidates = np.arange(len(grid))
+    with SplitPool(memo, grid, n_jobs) as pool:
+        for rung, (n_keep, m) in enumerate(rungs):
+            if rung:
+                # rank on the previous rung's splits; ties keep grid order
+                score = sharpe[np.ix_(candidates, order[:rungs[rung - 1][1]])].mean(axis=1)
+                rank = np.argsort(-np.nan_to_num(score, nan=-np.inf), kind='stable')
+                candidates = np.sort(candidates[rank[:n_keep]])
+
+            todo = {k: candidates[~evaluated[candidates, k]] for k in sorted(order[:m])}
+            frames, run = evaluate_pairs(memo, windows, grid, slippage, commission,
+                                         todo, store, pool)
+            for k, frame in frames.items():
+                sharpe[todo[k], k] = BatchReport(frame).sharpe
+                evaluated[todo[k], k] = True
+                returns[k] = frame if returns[k] is None else \
+                    frame.combine_first(returns[k])
+            n_pairs = sum(map(len, todo.values()))
+            budget.append({'rung': rung, 'candidates': len(candidates), 'splits': m,
+                           'backtests': run, 'reused': n_pairs - run})
+
+    budget = pd.DataFrame(budget, columns=['rung', 'candidates', 'splits',
+                                           'backtests', 'reused'])
+    budget['total_backtests'] = budget['backtests'].cumsum()
+    return SearchResult(returns, sharpe, evaluated, budget)
+
+
 def tune_hyperparameters(
     tickers: List[str],
     start: str,
     end: str,
     param_grid: Dict[str, List[Any]],
     train_len: int,
-    test_len: int
+    test_len: int,
+    n_jobs: int = TUNER_WORKERS,
+    search: str = 'grid',
+    eta: int = 3,
+    min_splits: int = 2,
+    store: Optional[TuningStore] = None
 ) -> pd.DataFrame:
+    """
+    Walk-forward tuning over ``param_grid``, best ``avg_sharpe`` first.
+
+    ``search='grid'`` backtests every grid point on every split.
+    ``search='halving'`` runs successive halving (``halving_schedule``):
+    all points start on ``min_splits`` or more splits and only the best
+    ``1/eta`` move on to more; an ``n_splits`` column tells how many splits
+    each row's ``avg_sharpe`` covers, and fully scored rows sort first.
+    The rung-by-rung backtest budget is logged and kept as records in
+    ``df.attrs['budget']``.
+
+    With a ``store`` (or ``TUNING_STORE_DIR`` set), each (grid point,
+    split) result is saved as soon as it is backtested, so a rerun of an
+    interrupted sweep only runs what is missing. Nothing is kept by default.
+    """
+    if search not in ('grid', 'halving'):
+        raise ValueError(f"Unknown search mode: {search}")
     raw = DataFetcher().fetch_daily(tickers, start, end)
     clean = DataCleaner().clean(raw)
-    dates = clean.index.get_level_values('Date').unique().sort_values()
+    memo = IndicatorMemo(as_panel(clean, ['Close']))
+    dates = memo.panel.dates
     splits = walk_forward_splits(dates, train_len, test_len)
+    windows = [(dates.get_loc(sp['train'][0]), len(sp['train']),
+                dates.get_loc(sp['test'][-1]) + 1) for sp in splits]
+
+    grid = list(ParameterGrid(param_grid))
+    slippage = [params.get('slippage', SLIPPAGE) for params in grid]
+    commission = [params.get('commission', COMMISSION) for params in grid]
+    if search == 'halving':
+        rungs = halving_schedule(len(grid), len(windows), eta, min_splits)
+    else:
+        rungs = [(len(grid), len(windows))] if windows else []
+    store = store if store is not None else TuningStore()
+    found = run_rungs(memo, windows, grid, slippage, commission, rungs, n_jobs, store)
+
+    stats = memo.stats
+    avoided = stats['indicator_requests'] - stats['indicators_computed']
+    logger.info(
+        f"Tuner: {avoided} of {stats['indicator_requests']} indicator computations "
+        f"avoided, {stats['quantile_rows_reused']} quantile rows reused "
+        f"({stats['quantile_rows_computed']} recomputed)")
+    budget = found.budget
+    spent = int(budget['backtests'].sum())
+    for row in budget.itertuples():
+        logger.info(f"Tuner {search} rung {row.rung}: {row.candidates} candidates "
+                    f"on {row.splits} splits, {row.backtests} backtests, "
+                    f"{row.reused} stored results reused")
+    logger.info(f"Tuner {search}: {spent} of {len(grid) * len(windows)} "
+                f"grid-point backtests run")
 
+    # deflate each grid point's stitched out-of-sample Sharpe by the number
+    # of configurations tried
+    oos = [frame for frame in found.returns if frame is not None]
+    oos_returns = pd.concat(oos).reindex(columns=range(len(grid))) if oos \
+        else pd.DataFrame(columns=range(len(grid)))
+    oos_sharpe = oos_returns.mean() / oos_returns.std() * np.sqrt(252)
     results = []
-    for params in ParameterGrid(param_grid):
-        sharpes = []
-        for sp in splits:
-            mask = clean.index.get_level_values(
-                'Date').isin(sp['train'].union(sp['test']))
-            window_df = clean.loc[mask]
-
-            feats = build_features(
-                window_df,
-                mom_short=params['mom_short'],
-                mom_long=params['mom_long'],
-                rsi_window=params['rsi_window']
-            )
-            sig_full = gen_mom_signals(feats)
-            test_mask = sig_full.index.get_level_values(
-                'Date').isin(sp['test'])
-            sig_test = sig_full[test_mask]
-
-            price_test = window_df.loc[
-                window_df.index.get_level_values('Date').isin(sp['test'])
-            ]
-            bt = Backtester()
-            perf = bt.run_backtest(
-                price_test,
-                sig_test,
-                slippage=params.get('slippage', SLIPPAGE),
-                commission=params.get('commission', COMMISSION)
-            )
-            sharpes.append(perf.sharpe)
-
-        avg_sharpe = float(np.mean(sharpes))
+    for i, params in enumerate(grid):
         res = params.copy()
-        res['avg_sharpe'] = avg_sharpe
+        res['avg_sharpe'] = float(np.mean(found.sharpe[i][found.evaluated[i]]))
+        res['dsr'] = deflated_sharpe(oos_returns[i], len(grid), oos_sharpe.to_numpy())
+        if search == 'halving':
+            res['n_splits'] = int(found.evaluated[i].sum())
         results.append(res)
 
     df = pd.DataFrame(results)
-    return df.sort_values('avg_sharpe', ascending=False).reset_index(drop=True)
+    order = ['n_splits', 'avg_sharpe'] if search == 'halving' else 'avg_sharpe'
+    df = df.sort_values(order, ascending=False).reset_index(drop=True)
+    df.attrs['memo'] = dict(stats)
+    df.attrs['budget'] = budget.to_dict('records')
+    return df
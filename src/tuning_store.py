@@ -0,0 +1,198 @@
+# src/tuning_store.py
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import logging
+
+from .panel import PricePanel
+from .config import TUNING_STORE_DIR, TUNING_LEASE_SECONDS, TUNING_RUN_ID
+
+logger = logging.getLogger(__name__)
+
+
+class TuningStore:
+    """
+    Completed walk-forward tuning results, one per (grid point, split).
+
+    Each entry is one parameter set's out-of-sample daily returns on one
+    split, stored as ``{root}/{key}.parquet``. The key hashes the split's
+    price window (dates, tickers, closes and train/test boundary) and the
+    parameters including costs, so a rerun after a crash, and any later
+    sweep over the same data, reads finished results instead of
+    backtesting them again.
+
+    Several tuner processes can share a root. Before backtesting an entry
+    a process claims it with an exclusive ``{key}.claim`` file naming its
+    host, pid and ``run_id``; the others skip it and pick up the result
+    once it lands. Claims are refreshed while their backtests run
+    (``heartbeat``), so a claim not refreshed for ``lease`` seconds is
+    abandoned and taken over. A restarted run resumes at once: it takes
+    back claims of dead processes on its own host and, when it comes back
+    on another host, claims another host left under its own ``run_id``.
+    A run id must therefore name one worker and stay stable across its
+    restarts (e.g. a StatefulSet pod name or an indexed Job's index);
+    workers sharing an id on different hosts would take each other's
+    claims. An empty ``root`` keeps nothing and every claim succeeds.
+    """
+
+    VERSION = 1  # bump when the meaning of a stored result changes
+
+    def __init__(
+        self,
+        root: str = TUNING_STORE_DIR,
+        lease: float = TUNING_LEASE_SECONDS,
+        poll: float = 5.0,
+        run_id: Optional[str] = TUNING_RUN_ID or None
+    ):
+        self.root = root
+        self.lease = lease
+        self.poll = poll
+        self.run_id = run_id
+
+    @classmethod
+    def window_key(cls, panel: PricePanel, window: Tuple[int, int, int]) -> str:
+        """Hash of the data a ``(lo, n_train, hi)`` row window is tuned on."""
+        lo, n_train, hi = window
+        h = hashlib.sha256()
+        h.update(json.dumps([cls.VERSION, n_train, list(map(str, panel.tickers))]).encode())
+        h.update(panel.dates[lo:hi].asi8.tobytes())
+        h.update(np.ascontiguousarray(panel['Close'][lo:hi], dtype=float).tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def key(window_key: str, params: Dict[str, Any]) -> str:
+        """Entry key for one parameter set on one window."""
+        h = hashlib.sha256(window_key.encode())
+        h.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.parquet")
+
+    def _claim_path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.claim")
+
+    def get(self, key: str) -> Optional[pd.Series]:
+        """Stored returns for ``key``, or None."""
+        if not self.root or not os.path.exists(self._path(key)):
+            return None
+        try:
+            return pd.read_parquet(self._path(key))['returns']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"TuningStore: unreadable entry {key}: {e}")
+            return None
+
+    def put(self, key: str, returns: pd.Series):
+        """Persist one result and drop its claim."""
+        if not self.root:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        returns.rename('returns').to_frame().to_parquet(tmp)
+        os.replace(tmp, self._path(key))
+        self.release(key)
+
+    def _owner(self) -> Dict[str, Any]:
+        return {'host': socket.gethostname(), 'pid': os.getpid(), 'run': self.run_id}
+
+    def _abandoned(self, path: str) -> bool:
+        """
+        Whether the claim at ``path`` is left over: taken by this process
+        or by a process on this host that is no longer alive, taken on
+        another host under this run id, or not refreshed for ``lease``
+        seconds. A live process on this host keeps its claim whatever its
+        run id.
+        """
+        age = time.time() - os.stat(path).st_mtime
+        try:
+            with open(path) as f:
+                owner = json.load(f)
+        except (OSError, ValueError):
+            owner = {}  # still being written
+        me = self._owner()
+        if owner.get('host') == me['host']:
+            pid = owner.get('pid')
+            if pid == me['pid'] or (isinstance(pid, int) and not _pid_alive(pid)):
+                return True
+        elif self.run_id and owner.get('run') == self.run_id:
+            return True  # this worker, before a restart on another host
+        return age >= self.lease
+
+    def claim(self, key: str) -> bool:
+        """
+        Try to take ``key`` for backtesting. False while another live
+        process holds the claim.
+        """
+        if not self.root:
+            return True
+        os.makedirs(self.root, exist_ok=True)
+        path = self._claim_path(key)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                abandoned = self._abandoned(path)
+            except FileNotFoundError:
+                return self.claim(key)  # released in the meantime
+            if not abandoned:
+                return False
+            logger.warning(f"TuningStore: taking over abandoned claim on {key}")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self._owner(), f)
+            os.replace(tmp, path)
+            return True
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._owner(), f)
+        return True
+
+    @contextmanager
+    def heartbeat(self, keys: Sequence[str]):
+        """Refresh the claims on ``keys`` every ``lease / 4`` seconds while the block runs."""
+        if not self.root or not keys:
+            yield
+            return
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.lease / 4):
+                for key in keys:
+                    try:
+                        os.utime(self._claim_path(key))
+                    except FileNotFoundError:
+                        pass  # stored or released
+
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def release(self, key: str):
+        """Drop a claim (after storing the result or giving up on it)."""
+        if not self.root:
+            return
+        try:
+            os.remove(self._claim_path(key))
+        except FileNotFoundError:
+            pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by another user
+    return True
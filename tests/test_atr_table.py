@@ -0,0 +1,111 @@
+# tests/test_atr_table.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.atr_table import ATRTable, StreamingATR
+from src.indicators import atr
+from src.panel import PricePanel, ffill
+
+
+def make_daily(n_days=60, tickers=("A", "B", "C"), seed=0, drop=0.1):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=n_days)
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 100 + rng.normal(0, 1, len(idx)).cumsum()
+    df = pd.DataFrame({
+        "High": close + rng.uniform(0, 1.5, len(idx)),
+        "Low": close - rng.uniform(0, 1.5, len(idx)),
+        "Close": close,
+    }, index=idx)
+    return df.drop(df.sample(frac=drop, random_state=seed).index) if drop else df
+
+
+def full_atr(daily, window=14):
+    panel = PricePanel.from_frame(daily)
+    return panel, ffill(atr(panel["High"], panel["Low"], panel["Close"], window))
+
+
+def test_streaming_atr_matches_kernel():
+    daily = make_daily()
+    state = StreamingATR(14)
+    dates = daily.index.get_level_values("Date")
+    state.update(daily[dates < dates[len(dates) // 2]])
+    state.update(daily)  # only the remaining dates are applied
+    panel, expected = full_atr(daily)
+    np.testing.assert_allclose(state.current(panel.tickers), expected[-1], rtol=1e-12)
+    assert np.isnan(state.current(pd.Index(["ZZZ"]))).all()
+
+
+def test_table_is_lagged_kernel():
+    daily = make_daily()
+    table = ATRTable(14).extend(daily)
+    panel, expected = full_atr(daily)
+    got = table.table(panel.dates)[panel.tickers].to_numpy()
+    assert np.isnan(got[0]).all()  # nothing is known before the first bar
+    np.testing.assert_allclose(got[1:], expected[:-1], rtol=1e-12, equal_nan=True)
+
+    d = panel.dates[30]
+    assert table.get(d, "B") == pytest.approx(expected[29, 1], rel=1e-12)
+    assert table.at(d)["B"] == table.get(d, "B")
+    # after the last bar the latest row is in force (live use)
+    assert table.get(panel.dates[-1] + pd.Timedelta(days=3), "C") == \
+        pytest.approx(expected[-1, 2], rel=1e-12)
+    assert np.isnan(table.get(d, "ZZZ"))
+
+
+def test_extend_one_bar_at_a_time_matches_bulk():
+    daily = make_daily()
+    dates = daily.index.get_level_values("Date")
+    bulk = ATRTable(14).extend(daily)
+    inc = ATRTable(14).extend(daily[dates < dates.unique()[40]])
+    for d in dates.unique()[40:]:
+        inc.extend(daily[dates <= d])
+    assert inc.dates.equals(bulk.dates)
+    np.testing.assert_allclose(inc.values, bulk.values, rtol=1e-12, equal_nan=True)
+
+
+def test_extend_in_blocks_matches_streaming_state():
+    daily = make_daily(n_days=50)
+    days = daily.index.unique("Date")
+    dates = daily.index.get_level_values("Date")
+    stream = StreamingATR(14)
+    stream.update(daily)
+    bulk = ATRTable(14).extend(daily)
+    # block edges inside the first window, so seeds straddle blocks
+    table = ATRTable(14)
+    for end in (3, 10, 17, 18, 50):
+        table.extend(daily[dates < days[end]] if end < len(days) else daily)
+    np.testing.assert_allclose(table.values, bulk.values, rtol=1e-12, equal_nan=True)
+    for name in StreamingATR._STATE:
+        np.testing.assert_allclose(getattr(table.state, name), getattr(stream, name),
+                                   rtol=1e-12)
+
+
+def test_new_ticker_adds_column():
+    daily = make_daily(tickers=("A", "B"), drop=0)
+    extra = make_daily(tickers=("D",), seed=1, drop=0)
+    dates = daily.index.get_level_values("Date")
+    table = ATRTable(5).extend(daily[dates < dates.unique()[30]])
+    table.extend(pd.concat([daily, extra]).sort_index())
+    assert list(table.tickers) == ["A", "B", "D"]
+    assert table.values.shape == (60, 3)
+    assert np.isnan(table.values[:30, 2]).all()
+
+
+def test_save_load_roundtrip_and_rebuild(tmp_path):
+    path = str(tmp_path / "atr.npz")
+    daily = make_daily()
+    table = ATRTable(14).extend(daily)
+    table.save(path)
+    loaded = ATRTable.load(path, window=14)
+    pd.testing.assert_frame_equal(loaded.table(table.dates), table.table(table.dates))
+    assert loaded.extend(daily).dates.equals(table.dates)  # nothing new to add
+    assert ATRTable.load(path, window=10).dates.empty
+    assert ATRTable.load(str(tmp_path / "missing.npz")).dates.empty
+
+    # re-adjusted history (e.g. a split) forces a rebuild
+    adjusted = daily.assign(High=daily["High"] / 2, Low=daily["Low"] / 2,
+                            Close=daily["Close"] / 2)
+    rebuilt = loaded.extend(adjusted)
+    np.testing.assert_allclose(rebuilt.values, table.values / 2, rtol=1e-9, equal_nan=True)
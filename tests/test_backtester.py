@@ -2,6 +2,7 @@
 
 import pandas as pd
 import numpy as np
+import pytest
 from src.backtester import Backtester
 
 
@@ -22,3 +23,107 @@ def test_backtester_simple_profit():
     assert np.isclose(daily.iloc[0], 0.01)
     # Sharpe should be positive
     assert perf.sharpe > 0
+
+
+def test_run_batch_matches_run_backtest():
+    from src.backtester import stack_signals
+    from src.panel import as_panel
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    tickers = [f"T{i}" for i in range(7)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 100 * np.exp(rng.normal(0, 0.02, len(idx)).cumsum())
+    prices = pd.DataFrame({"Close": close}, index=idx)
+    prices = prices[rng.random(len(prices)) > 0.05]  # ragged
+
+    signals = []
+    for k in range(4):
+        sig = pd.Series(rng.integers(-1, 2, len(prices)), index=prices.index)
+        if k % 2:
+            sig = sig[rng.random(len(sig)) > 0.1]  # signals missing some rows
+        signals.append(sig)
+    slippage = [0.0, 0.001, 0.0005, 0.002]
+
+    panel = as_panel(prices, ["Close"])
+    bt = Backtester()
+    batch = bt.run_batch(panel, stack_signals(signals, panel), slippage, 0.0002)
+    for k, sig in enumerate(signals):
+        perf = bt.run_backtest(prices, sig, slippage=slippage[k], commission=0.0002)
+        np.testing.assert_allclose(
+            batch.returns[k], perf.returns.reindex(batch.returns.index), rtol=1e-12)
+        np.testing.assert_allclose(
+            [batch.sharpe[k], batch.max_drawdown[k], batch.profit_factor[k]],
+            [perf.sharpe, perf.max_drawdown, perf.profit_factor], rtol=1e-12)
+    assert list(batch.to_frame().columns) == ["sharpe", "max_drawdown", "profit_factor"]
+
+
+def perf_close(acc, report):
+    np.testing.assert_allclose(
+        [acc.sharpe, acc.max_drawdown, acc.profit_factor],
+        [report.sharpe, report.max_drawdown, report.profit_factor], rtol=1e-10)
+
+
+def test_online_performance_matches_report_and_merges():
+    from src.backtester import OnlinePerformance, PerformanceReport
+
+    rng = np.random.default_rng(1)
+    r = rng.normal(0.0005, 0.01, 400)
+    r[[7, 90]] = np.nan
+    full = PerformanceReport(pd.Series(r))
+    perf_close(OnlinePerformance().update_many(r), full)
+
+    # shards merged in time order give the same metrics
+    shards = [OnlinePerformance().update_many(part) for part in np.split(r, [50, 51, 300])]
+    merged = shards[0]
+    for s in shards[1:]:
+        merged = merged.merge(s)
+    perf_close(merged, full)
+    perf_close(OnlinePerformance.from_dict(merged.to_dict()), full)
+
+
+def test_rolling_performance_window():
+    from src.backtester import RollingPerformance, PerformanceReport
+
+    rng = np.random.default_rng(2)
+    r = rng.normal(0, 0.01, 200)
+    roll = RollingPerformance(30)
+    for i, x in enumerate(r):
+        roll.update(x)
+        if i >= 30 and i % 17 == 0:
+            perf_close(roll, PerformanceReport(pd.Series(r[i - 29:i + 1])))
+    perf_close(RollingPerformance.from_dict(roll.to_dict()),
+               PerformanceReport(pd.Series(r[-30:])))
+
+
+def test_performance_state_only_adds_new_dates(tmp_path):
+    from src.backtester import PerformanceState, PerformanceReport
+
+    rng = np.random.default_rng(3)
+    daily = pd.Series(rng.normal(0, 0.01, 80), index=pd.bdate_range("2025-01-01", periods=80))
+    path = str(tmp_path / "perf.json")
+    PerformanceState(window=20).update(daily.iloc[:50]).save(path)
+
+    # next run sees an overlapping window: only the unseen dates count
+    state = PerformanceState.load(path, window=20).update(daily.iloc[30:])
+    assert state.lifetime.n == 80
+    assert state.last_date == daily.index[-1]
+    perf_close(state.lifetime, PerformanceReport(daily))
+    perf_close(state.rolling, PerformanceReport(daily.iloc[-20:]))
+
+
+def test_empty_performance_state_saves_valid_json(tmp_path):
+    import json
+    import math
+    from src.backtester import PerformanceState
+
+    path = str(tmp_path / "perf.json")
+    PerformanceState(window=20).save(path)
+    with open(path) as fh:
+        data = json.load(fh, parse_constant=lambda c: pytest.fail(f"non-JSON {c}"))
+    assert data["lifetime"]["peak"] is None and data["lifetime"]["trough"] is None
+
+    state = PerformanceState.load(path, window=20)
+    assert (state.lifetime.peak, state.lifetime.trough) == (-math.inf, math.inf)
+    state.update(pd.Series([0.01, -0.02], index=pd.bdate_range("2025-01-01", periods=2)))
+    assert state.lifetime.peak == pytest.approx(1.01)
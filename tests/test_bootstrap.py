@@ -0,0 +1,65 @@
+# tests/test_bootstrap.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtester import PerformanceReport
+from src.bootstrap import bootstrap, deflated_sharpe, resample_indices
+
+
+def make_returns(n=500, mu=0.0005, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.normal(mu, 0.01, n),
+                     index=pd.bdate_range("2020-01-01", periods=n))
+
+
+@pytest.mark.parametrize("method", ["stationary", "block"])
+def test_indices_follow_blocks(method):
+    idx = resample_indices(100, 50, 5, method, np.random.default_rng(0))
+    assert idx.shape == (50, 100)
+    assert idx.min() >= 0 and idx.max() < 100
+    # within a block the index advances by one (wrapping at the end)
+    steps = np.diff(idx, axis=1) % 100
+    assert np.mean(steps == 1) > 0.7
+
+
+def test_block_method_fixed_length():
+    idx = resample_indices(12, 3, 4, "block", np.random.default_rng(1))
+    for row in idx:
+        for block in row.reshape(3, 4):
+            assert np.array_equal(np.diff(block) % 12, [1, 1, 1])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        resample_indices(10, 1, 2, "iid")
+
+
+def test_point_estimates_match_report():
+    r = make_returns()
+    res = bootstrap(r, n_resamples=200, seed=0)
+    report = PerformanceReport(r)
+    assert res.point["sharpe"] == pytest.approx(report.sharpe)
+    assert res.point["max_drawdown"] == pytest.approx(report.max_drawdown)
+    lo, hi = res.ci("sharpe")
+    assert lo < res.point["sharpe"] < hi
+    assert len(res.samples["sharpe"]) == 200
+
+
+def test_chunks_and_jobs_do_not_change_result():
+    r = make_returns()
+    a = bootstrap(r, n_resamples=300, seed=7, chunk_size=100)
+    b = bootstrap(r, n_resamples=300, seed=7, chunk_size=100, n_jobs=2)
+    np.testing.assert_array_equal(a.samples["sharpe"], b.samples["sharpe"])
+    c = bootstrap(r, n_resamples=300, seed=8, chunk_size=100)
+    assert not np.array_equal(a.samples["sharpe"], c.samples["sharpe"])
+
+
+def test_deflated_sharpe_penalizes_trials():
+    r = make_returns(n=2000, mu=0.0008)
+    single = deflated_sharpe(r)
+    assert 0.9 < single <= 1.0
+    trials = np.random.default_rng(1).normal(0, 1.0, 200)
+    assert deflated_sharpe(r, 200, trials) < single
+    assert deflated_sharpe(-r) < 0.1
+    assert np.isnan(deflated_sharpe([0.01, 0.01, 0.01]))
@@ -1,6 +1,7 @@
 # tests/test_cleaner.py
 
 import pytest
+import numpy as np
 import pandas as pd
 from src.cleaner import DataCleaner
 
@@ -27,3 +28,50 @@ def test_clean_drops_and_fills(raw_df):
     # no NaNs remain, and all closes positive
     assert not clean.isna().any().any()
     assert (clean["Close"] > 0).all()
+
+
+def reference_clean(df):
+    """The original per-group lambda implementation."""
+    thresh = int(len(df.index.unique('Ticker')) * 0.95)
+    valid = df.reset_index().groupby('Date').apply(
+        lambda d: d['Close'].notna().sum() >= thresh)
+    df = df.loc[valid[valid].index]
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df.loc[df[col] <= 0, col] = np.nan
+    df = df.groupby('Ticker').apply(lambda x: x.ffill().bfill()).droplevel(0)
+    return df.dropna()
+
+
+@pytest.mark.parametrize("ragged", [False, True])
+def test_matches_reference_implementation(ragged):
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    tickers = [f"T{i:02d}" for i in range(40)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 50 + rng.standard_normal(len(idx)).cumsum() * 0.1
+    df = pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": rng.integers(0, 100, len(idx)).astype(float),
+    }, index=idx)
+    df = df.mask(rng.random(df.shape) < 0.02)
+    df.loc[(dates[10], slice(None)), "Close"] = np.nan  # date below 95%
+    df.loc[(slice(None), "T03"), :] = np.nan            # ticker with no data
+    df.loc[(dates[:5], "T07"), :] = np.nan              # late start
+    df.loc[(dates[20], "T09"), "Low"] = -1.0            # non-positive price
+    if ragged:
+        df = df.drop(df.sample(frac=0.05, random_state=0).index)
+        df = df.sample(frac=1, random_state=1)          # rows in any order
+
+    expected = reference_clean(df.copy())
+    result = DataCleaner().clean(df)
+    pd.testing.assert_frame_equal(result, expected)  # row order included
+    assert dates[10] not in result.index.get_level_values("Date")
+    assert "T03" not in result.index.get_level_values("Ticker")
+
+
+def test_input_is_not_modified(raw_df):
+    before = raw_df.copy()
+    raw_df.loc[raw_df.index[0], "Close"] = -5.0
+    before.loc[before.index[0], "Close"] = -5.0
+    DataCleaner().clean(raw_df)
+    pd.testing.assert_frame_equal(raw_df, before)
@@ -34,3 +34,29 @@ def test_reset_and_step(small_env):
     obs2, reward, done, info = small_env.step(action)
     assert isinstance(reward, float)
     assert 'pnl' in info and 'cost' in info
+
+
+def make_frames(n_days=10, tickers=("A", "B", "C")):
+    dates = pd.date_range("2025-01-01", periods=n_days, freq="B")
+    idx = pd.MultiIndex.from_product([dates, list(tickers)], names=["Date", "Ticker"])
+    price = np.linspace(100, 110, n_days).repeat(len(tickers))
+    price_df = pd.DataFrame({'Close': price}, index=idx)
+    feats = pd.DataFrame({'f': np.arange(len(idx), dtype=float)}, index=idx)
+    return price_df, feats
+
+
+def test_dates_without_features_are_skipped():
+    price_df, feats = make_frames()
+    dates = price_df.index.get_level_values("Date").unique()
+    env = DRLTradingEnv(price_df, feats.loc[dates[3]:])  # warm-up dropped
+    assert env.dates == list(dates[3:])
+    obs = env.reset()
+    np.testing.assert_array_equal(obs, feats.loc[dates[3], 'f'].to_numpy())
+    np.testing.assert_array_equal(env.prices[0], price_df.loc[dates[3], 'Close'])
+
+
+def test_missing_ticker_features_raise():
+    price_df, feats = make_frames()
+    feats = feats.drop("B", level="Ticker")
+    with pytest.raises(ValueError, match="B"):
+        DRLTradingEnv(price_df, feats)
@@ -0,0 +1,96 @@
+# tests/test_feature_store.py
+
+import os
+import numpy as np
+import pandas as pd
+from src.feature_store import FeatureStore
+from src.features import FeatureEngineer
+
+
+def make_prices(n_days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n_days)
+    tickers = ["AAA", "BBB"]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 100 + rng.normal(0, 1, len(idx)).cumsum()
+    return pd.DataFrame({"Close": close, "Volume": 1000.0}, index=idx)
+
+
+def test_hit_after_miss(tmp_path):
+    store = FeatureStore(root=str(tmp_path))
+    df = make_prices()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return df * 2
+
+    first = store.get_or_compute(df, {"w": 5}, compute)
+    second = store.get_or_compute(df, {"w": 5}, compute)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_key_depends_on_data_and_params():
+    df = make_prices()
+    base = FeatureStore.key(df, {"w": 5})
+    assert FeatureStore.key(df.copy(), {"w": 5}) == base
+    assert FeatureStore.key(df, {"w": 6}) != base
+    changed = df.copy()
+    changed.iloc[-1, 0] += 1e-6
+    assert FeatureStore.key(changed, {"w": 5}) != base
+
+
+def test_memory_lru_eviction():
+    store = FeatureStore(root="", max_items=2)
+    frames = [make_prices(seed=i) for i in range(3)]
+    keys = [store.key(f, {}) for f in frames]
+    store.put(keys[0], frames[0])
+    store.put(keys[1], frames[1])
+    assert store.get(keys[0]) is not None  # keys[1] is now least recent
+    store.put(keys[2], frames[2])
+    assert store.get(keys[1]) is None
+    assert store.get(keys[0]) is not None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    df = make_prices()
+    key = FeatureStore.key(df, {})
+    FeatureStore(root=str(tmp_path)).put(key, df)
+    fresh = FeatureStore(root=str(tmp_path))
+    pd.testing.assert_frame_equal(fresh.get(key), df, check_freq=False)
+    assert fresh.hits == 1
+
+
+def test_disk_size_cap_evicts_least_recently_used(tmp_path):
+    frames = [make_prices(seed=i) for i in range(3)]
+    probe = FeatureStore(root=str(tmp_path / "probe"))
+    probe.put("x", frames[0])
+    size = os.path.getsize(tmp_path / "probe" / "x.parquet")
+
+    root = tmp_path / "s"
+    store = FeatureStore(root=str(root), max_bytes=int(size * 2.5))
+    for i, f in enumerate(frames[:2]):
+        store.put(f"k{i}", f)
+        os.utime(root / f"k{i}.parquet", (i + 1, i + 1))
+    assert FeatureStore(root=str(root)).get("k0") is not None  # k1 is now oldest
+    store.put("k2", frames[2])
+    assert sorted(os.listdir(root)) == ["k0.parquet", "k2.parquet"]
+
+
+def test_default_store_stays_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    FeatureEngineer(store=FeatureStore()).build_features(make_prices(n_days=80))
+    assert os.listdir(tmp_path) == []
+
+
+def test_feature_engineer_uses_store():
+    store = FeatureStore(root="")
+    df = make_prices(n_days=80)
+    fe = FeatureEngineer(store=store)
+    a = fe.build_features(df)
+    b = fe.build_features(df)
+    pd.testing.assert_frame_equal(a, b)
+    pd.testing.assert_frame_equal(a, FeatureEngineer().build_features(df))
+    assert store.hits == 1
@@ -3,7 +3,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.features import FeatureEngineer
+from src.features import FeatureEngineer, StreamingFeatures
 
 
 def test_build_features():
@@ -25,3 +25,127 @@ def test_build_features():
     for col in ['5d_mom', '20d_mom', '20d_vol', 'rsi', 'tsi']:
         assert col in feats.columns
     assert not feats.isna().any().any()
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(4)
+    dates = pd.bdate_range("2024-01-01", periods=90)
+    tickers = ["A", "B", "C", "D"]
+    idx = pd.MultiIndex.from_product(
+        [dates, tickers], names=["Date", "Ticker"])
+    close = 50 + rng.normal(0, 1, (len(dates), len(tickers))).cumsum(0)
+    df = pd.DataFrame({"Close": close.reshape(-1)}, index=idx)
+    # D lists late
+    return df.drop(index=[(d, "D") for d in dates[:40]])
+
+
+def test_streaming_matches_full_recompute(history, tmp_path):
+    dates = history.index.unique("Date")
+    full = FeatureEngineer().build_features(history)
+
+    state = StreamingFeatures()
+    warm = state.update(history[history.index.get_level_values("Date") < dates[60]])
+    state.save(str(tmp_path / "features.npz"))
+
+    # next runs: reload the state and feed one new bar at a time
+    rows = [warm]
+    for d in dates[60:]:
+        state = StreamingFeatures.load(str(tmp_path / "features.npz"))
+        rows.append(state.update(history.loc[[d]]))
+        state.save(str(tmp_path / "features.npz"))
+    streamed = pd.concat(rows)
+
+    pd.testing.assert_frame_equal(streamed, full, rtol=1e-9)
+    assert state.verify(history)
+
+
+def test_streaming_ignores_already_seen_dates(history):
+    state = StreamingFeatures()
+    state.update(history)
+    assert state.update(history).empty
+
+
+def test_verify_detects_drift(history):
+    state = StreamingFeatures()
+    state.update(history)
+    state.e2[0] += 1.0
+    assert not state.verify(history)
+
+
+def test_load_rejects_other_parameters(history, tmp_path):
+    state = StreamingFeatures()
+    state.update(history)
+    state.save(str(tmp_path / "features.npz"))
+    with pytest.raises(ValueError):
+        StreamingFeatures.load(str(tmp_path / "features.npz"),
+                               FeatureEngineer(rsi_window=7))
+
+
+def test_subset_computes_only_dependencies(history):
+    fe = FeatureEngineer()
+    calls = []
+    for name, spec in list(fe.registry.items()):
+        fe.register(name, spec.inputs, spec.lookback,
+                    lambda *a, _f=spec.fn, _n=name: calls.append(_n) or _f(*a))
+    sub = fe.build_features(history, ["5d_mom", "rsi"])
+    assert sorted(calls) == ["5d_mom", "rsi"]
+    assert "tsi" not in sub.columns
+    # rows only drop for the requested columns' warm-up
+    full = FeatureEngineer().build_features(history)
+    pd.testing.assert_frame_equal(
+        sub.loc[full.index, ["5d_mom", "rsi"]], full[["5d_mom", "rsi"]])
+    assert len(sub) > len(full)
+
+
+def test_derived_feature_dependencies(history):
+    fe = FeatureEngineer()
+    fe.register("mom_spread", ["5d_mom", "20d_mom"], 0, lambda a, b: a - b)
+    assert fe.resolve(["mom_spread"]) == ["5d_mom", "20d_mom", "mom_spread"]
+    assert fe.lookback(["mom_spread"]) == 20
+    feats = fe.build_features(history, ["mom_spread"])
+    expected = FeatureEngineer().build_features(history, ["5d_mom", "20d_mom"])
+    pd.testing.assert_series_equal(
+        feats["mom_spread"], expected["5d_mom"] - expected["20d_mom"],
+        check_names=False)
+    with pytest.raises(KeyError):
+        fe.resolve(["nope"])
+    fe.register("loop", ["loop2"], 0, lambda x: x)
+    fe.register("loop2", ["loop"], 0, lambda x: x)
+    with pytest.raises(ValueError):
+        fe.resolve(["loop"])
+
+
+def test_lookback_history_is_enough():
+    rng = np.random.default_rng(9)
+    dates = pd.bdate_range("2020-01-01", periods=600)
+    idx = pd.MultiIndex.from_product([dates, ["A", "B"]], names=["Date", "Ticker"])
+    close = 100 * np.exp(rng.normal(0, 0.02, (len(dates), 2)).cumsum(0))
+    df = pd.DataFrame({"Close": close.reshape(-1)}, index=idx)
+
+    fe = FeatureEngineer()
+    full = fe.build_features(df).xs(dates[-1], level="Date")
+    for col in fe.registry:
+        n = fe.lookback([col]) + 1
+        short = fe.build_features(df.loc[dates[-n]:], [col]).xs(dates[-1], level="Date")
+        np.testing.assert_allclose(short[col], full[col], rtol=1e-2, atol=0.1)
+
+
+def test_sharded_matches_serial(history):
+    serial = FeatureEngineer().build_features(history)
+    fe = FeatureEngineer(n_jobs=2)
+    pd.testing.assert_frame_equal(fe.build_features(history), serial)
+
+    fe.register("mom_spread", ["5d_mom", "20d_mom"], 0, lambda a, b: a - b)
+    feats = fe.build_features(history, ["mom_spread", "tsi"])
+    np.testing.assert_array_equal(feats["tsi"], serial["tsi"].reindex(feats.index))
+    assert "mom_spread" in feats
+
+
+def test_sharded_accepts_float32():
+    close = 100 + np.random.default_rng(3).standard_normal((60, 8)).cumsum(axis=0)
+    close = close.astype(np.float32)
+    serial = FeatureEngineer().compute(close)
+    sharded = FeatureEngineer(n_jobs=2).compute(close)
+    for name, values in serial.items():
+        np.testing.assert_array_equal(sharded[name], values)
@@ -1,8 +1,10 @@
 # tests/test_fetcher.py
 
+import threading
+import time
 import pytest
 import pandas as pd
-from src.fetcher import DataFetcher
+from src.fetcher import DataFetcher, TokenBucket
 
 
 @pytest.fixture
@@ -27,3 +29,76 @@ def test_no_nans_after_fill(df):
 def test_positive_prices(df):
     assert (df[['Open', 'High', 'Low', 'Close']] > 0).all().all()
     assert (df['Volume'] >= 0).all()
+
+
+class StubDownload:
+    """Local stand-in for yfinance: flaky tickers fail a few times first."""
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, sym, start, end):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if self.failures.get(sym, 0) > 0:
+                self.failures[sym] -= 1
+                raise ConnectionError("transient")
+            days = pd.bdate_range(start, end, inclusive="left")
+            return pd.DataFrame({
+                "Open": 10.0, "High": 10.0, "Low": 10.0,
+                "Close": 10.0, "Volume": 1,
+            }, index=pd.DatetimeIndex(days, name="Date"))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def make_fetcher(monkeypatch, stub, **kwargs):
+    f = DataFetcher(cache_dir="", backoff=0.0, **kwargs)
+    monkeypatch.setattr(f, "_download", stub)
+    return f
+
+
+def test_concurrent_fetch_bounds_in_flight(monkeypatch):
+    stub = StubDownload(delay=0.02)
+    tickers = [f"T{i}" for i in range(12)]
+    f = make_fetcher(monkeypatch, stub, max_workers=3, rate_limit=0)
+    df = f.fetch_daily(tickers, "2025-01-02", "2025-01-10")
+    assert stub.max_in_flight == 3
+    assert set(df.index.get_level_values("Ticker")) == set(tickers)
+
+
+def test_retry_then_skip_and_warn(monkeypatch, caplog):
+    stub = StubDownload(failures={"FLAKY": 2, "DEAD": 99})
+    f = make_fetcher(monkeypatch, stub, max_workers=4,
+                     rate_limit=0, max_retries=2)
+    df = f.fetch_daily(["OK", "FLAKY", "DEAD"], "2025-01-02", "2025-01-10")
+    # FLAKY recovers on its last retry, DEAD is skipped and then backfilled
+    assert stub.failures["FLAKY"] == 0
+    assert "Skipping DEAD" in caplog.text
+    assert "Skipping FLAKY" not in caplog.text
+    assert df.xs("DEAD", level="Ticker")["Close"].isna().all()
+
+
+def test_rows_are_grouped_by_ticker(monkeypatch):
+    f = make_fetcher(monkeypatch, StubDownload(), rate_limit=0)
+    df = f.fetch_daily(["ZZ", "AA"], "2025-01-02", "2025-01-10")
+    tickers = df.index.get_level_values("Ticker")
+    assert list(tickers[:len(df) // 2].unique()) == ["AA"]
+    assert df.index.equals(df.sort_index(level=["Ticker", "Date"]).index)
+
+
+def test_token_bucket_throttles():
+    bucket = TokenBucket(rate=50, capacity=1)
+    t0 = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # first token is free, the next five wait ~1/50s each
+    assert time.monotonic() - t0 >= 5 / 50 * 0.9
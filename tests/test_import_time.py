@@ -0,0 +1,46 @@
+# tests/test_import_time.py
+
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# heavy dependencies that must only load on first use
+LAZY = [
+    "torch", "stable_baselines3", "ta", "yfinance", "pandas_market_calendars",
+    "prometheus_client", "requests", "alpaca_trade_api", "sklearn", "gym",
+]
+
+# import cost of src.main on top of pandas/numpy (which it always needs)
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", 250))
+
+
+def run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def cumulative_us(stderr, module):
+    for line in stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$", line)
+        if m and m.group(3) == module:
+            return int(m.group(1))
+    return 0
+
+
+def test_heavy_dependencies_are_lazy():
+    out = run("import sys, src.main; print(' '.join(sorted(sys.modules)))").stdout
+    loaded = set(out.split())
+    assert [m for m in LAZY if m in loaded] == []
+
+
+def test_src_main_import_time_budget():
+    # best of a few runs to damp scheduler noise
+    costs = []
+    for _ in range(3):
+        err = run("import src.main", "-X", "importtime").stderr
+        costs.append(cumulative_us(err, "src.main") - cumulative_us(err, "pandas"))
+    assert min(costs) / 1000 < BUDGET_MS
@@ -0,0 +1,85 @@
+# tests/test_indicators.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from ta.momentum import RSIIndicator, TSIIndicator
+from ta.volatility import AverageTrueRange
+from src.panel import PricePanel
+from src.indicators import atr, momentum, rolling_std, rsi, tsi
+
+
+@pytest.fixture(params=[False, True], ids=["dense", "ragged"])
+def close_df(request):
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2023-01-02", periods=120)
+    tickers = [f"T{i}" for i in range(8)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    steps = rng.normal(0, 1, (len(dates), len(tickers)))
+    steps[5:9, 2] = 0.0  # flat stretch: zero moves
+    close = 100 + steps.cumsum(0)
+    df = pd.DataFrame({"Close": close.reshape(-1)}, index=idx)
+    if request.param:
+        # late listing for T1, random missing rows elsewhere
+        df = df.drop(index=[(d, "T1") for d in dates[:30]])
+        df = df.drop(df.sample(frac=0.03, random_state=1).index)
+    return df
+
+
+def per_ticker(df, fn):
+    return df.groupby("Ticker", group_keys=False)["Close"].apply(fn)
+
+
+def check(df, arr, expected):
+    panel = PricePanel.from_frame(df)
+    got = pd.Series(arr.ravel().take(panel.flat_positions(df.index)), index=df.index)
+    expected = expected.reindex(df.index)
+    np.testing.assert_array_equal(got.isna(), expected.isna())
+    np.testing.assert_allclose(got.dropna(), expected.dropna(), rtol=1e-9, atol=1e-9)
+
+
+def test_momentum(close_df):
+    close = PricePanel.from_frame(close_df)["Close"]
+    for n in (1, 5, 20):
+        check(close_df, momentum(close, n),
+              per_ticker(close_df, lambda x: x.pct_change(n)))
+
+
+def test_rolling_std(close_df):
+    close = PricePanel.from_frame(close_df)["Close"]
+    check(close_df, rolling_std(close, 20),
+          per_ticker(close_df, lambda x: x.rolling(20).std()))
+
+
+def test_rsi_matches_ta(close_df):
+    close = PricePanel.from_frame(close_df)["Close"]
+    for w in (3, 14):
+        check(close_df, rsi(close, w),
+              per_ticker(close_df, lambda x: RSIIndicator(x, window=w).rsi()))
+
+
+def test_tsi_matches_ta(close_df):
+    close = PricePanel.from_frame(close_df)["Close"]
+    check(close_df, tsi(close, 25, 13),
+          per_ticker(close_df,
+                     lambda x: TSIIndicator(x, window_slow=25, window_fast=13).tsi()))
+
+
+def test_atr_matches_ta(close_df):
+    df = close_df.assign(High=close_df["Close"] + 1.5 + np.sin(np.arange(len(close_df))),
+                         Low=close_df["Close"] - 1.0)
+    panel = PricePanel.from_frame(df)
+
+    def ta_atr(g):
+        a = AverageTrueRange(g["High"], g["Low"], g["Close"], window=14).average_true_range()
+        return pd.Series(a.to_numpy(), index=g.index).where(np.arange(len(g)) >= 13)
+
+    expected = df.groupby("Ticker", group_keys=False).apply(ta_atr)
+    check(df, atr(panel["High"], panel["Low"], panel["Close"], 14), expected)
+
+
+def test_short_history_is_all_nan():
+    close = np.arange(1.0, 11.0).reshape(10, 1)
+    assert np.isnan(tsi(close, 25, 13)).all()
+    assert np.isnan(rolling_std(close, 20)).all()
+    assert np.isnan(atr(close, close, close, 14)).all()
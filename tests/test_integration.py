@@ -26,6 +26,13 @@ class DummyMinuteFetcher:
         return pd.DataFrame()
 
 
+@pytest.fixture(autouse=True)
+def isolate_state(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "SIGNAL_STORE_DIR", str(tmp_path / "signals"))
+    monkeypatch.setattr(main, "FEATURE_STATE_PATH", str(tmp_path / "state" / "features.npz"))
+    monkeypatch.setattr(main, "PERF_STATE_PATH", str(tmp_path / "state" / "performance.json"))
+
+
 @pytest.fixture(autouse=True)
 def patch_components(monkeypatch):
     from src.fetcher import DataFetcher
@@ -1,21 +1,39 @@
 # tests/test_intraday_backtester.py
 
+import pickle
+import tracemalloc
+import numpy as np
 import pandas as pd
 import pytest
-from src.intraday_backtester import IntradayBacktester
+from ta.volatility import AverageTrueRange
+from src import intraday_backtester as ib
+from src.atr_table import ATRTable
+from src.intraday_backtester import IntradayBacktester, partition_minutes
+from src.minute_store import MinuteStore
 
 
 @pytest.fixture
 def simple_data():
     date = pd.Timestamp('2025-01-02')
     tickers = ['A', 'B']
+    # 14 prior days: A trades in a 1-point range (ATR 1), B in a 20-point one
+    hist = pd.bdate_range(end='2024-12-31', periods=14)
+    idx_hist = pd.MultiIndex.from_product(
+        [hist, tickers], names=['Date', 'Ticker'])
     idx = pd.MultiIndex.from_product(
         [[date], tickers], names=['Date', 'Ticker'])
-    daily = pd.DataFrame({
-        'High':  [110, 120],
-        'Low':   [90, 100],
-        'Close': [105, 115],
-    }, index=idx)
+    daily = pd.concat([
+        pd.DataFrame({
+            'High':  [95.5, 120] * len(hist),
+            'Low':   [94.5, 100] * len(hist),
+            'Close': [95, 115] * len(hist),
+        }, index=idx_hist),
+        pd.DataFrame({
+            'High':  [110, 120],
+            'Low':   [90, 100],
+            'Close': [105, 115],
+        }, index=idx),
+    ])
 
     times = pd.date_range('2025-01-02 09:30', '2025-01-02 09:31', freq='1min')
     rows = []
@@ -34,7 +52,206 @@ def test_intraday_stop_and_eod(simple_data):
     w, daily, md = simple_data
     bt = IntradayBacktester(slippage=0.001, commission=0.001)
     ret = bt.run_intraday(w, daily, md)
-    # For A: stop from 95→92 = -0.03158, cost=0.002 ⇒ ≈ -0.03358
-    # For B: flat 0 return, cost=0.002 ⇒ -0.002
-    # total ≈ -0.03558
-    assert pytest.approx(ret.iloc[0], rel=1e-3) == -0.03558
+    # For A: stop from 95→92 = -0.03158, cost=2×0.002 ⇒ ≈ -0.03558
+    # For B: flat 0 return, cost=2×0.002 ⇒ -0.004
+    # total ≈ -0.03958 (entry and exit are both charged)
+    assert pytest.approx(ret.iloc[0], rel=1e-3) == -0.03958
+
+
+def test_atr_ignores_same_day_bar(simple_data):
+    w, daily, md = simple_data
+    bt = IntradayBacktester(slippage=0.0, commission=0.0)
+    atr = bt.causal_atr(daily, pd.DatetimeIndex(['2025-01-02']))
+    assert atr.loc['2025-01-02', 'A'] == pytest.approx(1.0)
+    # without 14 prior bars there is no stop: A rides to the close
+    short = daily[daily.index.get_level_values('Date') >= '2024-12-31']
+    assert bt.run_intraday(w, short, md).iloc[0] == pytest.approx(0.0)
+
+
+def make_market(n_hist=30, n_days=4, tickers=('A', 'B', 'C'), seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-01', periods=n_hist + n_days)
+    idx = pd.MultiIndex.from_product([dates, tickers], names=['Date', 'Ticker'])
+    close = 100 + rng.normal(0, 1, len(idx)).cumsum()
+    daily = pd.DataFrame({
+        'High': close + rng.uniform(0, 1.5, len(idx)),
+        'Low': close - rng.uniform(0, 1.5, len(idx)),
+        'Close': close,
+    }, index=idx)
+
+    rows = []
+    for d in dates[n_hist:]:
+        for t in tickers:
+            px = 100 + rng.normal(0, 0.3, 30).cumsum()
+            for i, time in enumerate(pd.date_range(d + pd.Timedelta('9h30min'),
+                                                   periods=30, freq='1min')):
+                rows.append({'Datetime': time, 'Ticker': t,
+                             'Low': px[i] - rng.uniform(0, 2), 'Close': px[i]})
+    minutes = pd.DataFrame(rows).set_index(['Datetime', 'Ticker'])
+    minutes = minutes.sample(frac=0.9, random_state=seed)  # ragged, unsorted
+
+    w_idx = pd.MultiIndex.from_product([dates[n_hist:], tickers],
+                                       names=['Date', 'Ticker'])
+    weights = pd.Series(rng.choice([-1.0, 0.0, 0.5, 1.0], len(w_idx)), index=w_idx)
+    return weights, daily, minutes
+
+
+def reference_intraday(bt, weights, daily, minutes):
+    """Per-date, per-minute loop with the causal ATR, as a spec."""
+    fee = bt.slippage + bt.commission
+    day_of = minutes.index.get_level_values('Datetime').normalize()
+    out = {}
+    for date, w in weights.unstack('Ticker').iterrows():
+        day = minutes[day_of == date].sort_index()
+        entry = day.groupby('Ticker')['Close'].first()
+        pnl = cost = 0.0
+        for t, wgt in w.fillna(0).items():
+            if wgt == 0 or t not in entry.index:
+                continue
+            hist = daily.xs(t, level='Ticker')
+            hist = hist[hist.index < date]
+            stop = -np.inf
+            if len(hist) >= bt.atr_window:
+                a = AverageTrueRange(hist['High'], hist['Low'], hist['Close'],
+                                     window=bt.atr_window).average_true_range()
+                stop = entry[t] - bt.atr_mult * a.iloc[-1]
+            exit_px = day.xs(t, level='Ticker')['Close'].iloc[-1]
+            for _, bar in day.xs(t, level='Ticker').iterrows():
+                if bar['Low'] <= stop:
+                    exit_px = stop
+                    break
+            pnl += wgt * (exit_px - entry[t]) / entry[t]
+            cost += 2 * abs(wgt) * fee
+        out[date] = pnl - cost
+    return pd.Series(out)
+
+
+def test_matches_reference_loop():
+    weights, daily, minutes = make_market()
+    bt = IntradayBacktester(slippage=0.0005, commission=0.0005, atr_mult=1.0)
+    got = bt.run_intraday(weights, daily, minutes)
+    expected = reference_intraday(bt, weights, daily, minutes)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert (got != -2 * 0.001 * weights.abs().groupby('Date').sum()).any()
+
+
+def test_missing_day_and_ticker():
+    weights, daily, minutes = make_market()
+    days = minutes.index.get_level_values('Datetime').normalize()
+    last = days.max()
+    keep = ~((days == last) | (minutes.index.get_level_values('Ticker') == 'C'))
+    bt = IntradayBacktester(slippage=0.001, commission=0.0)
+    got = bt.run_intraday(weights, daily, minutes[keep])
+    assert got.loc[last] == 0.0
+    expected = reference_intraday(bt, weights, daily, minutes[keep])
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_partition_minutes_days():
+    _, _, minutes = make_market(n_days=3)
+    parts = partition_minutes(minutes)
+    assert len(parts.days) == 3
+    assert parts.starts[0] == 0 and np.all(np.diff(parts.starts) == 30)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_store_backed_matches_frame(tmp_path, n_jobs):
+    weights, daily, minutes = make_market(n_days=5)
+    store = MinuteStore(str(tmp_path))
+    store.write(minutes)
+    bt = IntradayBacktester(slippage=0.0005, commission=0.0005, atr_mult=1.0,
+                            n_jobs=n_jobs)
+    expected = bt.run_intraday(weights, daily, minutes)
+    got = bt.run_intraday(weights, daily, store)
+    pd.testing.assert_index_equal(got.index, expected.index)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_store_workers_do_not_receive_atr_table(tmp_path, monkeypatch):
+    weights, daily, minutes = make_market(n_days=5)
+    store = MinuteStore(str(tmp_path))
+    store.write(minutes)
+    sent = []
+
+    class InlinePool:
+        def __init__(self, max_workers):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, *iterables, chunksize=1):
+            for args in zip(*iterables):
+                sent.append(pickle.dumps(args))
+                yield fn(*pickle.loads(sent[-1]))
+
+    monkeypatch.setattr(ib, 'ProcessPoolExecutor', InlinePool)
+    bt = IntradayBacktester(slippage=0.0005, commission=0.0005, atr_mult=1.0,
+                            n_jobs=2, atr_table=ATRTable(14))
+    got = bt.run_intraday(weights, daily, store)
+    expected = bt.run_intraday(weights, daily, minutes)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert sent and all(b'ATRTable' not in s for s in sent)
+
+
+def test_store_missing_day_returns_zero(tmp_path):
+    weights, daily, minutes = make_market(n_days=3)
+    days = minutes.index.get_level_values('Datetime').normalize()
+    store = MinuteStore(str(tmp_path))
+    store.write(minutes[days != days.max()])
+    got = IntradayBacktester(0.001, 0.0).run_intraday(weights, daily, store)
+    assert got.loc[days.max()] == 0.0
+    assert (got.drop(days.max()) != 0).all()
+
+
+def minute_partitions(minutes):
+    days = minutes.index.get_level_values('Datetime').normalize()
+    for day in days.unique().sort_values():
+        yield minutes[days == day]
+
+
+def test_run_stream_matches_run_intraday(tmp_path):
+    weights, daily, minutes = make_market(n_days=5)
+    bt = IntradayBacktester(slippage=0.0005, commission=0.0005, atr_mult=1.0)
+    expected = bt.run_intraday(weights, daily, minutes)
+    got = bt.run_stream(weights, daily, minute_partitions(minutes))
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    store = MinuteStore(str(tmp_path))
+    store.write(minutes)
+    from_store = bt.run_stream(weights, daily, store.iter_days())
+    np.testing.assert_allclose(from_store.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_run_stream_rejects_out_of_order():
+    weights, daily, minutes = make_market(n_days=3)
+    parts = list(minute_partitions(minutes))[::-1]
+    with pytest.raises(ValueError):
+        IntradayBacktester(0.0, 0.0).run_stream(weights, daily, parts)
+
+
+def test_run_stream_memory_is_flat():
+    def peak(n_days):
+        weights, daily, _ = make_market(n_hist=20, n_days=n_days, tickers=list('ABCDEFGH'))
+        days = weights.index.unique('Date')
+        rng = np.random.default_rng(0)
+
+        def parts():
+            for d in days:
+                times = pd.date_range(d + pd.Timedelta('9h30min'), periods=390, freq='1min')
+                idx = pd.MultiIndex.from_product([times, list('ABCDEFGH')],
+                                                 names=['Datetime', 'Ticker'])
+                px = 100 + rng.normal(0, 0.1, len(idx))
+                yield pd.DataFrame({'Low': px - 0.5, 'Close': px}, index=idx)
+
+        bt = IntradayBacktester(0.0, 0.0)
+        tracemalloc.start()
+        bt.run_stream(weights, daily, parts())
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return top
+
+    assert peak(40) < 1.5 * peak(5)
@@ -0,0 +1,39 @@
+# tests/test_minute_store.py
+
+import numpy as np
+import pandas as pd
+from src.minute_store import MinuteStore
+
+
+def make_minutes(days, tickers=("A", "B"), tz=None):
+    times = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{d} 09:30", periods=3, freq="1min", tz=tz) for d in days]))
+    idx = pd.MultiIndex.from_product([times, tickers], names=["Datetime", "Ticker"])
+    return pd.DataFrame({"Low": np.arange(len(idx), dtype=float),
+                         "Close": np.arange(len(idx), dtype=float) + 1}, index=idx)
+
+
+def test_write_partitions_by_day(tmp_path):
+    store = MinuteStore(str(tmp_path))
+    df = make_minutes(["2025-01-02", "2025-01-03"])
+    written = store.write(df)
+    assert list(written) == list(pd.to_datetime(["2025-01-02", "2025-01-03"]))
+    assert list(store.dates()) == list(written)
+    day = store.read_day("2025-01-03")
+    pd.testing.assert_frame_equal(day, df.iloc[6:], check_freq=False)
+
+
+def test_rewrite_replaces_day_and_missing_is_none(tmp_path):
+    store = MinuteStore(str(tmp_path))
+    store.write(make_minutes(["2025-01-02"]))
+    store.write(make_minutes(["2025-01-02"], tickers=("C",)))
+    assert set(store.read_day("2025-01-02").index.get_level_values("Ticker")) == {"C"}
+    assert store.read_day("2025-01-06") is None
+    assert MinuteStore(str(tmp_path / "nope")).dates().empty
+
+
+def test_tz_aware_bars_keyed_by_wall_clock_day(tmp_path):
+    store = MinuteStore(str(tmp_path))
+    store.write(make_minutes(["2025-01-02"], tz="UTC"))
+    assert list(store.dates()) == [pd.Timestamp("2025-01-02")]
+    assert store.read_day("2025-01-02").index.get_level_values("Datetime").tz is not None
@@ -0,0 +1,71 @@
+# tests/test_panel.py
+
+import pytest
+import pandas as pd
+import numpy as np
+from src.panel import PricePanel, as_panel
+from src.cleaner import DataCleaner
+from src.env import DRLTradingEnv
+
+
+@pytest.fixture
+def long_df():
+    dates = pd.bdate_range("2025-01-01", periods=6)
+    tickers = ["A", "B", "C"]
+    idx = pd.MultiIndex.from_product(
+        [dates, tickers], names=["Date", "Ticker"])
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(len(idx)).cumsum()
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": 1000.0,
+    }, index=idx)
+
+
+def test_roundtrip_is_zero_copy(long_df):
+    panel = PricePanel.from_frame(long_df)
+    assert panel.shape == (6, 3)
+    assert np.shares_memory(panel["Close"], long_df["Close"].to_numpy())
+
+    back = panel.to_frame()
+    pd.testing.assert_frame_equal(back, long_df)
+    assert np.shares_memory(back["Close"].to_numpy(), panel["Close"])
+
+
+def test_axis_layout_and_index_maps(long_df):
+    panel = PricePanel.from_frame(long_df)
+    d, t = pd.Timestamp("2025-01-03"), "B"
+    assert panel["Close"][panel.date_loc(d), panel.ticker_loc(t)] == \
+        long_df.loc[(d, t), "Close"]
+
+
+def test_ragged_frame_is_padded_with_nan(long_df):
+    # B starts two days late, A's first bar is missing
+    b_rows = long_df.xs("B", level="Ticker", drop_level=False).iloc[2:]
+    ragged = pd.concat([long_df.drop(index="B", level="Ticker").iloc[1:], b_rows])
+    panel = PricePanel.from_frame(ragged)
+    assert panel.shape == (6, 3)
+    assert np.isnan(panel["Close"][:2, panel.ticker_loc("B")]).all()
+    assert np.isnan(panel["Close"][0, panel.ticker_loc("A")])
+    back = panel.to_frame(dropna=True)
+    pd.testing.assert_frame_equal(back, ragged.sort_index())
+
+
+def test_stages_accept_panel(long_df):
+    panel = as_panel(long_df)
+    pd.testing.assert_frame_equal(
+        DataCleaner().clean(panel), DataCleaner().clean(long_df))
+
+    feats = long_df[["Close", "Volume"]] * 2
+    env_df = DRLTradingEnv(long_df, feats)
+    env_panel = DRLTradingEnv(panel, as_panel(feats))
+    np.testing.assert_array_equal(env_df.reset(), env_panel.reset())
+    # observation keeps the feature-major layout of feature_df.unstack()
+    expected = feats.unstack("Ticker").iloc[0].values.astype(np.float32)
+    np.testing.assert_array_equal(env_df.reset(), expected)
+
+
+def test_shape_mismatch_raises(long_df):
+    panel = PricePanel.from_frame(long_df)
+    with pytest.raises(ValueError):
+        panel["bad"] = np.zeros((2, 2))
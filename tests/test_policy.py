@@ -0,0 +1,69 @@
+# tests/test_policy.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import gymnasium
+from gymnasium import spaces
+from stable_baselines3 import SAC
+
+from src.policy import NumpyPolicy, export_sac_actor, load_policy, policy_path
+from src.strategy import StrategyEngine
+
+
+class FlatEnv(gymnasium.Env):
+    def __init__(self, obs_dim, n_actions):
+        self.observation_space = spaces.Box(-np.inf, np.inf, (obs_dim,), np.float32)
+        self.action_space = spaces.Box(-1.0, 1.0, (n_actions,), np.float32)
+
+    def reset(self, seed=None, options=None):
+        return np.zeros(self.observation_space.shape, np.float32), {}
+
+    def step(self, action):
+        return self.reset()[0], 0.0, True, False, {}
+
+
+@pytest.fixture
+def sac_zip(tmp_path):
+    model = SAC("MlpPolicy", FlatEnv(4 * 3, 3), seed=0,
+                policy_kwargs={"net_arch": [16, 16]}, device="cpu")
+    path = str(tmp_path / "sac_trader.zip")
+    model.save(path)
+    return path
+
+
+def test_numpy_actor_matches_sac(sac_zip):
+    npz = export_sac_actor(sac_zip)
+    assert npz == policy_path(sac_zip)
+    policy = NumpyPolicy.load(npz)
+    model = SAC.load(sac_zip, device="cpu")
+
+    obs = np.random.default_rng(0).normal(0, 2, (50, 12)).astype(np.float32)
+    expected, _ = model.predict(obs, deterministic=True)
+    np.testing.assert_allclose(policy.act(obs), expected, atol=1e-5)
+    single, _ = policy.predict(obs[0])
+    assert single.shape == (3,)
+
+
+def test_load_policy_prefers_export(sac_zip, tmp_path):
+    assert isinstance(load_policy(sac_zip), SAC)
+    export_sac_actor(sac_zip)
+    assert isinstance(load_policy(sac_zip), NumpyPolicy)
+    assert load_policy(str(tmp_path / "missing.zip")) is None
+
+
+def test_batched_overlay_matches_per_date(sac_zip):
+    export_sac_actor(sac_zip)
+    rng = np.random.default_rng(1)
+    dates = pd.bdate_range("2025-01-01", periods=6)
+    idx = pd.MultiIndex.from_product([dates, ["A", "B", "C"]], names=["Date", "Ticker"])
+    feats = pd.DataFrame(rng.normal(0, 1, (len(idx), 4)),
+                         index=idx, columns=["5d_mom", "20d_mom", "rsi", "tsi"])
+    feats["rsi"] = feats["rsi"] * 20 + 50
+
+    se = StrategyEngine(drl_model_path=sac_zip)
+    blended = se.generate_signals(feats, feats, drl_history=True)
+    for d in dates:
+        last_only = se.generate_signals(feats, feats.loc[:d])
+        np.testing.assert_allclose(
+            blended.xs(d, level="Date"), last_only.xs(d, level="Date"), atol=1e-6)
@@ -0,0 +1,73 @@
+# tests/test_price_cache.py
+
+import pytest
+import pandas as pd
+from src.fetcher import DataFetcher
+from src.price_cache import PriceCache
+
+
+class StubSource:
+    """Deterministic stand-in for yfinance that records every request."""
+
+    def __init__(self, scale: float = 1.0):
+        self.calls = []
+        self.scale = scale
+
+    def __call__(self, sym, start, end):
+        self.calls.append((sym, start, end))
+        days = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        close = [self.scale * (100 + d.dayofyear) for d in days]
+        df = pd.DataFrame({
+            "Open": close, "High": close, "Low": close,
+            "Close": close, "Volume": 1000,
+        }, index=pd.DatetimeIndex(days, name="Date"))
+        return df
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    f = DataFetcher(cache_dir=str(tmp_path))
+    src = StubSource()
+    monkeypatch.setattr(f, "_download", src)
+    return f, src
+
+
+def test_second_fetch_is_served_from_cache(fetcher):
+    f, src = fetcher
+    first = f.fetch_daily(["AAA"], "2024-01-02", "2024-03-01")
+    n_calls = len(src.calls)
+    second = f.fetch_daily(["AAA"], "2024-01-02", "2024-03-01")
+    assert len(src.calls) == n_calls
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_only_missing_range_is_downloaded(fetcher):
+    f, src = fetcher
+    f.fetch_daily(["AAA"], "2024-01-02", "2024-03-01")
+    src.calls.clear()
+    df = f.fetch_daily(["AAA"], "2024-01-02", "2024-04-01")
+    # one forward request, starting on the last cached bar
+    assert src.calls == [("AAA", "2024-02-29", "2024-04-01")]
+    closes = df.xs("AAA", level="Ticker")["Close"]
+    assert closes.loc["2024-03-28"] == 100 + pd.Timestamp("2024-03-28").dayofyear
+
+
+def test_readjusted_history_refreshes_cache(fetcher):
+    f, src = fetcher
+    f.fetch_daily(["AAA"], "2024-01-02", "2024-03-01")
+    src.scale = 0.5  # e.g. a 2:1 split re-adjusts the whole history
+    df = f.fetch_daily(["AAA"], "2024-01-02", "2024-04-01")
+    assert src.calls[-1] == ("AAA", "2024-01-02", "2024-04-01")
+    first_close = df.xs("AAA", level="Ticker")["Close"].iloc[0]
+    assert first_close == 0.5 * (100 + 2)
+
+
+def test_coverage_tracks_requested_range(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    assert cache.missing_ranges("X", "2020-01-01", "2020-02-01") == [
+        ("2020-01-01", "2020-02-01")]
+    cache.update("X", StubSource()("X", "2020-01-01", "2020-02-01"),
+                 "2020-01-01", "2020-02-01")
+    assert cache.missing_ranges("X", "2020-01-06", "2020-01-20") == []
+    assert cache.missing_ranges("X", "2019-12-01", "2020-01-20") == [
+        ("2019-12-01", "2020-01-01")]
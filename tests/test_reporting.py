@@ -22,8 +22,9 @@ class DummyResp:
 
 @pytest.fixture(autouse=True)
 def patch_network(monkeypatch):
-    monkeypatch.setattr("src.reporting.smtplib.SMTP", DummySMTP)
-    monkeypatch.setattr("src.reporting.requests.post",
+    # reporting imports requests when it sends, so patch it at the source
+    monkeypatch.setattr("smtplib.SMTP", DummySMTP)
+    monkeypatch.setattr("requests.post",
                         lambda url, json, timeout: DummyResp())
 
 
@@ -40,3 +41,11 @@ def test_send_daily_report_no_errors():
     df = pd.DataFrame([{"ticker": "X", "avgFillPrice": 100, "qty": 1}])
     # should not raise
     reporting.send_daily_report(m, trades_df=df)
+
+
+def test_send_slack_posts_to_webhook(monkeypatch):
+    sent = []
+    monkeypatch.setattr("requests.post",
+                        lambda url, json, timeout: sent.append((url, json)) or DummyResp())
+    reporting.send_slack("hello", webhook_url="https://hooks.example/x")
+    assert sent == [("https://hooks.example/x", {"text": "hello"})]
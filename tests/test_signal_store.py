@@ -0,0 +1,133 @@
+# tests/test_signal_store.py
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.signal_store import SignalStore
+from src.features import FeatureEngineer, StreamingFeatures
+from src.strategy import StrategyEngine
+from src.main import update_performance, update_signal_history
+
+
+def make_signals(dates, tickers=("A", "B", "C"), value=1.0):
+    idx = pd.MultiIndex.from_product([dates, list(tickers)], names=["Date", "Ticker"])
+    return pd.Series(value, index=idx)
+
+
+def test_append_and_read(tmp_path):
+    store = SignalStore(str(tmp_path))
+    assert store.last_date() is None
+    assert store.read().empty
+
+    dates = pd.bdate_range("2025-01-01", periods=4)
+    written = store.append(make_signals(dates))
+    assert list(written) == list(dates)
+    assert store.last_date() == dates[-1]
+
+    got = store.read(start=dates[1], end=dates[2])
+    assert list(got.index.unique("Date")) == list(dates[1:3])
+    assert (got == 1.0).all()
+
+
+def test_append_never_rewrites_a_date(tmp_path):
+    store = SignalStore(str(tmp_path))
+    dates = pd.bdate_range("2025-01-01", periods=3)
+    store.append(make_signals(dates[:2], value=1.0))
+    written = store.append(make_signals(dates, value=-1.0))
+    assert list(written) == [dates[2]]
+    got = store.read()
+    assert (got.loc[dates[:2]] == 1.0).all()
+    assert (got.loc[dates[2]] == -1.0).all()
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    tickers = [f"T{i}" for i in range(12)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    close = 100 * np.exp(rng.normal(0, 0.02, (len(dates), len(tickers))).cumsum(0))
+    return pd.DataFrame({"Close": close.reshape(-1)}, index=idx)
+
+
+def test_daily_updates_match_full_regeneration(prices, tmp_path):
+    strat = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    store = SignalStore(str(tmp_path / "signals"))
+    state = str(tmp_path / "state" / "features.npz")
+    dates = prices.index.unique("Date")
+
+    # first run builds the history, later runs only append their new date
+    update_signal_history(prices.loc[:dates[99]], strat, store, state)
+    for d in dates[100:]:
+        window = prices.loc[d - pd.Timedelta(days=60):d]
+        weights = update_signal_history(window, strat, store, state)
+        assert weights.index.get_level_values("Date").max() == d
+
+    expected = strat.generate_signals(prices, FeatureEngineer().build_features(prices))
+    got = store.read()
+    pd.testing.assert_series_equal(
+        got, expected.astype(float).loc[got.index], check_names=False)
+    assert store.last_date() == dates[-1]
+
+
+def test_rerun_same_day_appends_nothing(prices, tmp_path):
+    strat = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    store = SignalStore(str(tmp_path / "signals"))
+    state = str(tmp_path / "features.npz")
+    first = update_signal_history(prices, strat, store, state)
+    again = update_signal_history(prices, strat, store, state)
+    pd.testing.assert_series_equal(first, again)
+
+
+def test_split_adjusted_refetch_rebuilds_state(prices, tmp_path):
+    strat = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    store = SignalStore(str(tmp_path / "signals"))
+    state = str(tmp_path / "features.npz")
+    dates = prices.index.unique("Date")
+    update_signal_history(prices.loc[:dates[99]], strat, store, state)
+
+    # a 2:1 split of T0 on dates[100]: the refetch back-adjusts its history
+    adjusted = prices.copy()
+    adjusted.loc[(slice(None), "T0"), "Close"] *= 0.5
+    history = adjusted.loc[:dates[100]]
+    assert not StreamingFeatures.load(state).continues(history)
+    update_signal_history(history, strat, store, state)
+
+    feats = FeatureEngineer().build_features(history)
+    expected = strat.generate_signals(history, feats).astype(float)
+    got = store.read(start=dates[100])
+    pd.testing.assert_series_equal(got, expected.loc[got.index], check_names=False)
+    assert StreamingFeatures.load(state).continues(history)
+
+
+def test_dry_run_writes_nothing(prices, tmp_path):
+    strat = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    store = SignalStore(str(tmp_path / "signals"))
+    state = str(tmp_path / "features.npz")
+    dates = prices.index.unique("Date")
+    update_signal_history(prices.loc[:dates[99]], strat, store, state)
+    saved = StreamingFeatures.load(state).last_date
+
+    dry = update_signal_history(prices, strat, store, state, dry_run=True)
+    assert store.last_date() == dates[99]
+    assert StreamingFeatures.load(state).last_date == saved
+    wet = update_signal_history(prices, strat, store, state)
+    pd.testing.assert_series_equal(dry, wet)
+
+    perf = str(tmp_path / "perf.json")
+    daily = pd.Series(0.001, index=dates)
+    update_performance(daily, path=perf, window=20, dry_run=True)
+    assert not os.path.exists(perf)
+
+
+def test_unset_paths_keep_nothing_on_disk(prices, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strat = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    store = SignalStore("")
+    weights = update_signal_history(prices, strat, store, state_path="")
+    expected = strat.generate_signals(prices, FeatureEngineer().build_features(prices))
+    pd.testing.assert_series_equal(
+        weights, expected.astype(float).loc[weights.index], check_names=False)
+    assert store.last_date() == prices.index.unique("Date")[-1]
+    assert os.listdir(tmp_path) == []
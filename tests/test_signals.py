@@ -0,0 +1,42 @@
+# tests/test_signals.py
+
+import numpy as np
+import pandas as pd
+from src.signals import row_quantiles, decile_signals, band_signals
+
+
+def ragged_rows(seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 1, (40, 23)).round(1)  # rounding -> ties at the quantiles
+    x[rng.random(x.shape) < 0.2] = np.nan
+    x[3] = np.nan        # empty cross-section
+    x[4, 1:] = np.nan    # single value
+    return x
+
+
+def test_row_quantiles_bit_identical_to_pandas():
+    x = ragged_rows()
+    got = row_quantiles(x, [0.1, 0.9])
+    for i, row in enumerate(x):
+        s = pd.Series(row)
+        for j, q in enumerate((0.1, 0.9)):
+            expected = s.quantile(q)
+            if np.isnan(expected):
+                assert np.isnan(got[j, i])
+            else:
+                assert got[j, i] == expected
+
+
+def test_decile_signals():
+    x = ragged_rows(1)
+    sig = decile_signals(x)
+    for i, row in enumerate(x):
+        s = pd.Series(row)
+        expected = np.where(s >= s.quantile(0.9), 1,
+                            np.where(s <= s.quantile(0.1), -1, 0))
+        np.testing.assert_array_equal(sig[i], expected)
+
+
+def test_band_signals():
+    x = np.array([[10.0, 30.0, 35.0, 40.0, 55.0, np.nan]])
+    np.testing.assert_array_equal(band_signals(x, 30, 40), [[1, 0, 0, 0, -1, 0]])
@@ -25,3 +25,34 @@ def test_generate_signals_basic():
     assert isinstance(signals, pd.Series)
     assert signals.index.equals(feats.index)
     assert set(signals.unique()).issubset({-1, 0, 1})
+
+
+def reference_signals(feats):
+    """Per-date groupby version the vectorized engine must reproduce."""
+    mom = feats['5d_mom']
+    mom_sig = mom.groupby(level=0, group_keys=False).apply(
+        lambda x: pd.Series(
+            np.where(x >= x.quantile(0.9), 1,
+                     np.where(x <= x.quantile(0.1), -1, 0)),
+            index=x.index))
+    rsi = feats['rsi']
+    rsi_sig = pd.Series(0, index=rsi.index)
+    rsi_sig[rsi < 30] = 1
+    rsi_sig[rsi > 40] = -1
+    return mom_sig.add(rsi_sig, fill_value=0).clip(-1, 1)
+
+
+def test_signals_match_per_date_reference():
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    tickers = [f"T{i:02d}" for i in range(25)]
+    idx = pd.MultiIndex.from_product([dates, tickers], names=["Date", "Ticker"])
+    feats = pd.DataFrame({
+        '5d_mom': rng.normal(0, 0.02, len(idx)).round(3),
+        'rsi': rng.uniform(0, 100, len(idx)),
+    }, index=idx)
+    feats = feats[rng.random(len(feats)) > 0.1]  # ragged cross-sections
+
+    se = StrategyEngine(drl_model_path="nonexistent_model.zip")
+    pd.testing.assert_series_equal(
+        se.generate_signals(feats, feats), reference_signals(feats), check_exact=True)
@@ -3,9 +3,11 @@
 import pytest
 import pandas as pd
 import numpy as np
+from src.panel import PricePanel
+from src.tuning_store import TuningStore
 from src.tuner import (
-    build_features, gen_mom_signals,
-    walk_forward_splits, tune_hyperparameters
+    IndicatorMemo, build_features, gen_mom_signals, halving_schedule, run_rungs,
+    run_splits, spread_order, walk_forward_splits, tune_hyperparameters
 )
 
 
@@ -40,8 +42,9 @@ def test_build_and_signal():
         [dates, tickers], names=["Date", "Ticker"])
     df = pd.DataFrame({"Close": np.arange(10)}, index=idx)
     feats = build_features(df, mom_short=1, mom_long=2, rsi_window=3)
-    # expect drops for lookback of max(1,2,3)=3
-    assert all(feats.groupby(level="Ticker").size() == 10 - 3)
+    # momentum(p) is NaN for its first p rows; ta's RSI counts the first
+    # diff as a zero move, so RSI(3) is valid from row 2: max(1, 2, 3 - 1) = 2
+    assert all(feats.groupby(level="Ticker").size() == 10 - 2)
     sig = gen_mom_signals(feats, short_q=0.2, long_q=0.8)
     assert set(sig.unique()).issubset({-1, 0, 1})
 
@@ -75,3 +78,169 @@ def test_tune_hyperparameters_returns_df(tmp_path):
     # one row per grid point
     assert df.shape[0] == 2 * 1 * 1 * 1 * 1
     assert 'avg_sharpe' in df.columns
+
+
+def test_parallel_matches_serial():
+    grid = {
+        "mom_short": [1, 2],
+        "mom_long":  [3, 4],
+        "rsi_window": [3],
+        "slippage":  [0.0, 0.001],
+        "commission": [0.0]
+    }
+    args = (["A", "B"], "2025-01-01", "2025-03-01", grid, 10, 5)
+    serial = tune_hyperparameters(*args, n_jobs=1)
+    parallel = tune_hyperparameters(*args, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+    assert serial.attrs["memo"] == parallel.attrs["memo"]
+
+
+def make_panel(n_days=60, n_tickers=6, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-01-01", periods=n_days)
+    close = 100 * np.exp(rng.normal(0, 0.02, (n_days, n_tickers)).cumsum(0))
+    close[rng.random(close.shape) < 0.03] = np.nan  # missing rows
+    close[:25, 0] = np.nan                          # late listing
+    return PricePanel(dates, pd.Index([f"T{i}" for i in range(n_tickers)]),
+                      {"Close": close})
+
+
+def test_run_splits_keeps_window_order():
+    panel = make_panel(n_days=30, n_tickers=3)
+    dates = panel.dates
+    grid = [{"mom_short": 1, "mom_long": 2, "rsi_window": 3}]
+    windows = [(0, 10, 15), (5, 10, 20), (10, 10, 25)]
+    for n_jobs in (1, 2):
+        out = run_splits(IndicatorMemo(panel), windows, grid, [0.0], [0.0], n_jobs=n_jobs)
+        assert [r.index[0] for r in out] == [dates[10], dates[15], dates[20]]
+        assert all(len(r) == 5 for r in out)
+
+
+@pytest.mark.parametrize("fkey", [(1, 2, 3), (3, 10, 14), (5, 5, 30)])
+def test_memo_signals_match_per_window_features(fkey):
+    panel = make_panel()
+    memo = IndicatorMemo(panel)
+    frame = panel.to_frame(dropna=True)
+    dates = panel.dates
+    for lo, n_train, hi in [(0, 20, 30), (12, 20, 40), (30, 15, 60)]:
+        window = frame[frame.index.get_level_values("Date").isin(dates[lo:hi])]
+        feats = build_features(window, *fkey)
+        expected = gen_mom_signals(feats)
+        expected = expected[expected.index.get_level_values("Date") >= dates[lo + n_train]]
+        test = PricePanel(dates[lo + n_train:hi], panel.tickers,
+                          {"Close": panel["Close"][lo + n_train:hi]})
+        got = memo.window_signals(lo, n_train, hi, *fkey)
+        rows, cols = test.locate(expected.index)
+        np.testing.assert_array_equal(got[rows, cols], expected.to_numpy())
+        assert np.isnan(got).sum() == got.size - len(expected)
+    assert memo.stats["indicators_computed"] == 1
+    stats = memo.stats
+    assert stats["quantile_rows_reused"] + stats["quantile_rows_computed"] == 10 + 8 + 15
+    if max(fkey) <= 15:  # warm within every train window: full-history quantiles apply
+        assert stats["quantile_rows_reused"] > 0
+
+
+def test_halving_schedule():
+    assert halving_schedule(27, 9) == [(27, 2), (9, 6), (3, 9)]
+    assert halving_schedule(1, 5) == [(1, 5)]
+    rungs = halving_schedule(36, 50, eta=3)
+    assert rungs[-1][1] == 50
+    assert [c for c, _ in rungs] == sorted((c for c, _ in rungs), reverse=True)
+    assert spread_order(5) == [4, 0, 2, 1, 3]
+
+
+def test_halving_search_spends_less(monkeypatch):
+    import src.tuner as tuner
+
+    class PanelFetcher:
+        def fetch_daily(self, tickers, start, end):
+            return make_panel(n_days=300, n_tickers=8, seed=3).to_frame()
+
+    class NoClean:
+        def clean(self, df):
+            return df
+
+    monkeypatch.setattr(tuner, "DataFetcher", PanelFetcher)
+    monkeypatch.setattr(tuner, "DataCleaner", NoClean)
+    grid = {
+        "mom_short": [2, 5],
+        "mom_long":  [10, 20],
+        "rsi_window": [5, 14],
+        "slippage":  [0.0, 0.002],
+        "commission": [0.0]
+    }
+    args = (["T0"], "2025-01-01", "2026-01-01", grid, 40, 20)
+    full = tune_hyperparameters(*args, n_jobs=1)
+    halved = tune_hyperparameters(*args, n_jobs=1, search="halving", eta=2)
+
+    n_splits = len(walk_forward_splits(pd.bdate_range("2025-01-01", periods=300), 40, 20))
+    assert full.attrs["budget"][-1]["total_backtests"] == 16 * n_splits
+    budget = pd.DataFrame(halved.attrs["budget"])
+    assert budget["total_backtests"].iloc[-1] < 16 * n_splits
+    assert budget["splits"].iloc[-1] == n_splits
+
+    assert len(halved) == len(full)
+    assert set(full.columns) | {"n_splits"} == set(halved.columns)
+    # fully scored survivors come first and score exactly as in the grid
+    keys = list(grid)
+    finalists = halved[halved["n_splits"] == n_splits]
+    assert finalists.index.tolist() == list(range(len(finalists)))
+    merged = finalists.merge(full, on=keys, suffixes=("", "_grid"))
+    np.testing.assert_array_equal(merged["avg_sharpe"], merged["avg_sharpe_grid"])
+
+
+def test_halving_rungs_share_one_pool(monkeypatch):
+    import src.tuner as tuner
+
+    published = []
+
+    def publish(arrays):
+        published.append(sorted(arrays))
+        return real_publish(arrays)
+
+    real_publish = tuner._publish
+    monkeypatch.setattr(tuner, "_publish", publish)
+    panel = make_panel(n_days=120, n_tickers=6, seed=5)
+    grid = [{"mom_short": s, "mom_long": 10, "rsi_window": r}
+            for s in (2, 3, 5) for r in (5, 14)]
+    costs = [0.001] * len(grid)
+    windows = [(lo, 30, lo + 40) for lo in range(0, 80, 10)]
+    rungs = halving_schedule(len(grid), len(windows), eta=2)
+    assert len(rungs) > 2
+
+    serial = run_rungs(IndicatorMemo(panel), windows, grid, costs, costs, rungs, n_jobs=1)
+    assert published == []
+    pooled = run_rungs(IndicatorMemo(panel), windows, grid, costs, costs, rungs, n_jobs=2)
+    assert len(published) == 1
+    assert {"mom_2", "mom_3", "mom_5"} <= set(published[0])
+    np.testing.assert_array_equal(pooled.evaluated, serial.evaluated)
+    np.testing.assert_array_equal(pooled.sharpe, serial.sharpe)
+
+
+def test_unknown_search_mode():
+    with pytest.raises(ValueError):
+        tune_hyperparameters(["A"], "2025-01-01", "2025-02-01",
+                             {"mom_short": [1], "mom_long": [3], "rsi_window": [3]},
+                             5, 5, search="random")
+
+
+def test_rerun_resumes_from_store(tmp_path):
+    grid = {
+        "mom_short": [1, 2],
+        "mom_long":  [3, 4],
+        "rsi_window": [3],
+        "slippage":  [0.0, 0.001],
+        "commission": [0.0]
+    }
+    args = (["A", "B"], "2025-01-01", "2025-03-01", grid, 10, 5)
+    store = TuningStore(root=str(tmp_path / "runs"))
+    first = tune_hyperparameters(*args, n_jobs=1, store=store)
+    # lose part of the sweep, as if the run had been killed midway
+    entries = sorted((tmp_path / "runs").glob("*.parquet"))
+    for path in entries[::3]:
+        path.unlink()
+    resumed = tune_hyperparameters(*args, n_jobs=1, store=store)
+    pd.testing.assert_frame_equal(first, resumed, check_exact=True)
+    budget = pd.DataFrame(resumed.attrs["budget"])
+    assert budget["backtests"].sum() == len(entries[::3])
+    assert budget["backtests"].sum() + budget["reused"].sum() == len(entries)
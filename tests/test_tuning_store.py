@@ -0,0 +1,205 @@
+# tests/test_tuning_store.py
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.panel import PricePanel
+from src.tuner import IndicatorMemo, evaluate_pairs
+from src.tuning_store import TuningStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_panel(n_days=80, n_tickers=5, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2025-01-01", periods=n_days)
+    close = 100 * np.exp(rng.normal(0, 0.02, (n_days, n_tickers)).cumsum(0))
+    return PricePanel(dates, pd.Index([f"T{i}" for i in range(n_tickers)]),
+                      {"Close": close})
+
+
+GRID = [
+    {"mom_short": 2, "mom_long": 5, "rsi_window": 3},
+    {"mom_short": 3, "mom_long": 8, "rsi_window": 3},
+]
+WINDOWS = [(0, 30, 50), (20, 30, 70)]
+
+
+def evaluate(store, pairs=None, panel=None):
+    memo = IndicatorMemo(panel or make_panel())
+    pairs = pairs or {k: np.arange(len(GRID)) for k in range(len(WINDOWS))}
+    return evaluate_pairs(memo, WINDOWS, GRID, [0.001, 0.001], [0.0, 0.0], pairs, store)
+
+
+def test_keys_follow_data_and_params():
+    panel = make_panel()
+    wkey = TuningStore.window_key(panel, WINDOWS[0])
+    assert wkey == TuningStore.window_key(make_panel(), WINDOWS[0])
+    assert wkey != TuningStore.window_key(panel, WINDOWS[1])
+    assert wkey != TuningStore.window_key(panel, (0, 25, 50))
+    assert wkey != TuningStore.window_key(make_panel(seed=1), WINDOWS[0])
+    # rows outside the window do not matter
+    other = make_panel()
+    other["Close"][60:] *= 2
+    assert wkey == TuningStore.window_key(other, WINDOWS[0])
+    assert TuningStore.key(wkey, {"a": 1, "b": 2}) == TuningStore.key(wkey, {"b": 2, "a": 1})
+    assert TuningStore.key(wkey, {"a": 1}) != TuningStore.key(wkey, {"a": 2})
+
+
+def test_put_get_roundtrip(tmp_path):
+    store = TuningStore(root=str(tmp_path))
+    r = pd.Series([0.01, np.nan, -0.02], index=pd.bdate_range("2025-01-01", periods=3))
+    assert store.get("k") is None
+    assert store.claim("k")
+    store.put("k", r)
+    np.testing.assert_array_equal(store.get("k").to_numpy(), r.to_numpy())
+    assert not os.path.exists(tmp_path / "k.claim")
+
+
+def elsewhere(store, host="other-host", pid=1, run=None):
+    """``store`` acting as a worker on another host."""
+    store._owner = lambda: {"host": host, "pid": pid, "run": run}
+    return store
+
+
+def test_claims_are_exclusive_until_stale(tmp_path):
+    store = TuningStore(root=str(tmp_path), lease=60)
+    other = elsewhere(TuningStore(root=str(tmp_path), lease=60))
+    assert other.claim("k")
+    assert not store.claim("k")
+    other.release("k")
+    assert store.claim("k")
+    assert not other.claim("k")
+    old = time.time() - 120
+    os.utime(tmp_path / "k.claim", (old, old))
+    assert other.claim("k")  # abandoned claim taken over
+
+
+def test_heartbeat_keeps_claims_alive(tmp_path):
+    store = TuningStore(root=str(tmp_path), lease=0.4)
+    other = elsewhere(TuningStore(root=str(tmp_path), lease=0.4))
+    assert store.claim("k")
+    with store.heartbeat(["k"]):
+        time.sleep(1.0)
+        assert not other.claim("k")
+    time.sleep(0.6)
+    assert other.claim("k")
+
+
+def test_killed_run_claims_are_taken_back(tmp_path):
+    # a worker claims everything and is killed before storing anything
+    script = (
+        "import numpy as np, os, signal, sys\n"
+        "sys.path.insert(0, os.getcwd())\n"
+        "from tests.test_tuning_store import GRID, WINDOWS, make_panel\n"
+        "from src.tuning_store import TuningStore\n"
+        f"store = TuningStore(root={str(tmp_path)!r})\n"
+        "panel = make_panel()\n"
+        "for w in WINDOWS:\n"
+        "    for p in GRID:\n"
+        "        params = dict(p, slippage=0.001, commission=0.0)\n"
+        "        store.claim(store.key(store.window_key(panel, w), params))\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT)
+    assert proc.returncode == -signal.SIGKILL
+    assert len(list(tmp_path.glob("*.claim"))) == 4
+
+    # the rerun on the same host resumes at once despite a long lease
+    store = TuningStore(root=str(tmp_path), lease=3600, poll=60)
+    t0 = time.perf_counter()
+    _, run = evaluate(store)
+    assert run == 4
+    assert time.perf_counter() - t0 < 30
+    assert not list(tmp_path.glob("*.claim"))
+
+
+def test_run_id_takes_back_its_claims(tmp_path):
+    before = elsewhere(TuningStore(root=str(tmp_path), lease=3600), run="worker-0")
+    assert before.claim("k")
+    assert not TuningStore(root=str(tmp_path), lease=3600, run_id="worker-1").claim("k")
+    # the restarted worker comes back on another host with the same id
+    after = elsewhere(TuningStore(root=str(tmp_path), lease=3600, run_id="worker-0"),
+                      host="new-host", run="worker-0")
+    assert after.claim("k")
+
+
+def test_shared_run_id_does_not_steal_live_claims(tmp_path):
+    import socket
+
+    # a live process on this host, started with the same id by mistake
+    live = elsewhere(TuningStore(root=str(tmp_path), lease=3600, run_id="worker-0"),
+                     host=socket.gethostname(), pid=os.getppid(), run="worker-0")
+    assert live.claim("k")
+    assert not TuningStore(root=str(tmp_path), lease=3600, run_id="worker-0").claim("k")
+
+
+def test_empty_root_keeps_nothing(tmp_path):
+    store = TuningStore(root="")
+    assert store.claim("k") and store.claim("k")
+    store.put("k", pd.Series([1.0]))
+    assert store.get("k") is None
+
+
+def test_rerun_reuses_stored_results(tmp_path):
+    store = TuningStore(root=str(tmp_path))
+    first, run = evaluate(store)
+    assert run == 4
+    again, run = evaluate(store)
+    assert run == 0
+    for k in first:
+        pd.testing.assert_frame_equal(first[k], again[k], check_exact=True,
+                                      check_freq=False)
+    fresh, _ = evaluate(TuningStore(root=""))
+    for k in first:
+        pd.testing.assert_frame_equal(first[k], fresh[k], check_exact=True,
+                                      check_freq=False)
+
+
+def test_resume_runs_only_missing(tmp_path):
+    store = TuningStore(root=str(tmp_path))
+    evaluate(store, {0: np.array([0, 1]), 1: np.array([1])})
+    frames, run = evaluate(store)
+    assert run == 1
+    assert list(frames[1].columns) == [0, 1]
+
+
+def test_waits_for_results_claimed_elsewhere(tmp_path):
+    store = TuningStore(root=str(tmp_path), poll=0.05)
+    other = elsewhere(TuningStore(root=str(tmp_path)))
+    panel = make_panel()
+    key = TuningStore.key(TuningStore.window_key(panel, WINDOWS[0]),
+                          dict(GRID[0], slippage=0.001, commission=0.0))
+    expected, _ = evaluate(TuningStore(root=""), {0: np.array([0])})
+    assert other.claim(key)  # another worker is on it
+
+    def finish():
+        time.sleep(0.3)
+        other.put(key, expected[0][0])
+
+    worker = threading.Thread(target=finish)
+    worker.start()
+    frames, run = evaluate(store, panel=panel)
+    worker.join()
+    assert run == 3
+    np.testing.assert_array_equal(frames[0][0].to_numpy(), expected[0][0].to_numpy())
+
+
+def test_failed_run_releases_claims(tmp_path, monkeypatch):
+    import src.tuner as tuner
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("pre-empted")
+
+    monkeypatch.setattr(tuner, "split_returns", boom)
+    store = TuningStore(root=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        evaluate(store)
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".claim")]